@@ -12,5 +12,7 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'ltcloud.settings')
+# Lido pelo settings para nao manter conexoes persistentes (CONN_MAX_AGE) sob ASGI.
+os.environ.setdefault('LTCLOUD_ASGI', '1')
 
 application = get_asgi_application()
@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -41,6 +42,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'main.middleware.RequestMetricsMiddleware',
+    'main.middleware.DatabaseRoutingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -73,13 +76,73 @@ WSGI_APPLICATION = 'ltcloud.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+# Executados a cada conexao nova. WAL deixa leitores e o escritor trabalharem ao mesmo tempo;
+# com WAL, synchronous=NORMAL so arrisca a ultima transacao numa queda de energia.
+# journal_mode=WAL fica gravado no arquivo: o primeiro comando do manage.py converte o db.sqlite3
+# versionado (e cria -wal/-shm), que passa a aparecer modificado no git. Nao faca commit dele.
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': 5000,
+    'mmap_size': 128 * 1024 * 1024,
+    'cache_size': -20000,
+    'temp_store': 'MEMORY',
+}
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # Sob WSGI a conexao e reaproveitada entre requisicoes da mesma thread, testada antes do reuso.
+        # Sob ASGI (ltcloud/asgi.py define LTCLOUD_ASGI) a doc do Django pede CONN_MAX_AGE=0: o codigo
+        # sincrono roda nas threads do sync_to_async e as conexoes delas nao seriam fechadas a tempo.
+        'CONN_MAX_AGE': 0 if os.environ.get('LTCLOUD_ASGI') else 600,
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {
+            'init_command': ';'.join(f'PRAGMA {name}={value}' for name, value in SQLITE_PRAGMAS.items()),
+            # Transacoes pegam o lock de escrita no BEGIN: esperam o busy_timeout em vez de
+            # falhar com "database is locked" ao promover um lock de leitura.
+            'transaction_mode': 'IMMEDIATE',
+        },
     }
 }
 
+# Alias de uma replica de leitura em DATABASES (None = tudo no default). Listagens, detalhe e
+# exportacao leem dela; depois de uma escrita o navegador le do primario por alguns segundos.
+DATABASE_REPLICA = None
+DATABASE_REPLICA_PIN_SECONDS = 5
+DATABASE_ROUTERS = ['main.routers.ReplicaRouter']
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'ltcloud',
+        'OPTIONS': {'MAX_ENTRIES': 20000},
+    },
+    # Visto por todos os processos da maquina; em varias maquinas, trocar por Redis/Memcached.
+    'shared': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': BASE_DIR / '.cache',
+        'OPTIONS': {'MAX_ENTRIES': 10000},
+    },
+}
+
+# Alias do cache compartilhado entre os processos usado por sessao, usuario logado e cards de
+# desenvolvedor; com ele o banco so e lido quando a entrada falta ou foi invalidada. O LocMemCache
+# nao serve: logout e troca de senha invalidariam so o processo que os atendeu (check main.E001/E002).
+# None le sessao e usuario do banco em toda requisicao e guarda os cards no 'default' por 60s.
+SHARED_CACHE = 'shared'
+
+SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db' if SHARED_CACHE else 'django.contrib.sessions.backends.db'
+SESSION_CACHE_ALIAS = SHARED_CACHE or 'default'
+AUTH_USER_CACHE = SHARED_CACHE
+
+AUTHENTICATION_BACKENDS = ['main.auth.CachedModelBackend']
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -116,9 +179,27 @@ USE_TZ = True
 # https://docs.djangoproject.com/en/5.2/howto/static-files/
 
 STATIC_URL = '/static/'
+STATICFILES_DIRS = [BASE_DIR / 'static']
+STATIC_ROOT = BASE_DIR / 'staticfiles'
+
+# collectstatic grava nomes com hash (cache imutavel) e variantes .gz/.br dos arquivos de texto.
+STORAGES = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {'BACKEND': 'main.assets.CompressedManifestStaticFilesStorage'},
+}
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Fila de jobs em banco (main/jobs.py), processada pelo comando run_worker.
+# JOBS_EAGER executa a tarefa na hora, sem fila (util em testes e scripts).
+JOBS_EAGER = False
+JOB_WORKER_THREADS = 2
+# Backoff das novas tentativas: JOB_RETRY_DELAY segundos, dobrando ate JOB_RETRY_MAX_DELAY.
+JOB_RETRY_DELAY = 30
+JOB_RETRY_MAX_DELAY = 60 * 60
+# Job "executando" ha mais que isso e de um worker que morreu e volta para a fila.
+JOB_LOCK_TIMEOUT = 60 * 10
+
 EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
 
 # Default primary key field type
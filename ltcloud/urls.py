@@ -1,10 +1,12 @@
 from django.contrib import admin
 from django.urls import include, path
+from main import assets
 from main import views as main_views
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('accounts/login/', main_views.CustomLoginView.as_view(), name='login'),
+    path('accounts/password_reset/', main_views.CustomPasswordResetView.as_view(), name='password_reset'),
     path('accounts/', include('django.contrib.auth.urls')),
     path('', include('main.urls')),
 ]
@@ -12,5 +14,8 @@ urlpatterns = [
 from django.conf import settings
 from django.conf.urls.static import static
 
+# Sem servidor na frente (ex.: uvicorn direto), o Django entrega o STATIC_ROOT com as variantes comprimidas.
+urlpatterns += [path(f'{settings.STATIC_URL.strip("/")}/<path:path>', assets.serve, name='static')]
+
 if settings.DEBUG:
     urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Developer, Article
+from .models import Developer, Article, Job, Skill
 
 @admin.register(Developer)
 class DeveloperAdmin(admin.ModelAdmin):
@@ -7,6 +7,11 @@ class DeveloperAdmin(admin.ModelAdmin):
     search_fields = ('name', 'email', 'skills')
     list_filter = ('seniority',)
 
+@admin.register(Skill)
+class SkillAdmin(admin.ModelAdmin):
+    list_display = ('name', 'key')
+    search_fields = ('key',)
+
 @admin.register(Article)
 class ArticleAdmin(admin.ModelAdmin):
     list_display = ('title', 'user', 'published_at')
@@ -14,3 +19,11 @@ class ArticleAdmin(admin.ModelAdmin):
     list_filter = ('published_at',)
     filter_horizontal = ('developers',)
     prepopulated_fields = {'slug': ('title',)}
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ('task', 'status', 'attempts', 'run_at', 'locked_by', 'finished_at')
+    list_filter = ('status', 'task')
+    # args/kwargs ficam fora: podem conter dados sensiveis (corpo do e-mail de reset de senha).
+    exclude = ('args', 'kwargs')
+    readonly_fields = ('last_error',)
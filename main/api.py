@@ -0,0 +1,65 @@
+from django.db.models import FileField
+from django.http import JsonResponse
+
+from .pagination import KeysetPage, KeysetPaginationMixin
+
+
+class JsonListMixin(KeysetPaginationMixin):
+    """Listagem em JSON direto das linhas de values(), sem instanciar models.
+
+    ?fields=a,b escolhe as colunas (dentre api_fields), ?limit= o tamanho da pagina e
+    "next" traz a URL da proxima pagina, com o mesmo cursor da listagem HTML.
+    """
+
+    api_fields = ()
+    default_fields = ()
+    paginate_by = 100
+    max_paginate_by = 1000
+
+    def get_fields(self):
+        raw = self.request.GET.get('fields', '').strip()
+        if not raw:
+            return list(self.default_fields or self.api_fields)
+        names = list(dict.fromkeys(name.strip() for name in raw.split(',') if name.strip()))
+        available = ", ".join(self.api_fields)
+        if not names:
+            raise ValueError(f'Nenhum campo informado. Disponiveis: {available}')
+        unknown = [name for name in names if name not in self.api_fields]
+        if unknown:
+            raise ValueError(f'Campos invalidos: {", ".join(unknown)}. Disponiveis: {available}')
+        return names
+
+    def get_file_storages(self, names):
+        # values() traz o nome do arquivo no storage; a API devolve a URL publica.
+        fields = (self.model._meta.get_field(name) for name in names)
+        return {field.attname: field.storage for field in fields if isinstance(field, FileField)}
+
+    def get_paginate_by(self, queryset=None):
+        limit = self.request.GET.get('limit', '').strip()
+        if limit.isdigit() and int(limit) > 0:
+            return min(int(limit), self.max_paginate_by)
+        return self.paginate_by
+
+    def get(self, request, *args, **kwargs):
+        try:
+            names = self.get_fields()
+        except ValueError as exc:
+            return JsonResponse({'error': str(exc)}, status=400)
+        queryset = self.get_queryset()
+        keyset = self.get_keyset()
+        # As colunas do cursor entram no SELECT mesmo quando nao foram pedidas.
+        columns = list(dict.fromkeys([*names, *(name for name, _, _ in keyset.fields)]))
+        rows = queryset.select_related(None).prefetch_related(None).values(*columns)
+        rows, next_cursor = keyset.page(rows, self.get_paginate_by(), self.get_cursor())
+        if len(columns) > len(names):
+            rows = [{name: row[name] for name in names} for row in rows]
+        for name, storage in self.get_file_storages(names).items():
+            for row in rows:
+                row[name] = storage.url(row[name]) if row[name] else None
+        page = KeysetPage(rows, next_cursor, request.GET, self.cursor_param)
+        return JsonResponse(
+            {
+                'results': rows,
+                'next': f'{request.path}?{page.next_query}' if page.has_next() else None,
+            }
+        )
@@ -0,0 +1,119 @@
+import gzip
+import mimetypes
+import os
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage, StaticFilesStorage, staticfiles_storage
+from django.contrib.staticfiles.views import serve as finders_serve
+from django.core.exceptions import SuspiciousFileOperation
+from django.core.files.base import ContentFile
+from django.http import FileResponse, Http404, HttpResponseNotModified
+from django.utils._os import safe_join
+from django.utils.cache import patch_vary_headers
+from django.utils.functional import cached_property
+from django.utils.http import http_date
+from django.views.static import was_modified_since
+
+try:
+    import brotli
+except ImportError:  # opcional: sem o pacote, so a variante .gz
+    brotli = None
+
+COMPRESSIBLE = ('.css', '.js', '.json', '.map', '.svg', '.txt', '.xml')
+MIN_COMPRESS_SIZE = 256
+# Ordem de preferencia na negociacao com Accept-Encoding.
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+IMMUTABLE = 'public, max-age=31536000, immutable'
+
+
+def compressors():
+    yield '.gz', lambda data: gzip.compress(data, compresslevel=9, mtime=0)
+    if brotli is not None:
+        yield '.br', lambda data: brotli.compress(data, quality=11)
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """Nomes com hash do manifest e, para texto, variantes .gz/.br geradas no collectstatic."""
+
+    @cached_property
+    def immutable_names(self):
+        return set(self.hashed_files.values())
+
+    def url(self, name, force=False):
+        if not self.hashed_files:
+            # Sem collectstatic (desenvolvimento, testes) os arquivos saem pelos finders, sem hash.
+            return StaticFilesStorage.url(self, name)
+        return super().url(name, force)
+
+    def post_process(self, paths, dry_run=False, **options):
+        names = set()
+        for name, hashed_name, processed in super().post_process(paths, dry_run, **options):
+            if not isinstance(processed, Exception):
+                names.add(name)
+                if hashed_name:
+                    names.add(hashed_name)
+            yield name, hashed_name, processed
+        if dry_run:
+            return
+        for name in sorted(names):
+            for compressed_name in self.compress(name):
+                yield name, compressed_name, True
+
+    def compress(self, name):
+        if not name.endswith(COMPRESSIBLE) or not self.exists(name):
+            return
+        with self.open(name) as handle:
+            data = handle.read()
+        if len(data) < MIN_COMPRESS_SIZE:
+            return
+        for suffix, compress in compressors():
+            compressed = compress(data)
+            if len(compressed) >= len(data):
+                continue
+            target = name + suffix
+            if self.exists(target):
+                self.delete(target)
+            self._save(target, ContentFile(compressed))
+            yield target
+
+
+def accepted_encodings(request):
+    return {part.split(';')[0].strip().lower() for part in request.headers.get('Accept-Encoding', '').split(',')}
+
+
+def serve(request, path):
+    """Arquivos do STATIC_ROOT com a variante comprimida aceita pelo cliente.
+
+    Nomes com hash sao imutaveis e ficam um ano em cache; os demais (ex.: plugins que o TinyMCE
+    carrega pelo nome original) revalidam por Last-Modified.
+    """
+    if settings.DEBUG:
+        return finders_serve(request, path, insecure=True)
+    try:
+        fullpath = safe_join(settings.STATIC_ROOT, path)
+    except SuspiciousFileOperation:
+        raise Http404('Arquivo estatico invalido')
+    if not os.path.isfile(fullpath):
+        raise Http404('Arquivo estatico nao encontrado')
+
+    served, encoding = fullpath, None
+    if path.endswith(COMPRESSIBLE):
+        accepted = accepted_encodings(request)
+        for name, suffix in ENCODINGS:
+            if name in accepted and os.path.isfile(fullpath + suffix):
+                served, encoding = fullpath + suffix, name
+                break
+
+    stat = os.stat(served)
+    immutable = path in getattr(staticfiles_storage, 'immutable_names', ())
+    if not immutable and not was_modified_since(request.headers.get('If-Modified-Since'), stat.st_mtime):
+        return HttpResponseNotModified()
+
+    content_type, _ = mimetypes.guess_type(fullpath)
+    response = FileResponse(open(served, 'rb'), content_type=content_type or 'application/octet-stream')
+    response['Last-Modified'] = http_date(stat.st_mtime)
+    response['Cache-Control'] = IMMUTABLE if immutable else 'no-cache'
+    if encoding:
+        response['Content-Encoding'] = encoding
+    patch_vary_headers(response, ['Accept-Encoding'])
+    return response
@@ -0,0 +1,104 @@
+from django.conf import settings
+from django.contrib.auth.backends import ModelBackend, UserModel
+from django.core import checks
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import transaction
+
+USER_TIMEOUT = 60 * 15
+BACKEND = 'main.auth.CachedModelBackend'
+
+
+def user_cache():
+    alias = getattr(settings, 'AUTH_USER_CACHE', None)
+    return caches[alias] if alias else None
+
+
+def is_process_local(alias):
+    # Invalidacao num processo nao chega aos outros: troca de senha ou desativacao ficariam valendo so em um worker.
+    return isinstance(caches[alias], (LocMemCache, DummyCache))
+
+
+def user_key(pk):
+    return f'auth-user:{pk}'
+
+
+def invalidate_user(pk):
+    cache = user_cache()
+    if cache is None:
+        return
+    cache.delete(user_key(pk))
+    # De novo apos o commit: uma requisicao concorrente pode ter guardado a linha antiga.
+    transaction.on_commit(lambda: cache.delete(user_key(pk)))
+
+
+def cache_entry(user):
+    # Sem o hash da senha: so o HMAC que a sessao confere (get_session_auth_hash).
+    fields = {f.attname: getattr(user, f.attname) for f in user._meta.concrete_fields if f.attname != 'password'}
+    return {'db': user._state.db, 'fields': fields, 'session_auth_hash': user.get_session_auth_hash()}
+
+
+def user_from_entry(entry):
+    fields = entry['fields']
+    # password fica adiado: save() nao o regrava e quem precisar dele le do banco.
+    user = UserModel.from_db(entry['db'], list(fields), list(fields.values()))
+    session_auth_hash = entry['session_auth_hash']
+    user.get_session_auth_hash = lambda: session_auth_hash
+    return user
+
+
+class CachedModelBackend(ModelBackend):
+    """ModelBackend que guarda no cache AUTH_USER_CACHE o usuario da sessao.
+
+    Cada requisicao autenticada resolvia request.user com um SELECT em auth_user; aqui so o
+    primeiro acesso depois de uma invalidacao (save/delete do usuario, logout) vai ao banco.
+    Sem AUTH_USER_CACHE se comporta como o ModelBackend.
+    """
+
+    def get_user(self, user_id):
+        cache = user_cache()
+        if cache is None:
+            return super().get_user(user_id)
+        entry = cache.get(user_key(user_id))
+        if entry is not None:
+            return user_from_entry(entry)
+        user = super().get_user(user_id)
+        if user is not None:
+            cache.set(user_key(user_id), cache_entry(user), USER_TIMEOUT)
+        return user
+
+    async def aget_user(self, user_id):
+        cache = user_cache()
+        if cache is None:
+            return await super().aget_user(user_id)
+        entry = await cache.aget(user_key(user_id))
+        if entry is not None:
+            return user_from_entry(entry)
+        user = await super().aget_user(user_id)
+        if user is not None:
+            await cache.aset(user_key(user_id), cache_entry(user), USER_TIMEOUT)
+        return user
+
+
+@checks.register(checks.Tags.caches, checks.Tags.security)
+def check_shared_caches(app_configs, **kwargs):
+    errors = []
+    alias = getattr(settings, 'AUTH_USER_CACHE', None)
+    if alias and BACKEND in settings.AUTHENTICATION_BACKENDS and is_process_local(alias):
+        errors.append(
+            checks.Error(
+                f'AUTH_USER_CACHE usa o cache "{alias}", local ao processo.',
+                hint='Aponte para um cache compartilhado (Redis, Memcached, arquivo) ou use None.',
+                id='main.E001',
+            )
+        )
+    if settings.SESSION_ENGINE == 'django.contrib.sessions.backends.cached_db' and is_process_local(settings.SESSION_CACHE_ALIAS):
+        errors.append(
+            checks.Error(
+                f'Sessoes cached_db usam o cache "{settings.SESSION_CACHE_ALIAS}", local ao processo.',
+                hint='Um logout em um worker nao encerraria a sessao nos outros. Use um cache compartilhado.',
+                id='main.E002',
+            )
+        )
+    return errors
@@ -0,0 +1,85 @@
+import hashlib
+from functools import lru_cache
+from pathlib import Path
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.messages import get_messages
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import quote_etag
+
+
+@lru_cache
+def templates_version():
+    # Deploy com template novo muda o ETag, mesmo sem nenhuma linha alterada no banco.
+    dirs = [Path(__file__).resolve().parent / 'templates']
+    dirs += [Path(path) for config in settings.TEMPLATES for path in config.get('DIRS', [])]
+    mtimes = [path.stat().st_mtime_ns for folder in dirs if folder.is_dir() for path in folder.rglob('*.html')]
+    return str(max(mtimes, default=0))
+
+
+class ConditionalGetMixin:
+    """ETag a partir de (pk, updated_at) das linhas exibidas; responde 304 sem renderizar.
+
+    A view define get_validator_rows(): um queryset barato de (pk, updated_at).
+    Sem Last-Modified: a data da linha mais nova da pagina nao muda quando uma linha sai, o total
+    muda ou o template muda, e um If-Modified-Since sozinho daria 304 para HTML diferente.
+    """
+
+    def get_validator_extra(self):
+        return ()
+
+    def make_etag(self, rows, extra=()):
+        request = self.request
+        if get_messages(request):
+            # Mensagens pendentes entram no HTML e somem depois de exibidas.
+            return None
+        digest = hashlib.sha1()
+        for part in (
+            templates_version(),
+            request.user.pk,
+            # O token CSRF embutido no HTML so troca no login, junto com a chave de sessao.
+            request.COOKIES.get(settings.SESSION_COOKIE_NAME, ''),
+            request.headers.get('HX-Request', ''),
+            request.headers.get('HX-History-Restore-Request', ''),
+            request.get_full_path(),
+            *rows,
+            *extra,
+        ):
+            digest.update(repr(part).encode())
+            digest.update(b'\0')
+        return quote_etag(digest.hexdigest())
+
+    def not_modified(self, etag):
+        if etag is None:
+            return None
+        return get_conditional_response(self.request, etag=etag)
+
+    def add_etag(self, response, etag):
+        if etag is not None and response.status_code in (200, 304):
+            response.headers.setdefault('ETag', etag)
+        # Sempre revalida: o HTML depende do usuario e o HTMX pede a mesma URL em outro formato.
+        patch_cache_control(response, private=True, no_cache=True)
+        patch_vary_headers(response, ['Cookie', 'HX-Request', 'HX-History-Restore-Request'])
+        return response
+
+    def get(self, request, *args, **kwargs):
+        etag = self.make_etag(list(self.get_validator_rows()), self.get_validator_extra())
+        response = self.not_modified(etag)
+        if response is not None:
+            return self.add_etag(response, etag)
+        return self.add_etag(super().get(request, *args, **kwargs), etag)
+
+
+class AsyncConditionalGetMixin(ConditionalGetMixin):
+    async def aget_validator_extra(self):
+        return self.get_validator_extra()
+
+    async def get(self, request, *args, **kwargs):
+        rows = [row async for row in self.get_validator_rows()]
+        # make_etag le as mensagens, que podem estar na sessao (I/O sincrono).
+        etag = await sync_to_async(self.make_etag)(rows, await self.aget_validator_extra())
+        response = self.not_modified(etag)
+        if response is not None:
+            return self.add_etag(response, etag)
+        return self.add_etag(await super().get(request, *args, **kwargs), etag)
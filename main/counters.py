@@ -0,0 +1,57 @@
+from django.db import transaction
+from django.db.models import Count, F, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce, Greatest
+from django.utils import timezone
+
+from .models import Article, Developer
+
+Link = Article.developers.through
+
+# (modelo, campo do contador, coluna do proprio modelo na tabela de ligacao)
+TOTALS = (
+    (Developer, 'article_total', 'developer_id'),
+    (Article, 'developer_total', 'article_id'),
+)
+
+
+def shift_total(model, field, pks, delta):
+    if not pks or not delta:
+        return
+    value = F(field) + delta if delta > 0 else Greatest(F(field) + delta, Value(0))
+    model.objects.filter(pk__in=pks).update(**{field: value, 'updated_at': timezone.now()})
+
+
+def linked_ids(source_column, source_pk, target_column, target_pks=None):
+    links = Link.objects.filter(**{source_column: source_pk})
+    if target_pks is not None:
+        links = links.filter(**{f'{target_column}__in': target_pks})
+    return set(links.values_list(target_column, flat=True))
+
+
+def link_count(column):
+    counts = (
+        Link.objects.filter(**{column: OuterRef('pk')})
+        .order_by()
+        .values(column)
+        .annotate(total=Count('*'))
+        .values('total')
+    )
+    return Coalesce(Subquery(counts, output_field=IntegerField()), 0)
+
+
+def recount_totals(batch_size=5000, models=(Developer, Article)):
+    """Recalcula os contadores por faixas de pk; devolve quantas linhas estavam divergentes."""
+    repaired = {}
+    for model, field, column in TOTALS:
+        if model not in models:
+            continue
+        repaired[model] = 0
+        last = model.objects.order_by('-pk').values_list('pk', flat=True).first() or 0
+        for start in range(0, last, batch_size):
+            batch = model.objects.filter(pk__gt=start, pk__lte=start + batch_size)
+            actual = link_count(column)
+            with transaction.atomic():
+                repaired[model] += batch.exclude(**{field: actual}).update(
+                    **{field: actual, 'updated_at': timezone.now()}
+                )
+    return repaired
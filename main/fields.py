@@ -0,0 +1,15 @@
+from django.db import models
+
+
+class SearchDocumentField(models.TextField):
+    """Coluna oculta do FTS5 que leva o nome da tabela; alvo do MATCH em todas as colunas."""
+
+
+@SearchDocumentField.register_lookup
+class Match(models.Lookup):
+    lookup_name = 'match'
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f'{lhs} MATCH {rhs}', (*lhs_params, *rhs_params)
@@ -1,6 +1,8 @@
 from django import forms
 
-from .models import Article, Developer
+from . import thumbnails
+from .models import Article, Developer, Skill
+from .widgets import DeveloperPicker
 
 
 class DeveloperForm(forms.ModelForm):
@@ -31,7 +33,11 @@ class DeveloperForm(forms.ModelForm):
         if not raw:
             return []
         parts = [part.strip() for part in raw.split(',') if part.strip()]
-        return parts
+        max_length = Skill._meta.get_field('name').max_length
+        too_long = [part for part in parts if len(part) > max_length]
+        if too_long:
+            raise forms.ValidationError(f'Skill muito longa (max. {max_length} caracteres): {too_long[0]}')
+        return Skill.objects.canonical_names(parts)
 
 
 class ArticleForm(forms.ModelForm):
@@ -45,7 +51,7 @@ class ArticleForm(forms.ModelForm):
         model = Article
         fields = ['title', 'slug', 'content', 'published_at', 'cover_image', 'developers']
         widgets = {
-            'developers': forms.CheckboxSelectMultiple,
+            'developers': DeveloperPicker,
         }
 
     def __init__(self, *args, **kwargs):
@@ -65,3 +71,13 @@ class ArticleForm(forms.ModelForm):
         for field in self.fields.values():
             css = field.widget.attrs.get('class', '')
             field.widget.attrs['class'] = f'{css} w-full border border-slate-300 px-3 py-2 rounded'
+
+    def save(self, commit=True):
+        cover_changed = 'cover_image' in self.changed_data
+        if cover_changed:
+            # Ate as novas variantes ficarem prontas, o template usa a imagem original.
+            self.instance.cover_variants = {}
+        article = super().save(commit=commit)
+        if commit and cover_changed:
+            thumbnails.schedule(article)
+        return article
@@ -1,5 +1,8 @@
-from django.contrib.auth.forms import AuthenticationForm, UserCreationForm
+from django.contrib.auth.forms import AuthenticationForm, PasswordResetForm, UserCreationForm
 from django import forms
+from django.template import loader
+
+from . import jobs
 
 
 class SignupForm(UserCreationForm):
@@ -26,3 +29,12 @@ class LoginForm(AuthenticationForm):
         for field in self.fields.values():
             css = field.widget.attrs.get('class', '')
             field.widget.attrs['class'] = f'{css} w-full border border-slate-300 px-3 py-2 rounded'
+
+
+class QueuedPasswordResetForm(PasswordResetForm):
+    def send_mail(self, subject_template_name, email_template_name, context, from_email, to_email, html_email_template_name=None):
+        # O contexto (usuario, token) so existe aqui: renderiza na requisicao e deixa o SMTP para o worker.
+        subject = ''.join(loader.render_to_string(subject_template_name, context).splitlines())
+        body = loader.render_to_string(email_template_name, context)
+        html = loader.render_to_string(html_email_template_name, context) if html_email_template_name else None
+        jobs.enqueue('django.core.mail.send_mail', subject, body, from_email, [to_email], html_message=html)
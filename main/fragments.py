@@ -0,0 +1,80 @@
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
+
+from .auth import is_process_local
+
+CARD_TEMPLATE = 'main/partials/developer_card.html'
+CARD_TIMEOUT = 60 * 60 * 24
+# Sem SHARED_CACHE os cards ficam no cache do processo: a troca de versao feita por um worker nao
+# chega aos outros, entao o fragmento so pode ficar velho por pouco tempo.
+LOCAL_CARD_TIMEOUT = 60
+
+
+def card_alias():
+    return settings.SHARED_CACHE or 'default'
+
+
+def card_timeout():
+    return LOCAL_CARD_TIMEOUT if is_process_local(card_alias()) else CARD_TIMEOUT
+
+
+def version_key(pk):
+    return f'developer-card-version:{pk}'
+
+
+def card_key(pk, version):
+    return f'developer-card:{pk}:{version}'
+
+
+def new_version():
+    # Versao inicial baseada no relogio: se a chave de versao for despejada do cache,
+    # nunca voltamos a um numero antigo que ainda tenha fragmento guardado.
+    return time.time_ns()
+
+
+def bump_developer_cards(pks):
+    cache = caches[card_alias()]
+    for pk in set(pks):
+        try:
+            cache.incr(version_key(pk))
+        except ValueError:
+            cache.set(version_key(pk), new_version(), None)
+
+
+def invalidate_developer_cards(pks):
+    pks = set(pks)
+    if not pks:
+        return
+    bump_developer_cards(pks)
+    # De novo apos o commit: um leitor concorrente pode ter guardado o estado antigo na versao nova.
+    transaction.on_commit(lambda: bump_developer_cards(pks))
+
+
+def render_developer_cards(developers):
+    developers = list(developers)
+    cache = caches[card_alias()]
+    versions = cache.get_many([version_key(dev.pk) for dev in developers])
+    for dev in developers:
+        key = version_key(dev.pk)
+        if key not in versions:
+            cache.add(key, new_version(), None)
+            versions[key] = cache.get(key)
+
+    keys = {dev.pk: card_key(dev.pk, versions[version_key(dev.pk)]) for dev in developers}
+    cached = cache.get_many(keys.values())
+    rendered = {}
+    cards = []
+    for dev in developers:
+        html = cached.get(keys[dev.pk])
+        if html is None:
+            html = render_to_string(CARD_TEMPLATE, {'dev': dev})
+            rendered[keys[dev.pk]] = html
+        cards.append(mark_safe(html))
+    if rendered:
+        cache.set_many(rendered, card_timeout())
+    return cards
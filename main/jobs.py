@@ -0,0 +1,99 @@
+import os
+import socket
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, connection, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .models import Job
+
+
+def enqueue(task, *args, **kwargs):
+    """Grava a chamada task(*args, **kwargs) na fila; args e kwargs precisam ser serializaveis em JSON.
+
+    Dentro de uma transacao o worker so ve o job depois do commit, junto com os dados que ele usa.
+    """
+    func = import_string(task)
+    if settings.JOBS_EAGER:
+        func(*args, **kwargs)
+        return None
+    return Job.objects.create(task=task, args=list(args), kwargs=kwargs)
+
+
+def worker_name():
+    return f'{socket.gethostname()}:{os.getpid()}'
+
+
+def due_jobs(now):
+    # Job em execucao ha mais de JOB_LOCK_TIMEOUT e de um worker que morreu: volta a ser reivindicavel.
+    stale = now - timedelta(seconds=settings.JOB_LOCK_TIMEOUT)
+    return Job.objects.filter(Q(status=Job.PENDING, run_at__lte=now) | Q(status=Job.RUNNING, locked_at__lt=stale))
+
+
+def claim(worker, limit=1):
+    """Reivindica ate limit jobs vencidos para worker e os devolve ja marcados como em execucao.
+
+    No SQLite nao ha SELECT ... FOR UPDATE, mas a transacao e IMMEDIATE (settings): o BEGIN ja
+    pega o lock de escrita e os claims de processos diferentes ficam em fila. Em bancos com
+    SKIP LOCKED os workers pulam as linhas ja travadas. Nos dois casos o UPDATE repete o filtro,
+    entao um job so muda de dono se ainda estiver livre.
+    """
+    if limit < 1:
+        return []
+    now = timezone.now()
+    with transaction.atomic():
+        candidates = due_jobs(now).order_by('run_at', 'id')
+        if connection.features.has_select_for_update_skip_locked:
+            candidates = candidates.select_for_update(skip_locked=True)
+        ids = list(candidates.values_list('pk', flat=True)[:limit])
+        if not ids:
+            return []
+        due_jobs(now).filter(pk__in=ids).update(
+            status=Job.RUNNING,
+            locked_by=worker,
+            locked_at=now,
+            attempts=F('attempts') + 1,
+        )
+        return list(Job.objects.filter(pk__in=ids, locked_by=worker, locked_at=now).order_by('run_at', 'id'))
+
+
+# Job encerrado nao guarda os argumentos: o e-mail de reset de senha leva o link valido no corpo.
+CLEARED = {'args': [], 'kwargs': {}}
+
+
+def retry_delay(attempts):
+    return min(settings.JOB_RETRY_MAX_DELAY, settings.JOB_RETRY_DELAY * 2 ** (attempts - 1))
+
+
+def owned(job):
+    # Se o lock expirou e outro worker pegou o job, este resultado nao vale mais.
+    return Job.objects.filter(pk=job.pk, locked_by=job.locked_by, locked_at=job.locked_at)
+
+
+def run(job):
+    """Executa um job reivindicado; falhas voltam para a fila com backoff exponencial."""
+    try:
+        import_string(job.task)(*job.args, **job.kwargs)
+    except Exception:
+        now = timezone.now()
+        if job.attempts >= job.max_attempts:
+            changes = {'status': Job.FAILED, 'finished_at': now, **CLEARED}
+        else:
+            changes = {'status': Job.PENDING, 'run_at': now + timedelta(seconds=retry_delay(job.attempts))}
+        owned(job).update(locked_by='', locked_at=None, last_error=traceback.format_exc(), **changes)
+        return False
+    owned(job).update(status=Job.DONE, finished_at=timezone.now(), locked_by='', locked_at=None, last_error='', **CLEARED)
+    return True
+
+
+def execute(job):
+    # Roda nas threads do worker: cada uma tem a propria conexao.
+    close_old_connections()
+    try:
+        return run(job)
+    finally:
+        close_old_connections()
@@ -0,0 +1,94 @@
+import asyncio
+import statistics
+import time
+
+from asgiref.sync import async_to_sync, sync_to_async
+from django.contrib.auth import get_user_model
+from django.core.management.base import CommandError
+from django.test import AsyncRequestFactory
+from django.urls import resolve
+
+from main import views
+
+from .benchmark_views import Command as BenchmarkViewsCommand
+
+# Cenarios do benchmark_views comparados nas duas versoes da view.
+VIEWS = {
+    'developer_list': (views.DeveloperListView, views.AsyncDeveloperListView),
+    'developer_list_htmx': (views.DeveloperListView, views.AsyncDeveloperListView),
+    'article_list': (views.ArticleListView, views.AsyncArticleListView),
+    'article_list_htmx': (views.ArticleListView, views.AsyncArticleListView),
+    'article_list_search': (views.ArticleListView, views.AsyncArticleListView),
+    'article_detail': (views.ArticleDetailView, views.AsyncArticleDetailView),
+}
+
+
+class Command(BenchmarkViewsCommand):
+    help = "Compara as views de listagem/detalhe sync e async sob requisicoes concorrentes, como no handler ASGI."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', default='1000,10000', help='Volumes de developers/artigos, separados por virgula')
+        parser.add_argument('--concurrency', type=int, default=50, help='Requisicoes simultaneas por rodada')
+        parser.add_argument('--rounds', type=int, default=5, help='Rodadas por view em cada volume')
+        parser.add_argument(
+            '--current-db',
+            action='store_true',
+            help='Usa o banco atual em vez de criar um banco de teste descartavel',
+        )
+
+    def handle(self, *args, **options):
+        sizes = sorted(int(size) for size in options['sizes'].split(',') if size.strip())
+        concurrency = max(1, options['concurrency'])
+        rounds = max(1, options['rounds'])
+        with self.benchmark_database(options['current_db']):
+            for size in sizes:
+                self.grow_to(size)
+                self.stdout.write(self.style.MIGRATE_HEADING(f'N = {size}, {concurrency} requisicoes simultaneas'))
+                self.stdout.write(f'{"view":<24}{"modo":>6}{"req/s":>10}{"p50 ms":>10}{"p95 ms":>10}')
+                self.compare(concurrency, rounds)
+
+    def compare(self, concurrency, rounds):
+        _, scenarios = self.prepare()
+        user = get_user_model().objects.get(username='demo1')
+        factory = AsyncRequestFactory()
+        for name, _, url, data, headers in scenarios:
+            if name not in VIEWS:
+                continue
+            kwargs = resolve(url).kwargs
+            for mode, view_class in zip(('sync', 'async'), VIEWS[name]):
+                view = view_class.as_view()
+                if mode == 'sync':
+                    # Mesmo caminho do handler ASGI para views sincronas.
+                    view = sync_to_async(view)
+
+                def build():
+                    request = factory.get(url, data, headers=headers)
+                    request.user = user
+
+                    async def auser():
+                        return user
+
+                    request.auser = auser
+                    return request
+
+                timings, elapsed = async_to_sync(self.run_rounds)(view, build, kwargs, concurrency, rounds)
+                p95 = statistics.quantiles(timings, n=20)[-1] if len(timings) > 1 else timings[0]
+                self.stdout.write(
+                    f'{name:<24}{mode:>6}{len(timings) / elapsed:>10.0f}'
+                    f'{statistics.median(timings):>10.1f}{p95:>10.1f}'
+                )
+
+    async def run_rounds(self, view, build, kwargs, concurrency, rounds):
+        async def one():
+            started = time.perf_counter()
+            response = await view(build(), **kwargs)
+            await sync_to_async(response.render)()
+            if response.status_code != 200:
+                raise CommandError(f'{build().path} respondeu {response.status_code}')
+            return (time.perf_counter() - started) * 1000
+
+        timings = []
+        started = time.perf_counter()
+        for _ in range(rounds):
+            timings.extend(await asyncio.gather(*(one() for _ in range(concurrency))))
+        return timings, time.perf_counter() - started
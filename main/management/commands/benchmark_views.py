@@ -0,0 +1,168 @@
+import statistics
+import time
+from contextlib import contextmanager
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, setup_test_environment, teardown_test_environment
+from django.urls import reverse
+
+from main.models import Article, Developer
+
+# Teto de queries por requisicao, independente de N: so as queries da view, ja que sessao e
+# usuario saem do SHARED_CACHE (developer_list, a primeira medida, paga a leitura do usuario com cache frio).
+# Se uma view passar disso ao crescer a base, ha um N+1 escondido.
+# Listagens e detalhe pagam uma query a mais para o ETag; article_list tambem o total e o prefetch dos
+# developers, e o filtro por developer le o selecionado (estado do ETag e rotulo do picker).
+QUERY_BUDGETS = {
+    'developer_list': 3,
+    'developer_list_htmx': 2,
+    'developer_autocomplete': 1,
+    'article_list': 4,
+    'article_list_htmx': 5,
+    'article_list_search': 5,
+    'article_list_developer': 6,
+    'article_detail': 3,
+    'developer_create': 0,
+    'developer_update': 1,
+    'article_create': 0,
+    'article_update': 3,
+}
+
+
+class Command(BaseCommand):
+    help = "Mede latencia (p50/p95), queries e tamanho da resposta das views principais em varios volumes de dados."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sizes',
+            default='1000,10000,100000',
+            help='Volumes de developers/artigos, separados por virgula',
+        )
+        parser.add_argument('--repeat', type=int, default=20, help='Requisicoes por view em cada volume')
+        parser.add_argument(
+            '--budget',
+            action='append',
+            default=[],
+            metavar='VIEW=N',
+            help='Sobrescreve o teto de queries de uma view (pode repetir)',
+        )
+        parser.add_argument(
+            '--current-db',
+            action='store_true',
+            help='Usa o banco atual em vez de criar um banco de teste descartavel',
+        )
+
+    def handle(self, *args, **options):
+        sizes = sorted(int(size) for size in options['sizes'].split(',') if size.strip())
+        budgets = dict(QUERY_BUDGETS)
+        for item in options['budget']:
+            name, _, value = item.partition('=')
+            if name not in budgets or not value.isdigit():
+                raise CommandError(f'Budget invalido: {item}')
+            budgets[name] = int(value)
+
+        with self.benchmark_database(options['current_db']):
+            violations = self.run_sizes(sizes, options['repeat'], budgets)
+
+        if violations:
+            raise CommandError('Budget de queries excedido: ' + '; '.join(violations))
+        self.stdout.write(self.style.SUCCESS('Todas as views dentro do budget de queries.'))
+
+    @contextmanager
+    def benchmark_database(self, current_db):
+        try:
+            setup_test_environment()
+            owns_environment = True
+        except RuntimeError:
+            # Ja estamos dentro da suite de testes.
+            owns_environment = False
+        old_name = None
+        if not current_db:
+            old_name = connection.settings_dict['NAME']
+            connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            yield
+        finally:
+            if old_name is not None:
+                connection.creation.destroy_test_db(old_name, verbosity=0)
+            if owns_environment:
+                teardown_test_environment()
+
+    def run_sizes(self, sizes, repeat, budgets):
+        violations = []
+        for size in sizes:
+            self.grow_to(size)
+            self.stdout.write(self.style.MIGRATE_HEADING(f'N = {size}'))
+            self.stdout.write(f'{"view":<24}{"p50 ms":>10}{"p95 ms":>10}{"queries":>10}{"bytes":>12}')
+            client, scenarios = self.prepare()
+            for name, method, url, data, headers in scenarios:
+                timings, queries, size_bytes = self.measure(client, method, url, data, headers, repeat)
+                p50 = statistics.median(timings)
+                p95 = statistics.quantiles(timings, n=20)[-1] if len(timings) > 1 else timings[0]
+                flag = ''
+                if queries > budgets[name]:
+                    flag = self.style.ERROR(f'  > budget {budgets[name]}')
+                    violations.append(f'{name} com N={size}: {queries} queries (budget {budgets[name]})')
+                self.stdout.write(f'{name:<24}{p50:>10.1f}{p95:>10.1f}{queries:>10}{size_bytes:>12}{flag}')
+        return violations
+
+    def grow_to(self, size):
+        missing_developers = max(0, size - Developer.objects.count())
+        missing_articles = max(0, size - Article.objects.count())
+        if not (missing_developers or missing_articles):
+            return
+        call_command(
+            'seed_demo',
+            '--scale',
+            '--users', '2',
+            '--developers', str(missing_developers),
+            '--articles', str(missing_articles),
+            '--seed', str(size),
+            stdout=StringIO(),
+        )
+
+    def prepare(self):
+        user = get_user_model().objects.get(username='demo1')
+        client = Client()
+        client.force_login(user)
+        article = Article.objects.filter(user=user).order_by('pk').first()
+        developer = Developer.objects.filter(user=user).order_by('pk').first()
+        linked = article.developers.order_by('pk').first()
+        term = article.title.split()[0]
+        hx = {'HX-Request': 'true'}
+        scenarios = [
+            ('developer_list', 'get', reverse('main:developer_list'), {}, {}),
+            ('developer_list_htmx', 'get', reverse('main:developer_list'), {'search': developer.name[:3]}, hx),
+            ('developer_autocomplete', 'get', reverse('main:developer_autocomplete'), {'q': developer.name[:2]}, hx),
+            ('article_list', 'get', reverse('main:article_list'), {}, {}),
+            ('article_list_htmx', 'get', reverse('main:article_list'), {'search': term}, hx),
+            ('article_list_search', 'get', reverse('main:article_list'), {'search': term}, {}),
+            ('article_list_developer', 'get', reverse('main:article_list'), {'developer': linked.pk}, {}),
+            ('article_detail', 'get', reverse('main:article_detail', args=[article.pk]), {}, {}),
+            ('developer_create', 'get', reverse('main:developer_create'), {}, {}),
+            ('developer_update', 'get', reverse('main:developer_update', args=[developer.pk]), {}, {}),
+            ('article_create', 'get', reverse('main:article_create'), {}, {}),
+            ('article_update', 'get', reverse('main:article_update', args=[article.pk]), {}, {}),
+        ]
+        return client, scenarios
+
+    def measure(self, client, method, url, data, headers, repeat):
+        timings = []
+        queries = 0
+        size_bytes = 0
+        for _ in range(max(1, repeat)):
+            with CaptureQueriesContext(connection) as captured:
+                started = time.perf_counter()
+                response = getattr(client, method)(url, data, headers=headers)
+                elapsed = time.perf_counter() - started
+            if response.status_code != 200:
+                raise CommandError(f'{url} respondeu {response.status_code}')
+            timings.append(elapsed * 1000)
+            queries = max(queries, len(captured))
+            size_bytes = len(response.content)
+        return timings, queries, size_bytes
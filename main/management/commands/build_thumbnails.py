@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand
+
+from main import thumbnails
+from main.models import Article
+
+
+class Command(BaseCommand):
+    help = "Gera as miniaturas WebP/JPEG das capas ja existentes em media/covers/."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help='Regera mesmo quem ja tem variantes')
+        parser.add_argument('--batch-size', type=int, default=500, help='Artigos lidos por lote')
+
+    def handle(self, *args, **options):
+        articles = Article.objects.exclude(cover_image='').exclude(cover_image__isnull=True)
+        if not options['force']:
+            articles = articles.filter(cover_variants={})
+        built = failed = 0
+        last_pk = 0
+        while True:
+            # Lotes por pk em vez de iterator(): as linhas lidas sao atualizadas durante o laco.
+            batch = list(
+                articles.filter(pk__gt=last_pk).order_by('pk').values_list('pk', 'cover_image')[: options['batch_size']]
+            )
+            if not batch:
+                break
+            for pk, name in batch:
+                try:
+                    thumbnails.build_for_article(pk, name)
+                except (OSError, ValueError) as exc:
+                    failed += 1
+                    self.stderr.write(f'Artigo {pk} ({name}): {exc}')
+                    continue
+                built += 1
+            last_pk = batch[-1][0]
+        self.stdout.write(self.style.SUCCESS(f'Miniaturas geradas para {built} artigos ({failed} falhas)'))
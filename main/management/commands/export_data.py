@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from main.transfer import TRANSFERS, RowWriter, detect_format
+
+
+class Command(BaseCommand):
+    help = "Exporta developers ou artigos (com skills e links N:N) para CSV ou JSONL, em streaming."
+
+    def add_arguments(self, parser):
+        parser.add_argument('kind', choices=sorted(TRANSFERS), help='O que exportar')
+        parser.add_argument('path', help='Arquivo de saida (.csv ou .jsonl)')
+        parser.add_argument('--format', choices=['csv', 'jsonl'], help='Formato, se nao der para inferir pela extensao')
+        parser.add_argument('--chunk-size', type=int, default=2000, help='Linhas lidas do banco por vez')
+
+    def handle(self, *args, **options):
+        transfer = TRANSFERS[options['kind']]
+        try:
+            fmt = detect_format(options['path'], options['format'])
+        except ValueError as exc:
+            raise CommandError(str(exc))
+
+        total = 0
+        with open(options['path'], 'w', encoding='utf-8', newline='') as handle:
+            writer = RowWriter(handle, fmt, transfer.fields)
+            for row in transfer.export_rows(max(1, options['chunk_size'])):
+                writer.write(row)
+                total += 1
+        self.stdout.write(self.style.SUCCESS(f'Exportados {total} {transfer.kind} para {options["path"]}'))
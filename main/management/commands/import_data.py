@@ -0,0 +1,65 @@
+import time
+
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from main.transfer import TRANSFERS, Checkpoint, detect_format, read_rows
+
+
+class Command(BaseCommand):
+    help = (
+        "Importa developers ou artigos de CSV/JSONL em lotes com upsert (email para developers, "
+        "usuario+slug para artigos). Retoma do ultimo lote confirmado se houver checkpoint."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('kind', choices=sorted(TRANSFERS), help='O que importar')
+        parser.add_argument('path', help='Arquivo de entrada (.csv ou .jsonl)')
+        parser.add_argument('--format', choices=['csv', 'jsonl'], help='Formato, se nao der para inferir pela extensao')
+        parser.add_argument('--batch-size', type=int, default=1000, help='Linhas por transacao')
+        parser.add_argument('--checkpoint', help='Arquivo de checkpoint (padrao: <arquivo>.checkpoint)')
+        parser.add_argument('--restart', action='store_true', help='Ignora o checkpoint e comeca do inicio')
+
+    def handle(self, *args, **options):
+        transfer = TRANSFERS[options['kind']]
+        path = options['path']
+        batch_size = max(1, options['batch_size'])
+        checkpoint = Checkpoint(options['checkpoint'] or f'{path}.checkpoint', transfer.kind)
+        try:
+            fmt = detect_format(path, options['format'])
+            offset, done = (0, 0) if options['restart'] else checkpoint.load()
+        except ValueError as exc:
+            raise CommandError(str(exc))
+        if offset:
+            self.stdout.write(f'Retomando apos {done} registros (byte {offset})')
+
+        started = time.perf_counter()
+        imported = 0
+        batch = []
+        try:
+            for row, offset in read_rows(path, fmt, offset):
+                batch.append(row)
+                if len(batch) >= batch_size:
+                    imported += self.flush(transfer, batch, done)
+                    done += len(batch)
+                    batch = []
+                    checkpoint.save(offset, done)
+                    self.stdout.write(f'  {done} registros ({imported / (time.perf_counter() - started):.0f}/s)')
+            if batch:
+                imported += self.flush(transfer, batch, done)
+                done += len(batch)
+        except (OSError, ValueError) as exc:
+            raise CommandError(f'Falha lendo {path}: {exc}. Rode de novo para retomar do checkpoint.')
+        checkpoint.clear()
+        self.stdout.write(self.style.SUCCESS(f'Importados {imported} {transfer.kind} ({done} registros lidos)'))
+
+    def flush(self, transfer, batch, done):
+        try:
+            with transaction.atomic():
+                return transfer.import_batch(batch)
+        except (ValidationError, KeyError) as exc:
+            message = '; '.join(exc.messages) if isinstance(exc, ValidationError) else f'campo ausente {exc}'
+            raise CommandError(
+                f'Registros {done + 1}-{done + len(batch)}: {message}. Corrija e rode de novo para retomar.'
+            )
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from main import search
+from main.models import Article
+
+
+class Command(BaseCommand):
+    help = "Reconstroi o indice de busca full-text (FTS5) dos artigos."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help='Artigos por lote de insercao')
+
+    def handle(self, *args, **options):
+        if not search.is_available():
+            raise CommandError('Busca full-text disponivel apenas com SQLite (FTS5).')
+        total = search.rebuild_index(Article.objects.all(), batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Indexados {total} artigos'))
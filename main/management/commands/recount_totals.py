@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from main.counters import recount_totals
+from main.models import Article, Developer
+
+
+class Command(BaseCommand):
+    help = "Recalcula article_total/developer_total em lotes e corrige contadores divergentes."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=5000, help='Faixa de ids por lote')
+
+    def handle(self, *args, **options):
+        repaired = recount_totals(batch_size=options['batch_size'])
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Corrigidos {repaired[Developer]} developers e {repaired[Article]} artigos'
+            )
+        )
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+
+from main.content import render_content
+from main.models import Article
+
+
+class Command(BaseCommand):
+    help = "Regera excerpt e HTML sanitizado dos artigos (rodar depois de mudar o sanitizador)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help='Artigos por lote')
+
+    def handle(self, *args, **options):
+        changed = 0
+        last_pk = 0
+        while True:
+            # bulk_update direto: o texto nao muda, entao updated_at e o indice de busca ficam como estao.
+            batch = list(
+                Article.objects.filter(pk__gt=last_pk).order_by('pk').only('pk', 'content', 'excerpt', 'content_html')[: options['batch_size']]
+            )
+            if not batch:
+                break
+            stale = []
+            for article in batch:
+                rendered = render_content(article.content)
+                if rendered != (article.excerpt, article.content_html):
+                    article.excerpt, article.content_html = rendered
+                    stale.append(article)
+            Article.objects.bulk_update(stale, ['excerpt', 'content_html'])
+            changed += len(stale)
+            last_pk = batch[-1].pk
+        self.stdout.write(self.style.SUCCESS(f'Conteudo regerado em {changed} artigos'))
@@ -0,0 +1,81 @@
+import multiprocessing
+import signal
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from main import jobs
+
+
+class Command(BaseCommand):
+    help = "Processa a fila de jobs em banco (e-mails, miniaturas) com um pool de threads por processo."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=settings.JOB_WORKER_THREADS, help='Jobs simultaneos por processo')
+        parser.add_argument('--processes', type=int, default=1, help='Processos worker (cada um com --threads threads)')
+        parser.add_argument('--poll', type=float, default=1.0, help='Segundos de espera quando a fila esta vazia')
+        parser.add_argument('--burst', action='store_true', help='Sai quando nao houver mais jobs vencidos (cron, testes)')
+
+    def handle(self, *args, **options):
+        self.stop = threading.Event()
+        threads = max(1, options['threads'])
+        processes = max(1, options['processes'])
+        if processes > 1 and 'fork' not in multiprocessing.get_all_start_methods():
+            raise CommandError('--processes exige fork (indisponivel no Windows): rode varios run_worker ou aumente --threads.')
+        if processes == 1:
+            self.install_signal_handlers()
+            done, failed = self.work(threads, options['poll'], options['burst'])
+            self.stdout.write(self.style.SUCCESS(f'{done} jobs concluidos ({failed} falhas)'))
+            return
+
+        # Conexoes abertas nao podem atravessar o fork: cada processo abre a sua.
+        connections.close_all()
+        context = multiprocessing.get_context('fork')
+        children = [
+            context.Process(target=self.run_child, args=(threads, options['poll'], options['burst']))
+            for _ in range(processes)
+        ]
+        for child in children:
+            child.start()
+        try:
+            for child in children:
+                child.join()
+        except KeyboardInterrupt:
+            for child in children:
+                child.terminate()
+                child.join()
+
+    def run_child(self, threads, poll, burst):
+        self.install_signal_handlers()
+        done, failed = self.work(threads, poll, burst)
+        self.stdout.write(f'{jobs.worker_name()}: {done} jobs concluidos ({failed} falhas)')
+
+    def install_signal_handlers(self):
+        # SIGTERM/SIGINT: para de reivindicar e espera os jobs em andamento.
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            signal.signal(signum, lambda *args: self.stop.set())
+
+    def work(self, threads, poll, burst):
+        worker = jobs.worker_name()
+        done = failed = 0
+        running = set()
+        with ThreadPoolExecutor(max_workers=threads, thread_name_prefix='jobs') as pool:
+            while True:
+                claimed = [] if self.stop.is_set() else jobs.claim(worker, threads - len(running))
+                running |= {pool.submit(jobs.execute, job) for job in claimed}
+                if not running:
+                    if burst or self.stop.is_set():
+                        break
+                    self.stop.wait(poll)
+                    continue
+                finished, running = wait(running, timeout=poll, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    if future.result():
+                        done += 1
+                    else:
+                        failed += 1
+        connections.close_all()
+        return done, failed
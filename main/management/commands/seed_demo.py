@@ -1,10 +1,71 @@
 import random
+import time
+from datetime import datetime, timezone as dt_timezone
+from multiprocessing import Pool
 
 from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
 from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Max
 from faker import Faker
 
-from main.models import Article, Developer
+from main import search
+from main.content import render_content
+from main.counters import recount_totals
+from main.models import Article, Developer, DeveloperSkill, Skill
+
+SKILLS = ['python', 'django', 'react', 'docker', 'aws', 'sql']
+SENIORITIES = ['jr', 'pl', 'sr']
+
+
+def _faker(seed, label, start):
+    fake = Faker('pt_BR')
+    fake.seed_instance(f'{seed}-{label}-{start}')
+    return fake, random.Random(f'{seed}-{label}-{start}')
+
+
+def developer_chunk(spec):
+    seed, start, count = spec
+    fake, rng = _faker(seed, 'developers', start)
+    return [
+        (
+            fake.name(),
+            fake.user_name(),
+            rng.choice(SENIORITIES),
+            rng.sample(SKILLS, k=rng.randint(1, 4)),
+        )
+        for _ in range(count)
+    ]
+
+
+def publication_window():
+    # Janela fechada no dia (e nao no instante atual) para que a mesma semente gere as mesmas datas.
+    today = datetime.now(dt_timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+    return today.replace(month=1, day=1), today
+
+
+def article_chunk(spec):
+    seed, start, count = spec
+    fake, _ = _faker(seed, 'articles', start)
+    window_start, window_end = publication_window()
+    return [
+        (
+            fake.sentence(nb_words=4),
+            fake.paragraph(nb_sentences=5),
+            fake.date_time_between_dates(window_start, window_end, tzinfo=dt_timezone.utc),
+        )
+        for _ in range(count)
+    ]
+
+
+def insert_links(model, fields, rows):
+    # Tabelas de ligacao sao so pares de FKs: executemany direto evita instanciar um model por linha.
+    columns = ', '.join(connection.ops.quote_name(model._meta.get_field(name).column) for name in fields)
+    placeholders = ', '.join(['%s'] * len(fields))
+    table = connection.ops.quote_name(model._meta.db_table)
+    with connection.cursor() as cursor:
+        cursor.executemany(f'INSERT INTO {table} ({columns}) VALUES ({placeholders})', rows)
 
 
 class Command(BaseCommand):
@@ -14,43 +75,184 @@ class Command(BaseCommand):
         parser.add_argument('--users', type=int, default=2, help='Quantidade de usuarios demo')
         parser.add_argument('--developers', type=int, default=10, help='Quantidade de developers')
         parser.add_argument('--articles', type=int, default=10, help='Quantidade de artigos')
+        parser.add_argument('--seed', type=int, help='Semente para gerar sempre os mesmos dados')
+        parser.add_argument(
+            '--scale',
+            action='store_true',
+            help='Modo volume: bulk_create em lotes, sem passar por save() linha a linha',
+        )
+        parser.add_argument('--batch-size', type=int, default=5000, help='Linhas por lote no modo --scale')
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=1,
+            help='Processos para gerar dados Faker no modo --scale (1 = sem multiprocessamento)',
+        )
 
     def handle(self, *args, **options):
-        fake = Faker('pt_BR')
-        User = get_user_model()
+        seed = options['seed']
+        if seed is None:
+            seed = random.randrange(2**31)
+        self.stdout.write(f'Semente: {seed}')
+        self.rng = random.Random(seed)
 
-        users = []
-        for i in range(options['users']):
-            username = f'demo{i+1}'
-            user, _ = User.objects.get_or_create(username=username, defaults={'email': f'{username}@example.com'})
-            user.set_password('password')
-            user.save()
-            users.append(user)
+        users = self.create_users(options['users'])
         self.stdout.write(self.style.SUCCESS(f'Criados {len(users)} usuarios (senha: password)'))
 
+        if options['scale']:
+            self.seed_scale(users, seed, options)
+        else:
+            self.seed_simple(users, seed, options)
+
+    def create_users(self, count):
+        User = get_user_model()
+        # Um unico hash PBKDF2 reaproveitado por todos os usuarios demo.
+        password = make_password('password')
+        usernames = [f'demo{i + 1}' for i in range(count)]
+        User.objects.bulk_create(
+            [User(username=name, email=f'{name}@example.com', password=password) for name in usernames],
+            ignore_conflicts=True,
+        )
+        User.objects.filter(username__in=usernames).update(password=password)
+        by_name = User.objects.in_bulk(usernames, field_name='username')
+        return [by_name[name] for name in usernames]
+
+    def seed_simple(self, users, seed, options):
+        fake = Faker('pt_BR')
+        fake.seed_instance(seed)
+        rng = self.rng
+        window_start, window_end = publication_window()
+
         devs = []
         for _ in range(options['developers']):
-            user = random.choice(users)
-            name = fake.name()
             dev = Developer.objects.create(
-                user=user,
-                name=name,
+                user=rng.choice(users),
+                name=fake.name(),
                 email=fake.unique.email(),
-                seniority=random.choice(['jr', 'pl', 'sr']),
-                skills=random.sample(['python', 'django', 'react', 'docker', 'aws', 'sql'], k=random.randint(1, 4)),
+                seniority=rng.choice(SENIORITIES),
+                skills=rng.sample(SKILLS, k=rng.randint(1, 4)),
             )
             devs.append(dev)
         self.stdout.write(self.style.SUCCESS(f'Criados {len(devs)} developers'))
 
         for _ in range(options['articles']):
-            user = random.choice(users)
-            title = fake.sentence(nb_words=4)
             article = Article.objects.create(
-                user=user,
-                title=title,
+                user=rng.choice(users),
+                title=fake.sentence(nb_words=4),
                 content=fake.paragraph(nb_sentences=5),
-                published_at=fake.date_time_this_year(),
+                published_at=fake.date_time_between_dates(window_start, window_end, tzinfo=dt_timezone.utc),
             )
-            chosen = random.sample(devs, k=random.randint(1, min(3, len(devs))))
-            article.developers.add(*chosen)
+            if devs:
+                article.developers.add(*rng.sample(devs, k=rng.randint(1, min(3, len(devs)))))
         self.stdout.write(self.style.SUCCESS(f'Criados {options["articles"]} artigos'))
+
+    def seed_scale(self, users, seed, options):
+        batch_size = max(1, options['batch_size'])
+        workers = max(1, options['workers'])
+        pool = Pool(workers) if workers > 1 else None
+        try:
+            dev_ids = self.bulk_developers(users, seed, options['developers'], batch_size, pool)
+            self.bulk_articles(users, dev_ids, seed, options['articles'], batch_size, pool)
+        finally:
+            if pool is not None:
+                pool.close()
+                pool.join()
+
+    def chunks(self, func, seed, total, batch_size, pool):
+        specs = [(seed, start, min(batch_size, total - start)) for start in range(0, total, batch_size)]
+        if pool is None:
+            return map(func, specs)
+        return pool.imap(func, specs)
+
+    def bulk_developers(self, users, seed, total, batch_size, pool):
+        rng = self.rng
+        offset = Developer.objects.aggregate(last=Max('id'))['last'] or 0
+        skill_ids = {skill.key: skill.pk for skill in Skill.objects.resolve(SKILLS)}
+        progress = Progress(self, 'developers', total)
+        dev_ids = []
+        index = offset
+        for rows in self.chunks(developer_chunk, seed, total, batch_size, pool):
+            devs = []
+            for name, user_name, seniority, skills in rows:
+                index += 1
+                devs.append(
+                    Developer(
+                        user=rng.choice(users),
+                        name=name,
+                        email=f'{user_name}.{index}@example.com',
+                        seniority=seniority,
+                        skills=skills,
+                    )
+                )
+            with transaction.atomic():
+                Developer.objects.bulk_create(devs, batch_size=batch_size)
+                insert_links(
+                    DeveloperSkill,
+                    ('developer', 'skill'),
+                    [(dev.pk, skill_ids[Skill.normalize(name)]) for dev in devs for name in dev.skills],
+                )
+            dev_ids.extend(dev.pk for dev in devs)
+            progress.advance(len(devs))
+        progress.done()
+        return dev_ids
+
+    def bulk_articles(self, users, dev_ids, seed, total, batch_size, pool):
+        rng = self.rng
+        Link = Article.developers.through
+        progress = Progress(self, 'artigos', total)
+        for rows in self.chunks(article_chunk, seed, total, batch_size, pool):
+            articles = []
+            chosen = []
+            for title, content, published_at in rows:
+                developers = rng.sample(dev_ids, k=rng.randint(1, min(3, len(dev_ids)))) if dev_ids else []
+                chosen.append(developers)
+                excerpt, content_html = render_content(content)
+                articles.append(
+                    Article(
+                        user=rng.choice(users),
+                        title=title,
+                        content=content,
+                        excerpt=excerpt,
+                        content_html=content_html,
+                        published_at=published_at,
+                        developer_total=len(developers),
+                    )
+                )
+            with transaction.atomic():
+                Article.objects.allocate_slugs(articles)
+                Article.objects.bulk_create(articles, batch_size=batch_size)
+                insert_links(
+                    Link,
+                    ('article', 'developer'),
+                    [(article.pk, dev_id) for article, developers in zip(articles, chosen) for dev_id in developers],
+                )
+                search.index_rows((article.pk, article.title, article.content) for article in articles)
+            progress.advance(len(articles))
+        progress.done()
+        # Os links entram por executemany, sem m2m_changed: recalcula o contador dos developers.
+        recount_totals(batch_size=batch_size, models=(Developer,))
+
+
+class Progress:
+    def __init__(self, command, label, total):
+        self.command = command
+        self.label = label
+        self.total = total
+        self.count = 0
+        self.started = time.perf_counter()
+
+    def rate(self):
+        elapsed = time.perf_counter() - self.started
+        return self.count / elapsed if elapsed else 0.0
+
+    def advance(self, amount):
+        self.count += amount
+        self.command.stdout.write(f'  {self.label}: {self.count}/{self.total} ({self.rate():.0f} linhas/s)')
+
+    def done(self):
+        elapsed = time.perf_counter() - self.started
+        self.command.stdout.write(
+            self.command.style.SUCCESS(
+                f'Criados {self.count} {self.label} em {elapsed:.1f}s ({self.rate():.0f} linhas/s)'
+            )
+        )
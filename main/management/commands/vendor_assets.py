@@ -0,0 +1,82 @@
+import io
+import tarfile
+import urllib.request
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Versoes fixas; o conteudo baixado fica versionado em static/vendor/ e o deploy nao depende de CDN.
+PACKAGES = {
+    'htmx': {
+        'url': 'https://registry.npmjs.org/htmx.org/-/htmx.org-1.9.12.tgz',
+        'files': {'dist/htmx.min.js': 'htmx.min.js', 'LICENSE': 'LICENSE'},
+    },
+    'tinymce': {
+        'url': 'https://registry.npmjs.org/tinymce/-/tinymce-6.8.3.tgz',
+        # So o que o editor do formulario de artigo carrega (tema, skins e os plugins do tinymce.init).
+        'dirs': [
+            'icons/default',
+            'models/dom',
+            'themes/silver',
+            'skins/ui/oxide',
+            'skins/ui/oxide-dark',
+            'skins/content/default',
+            'skins/content/dark',
+            'plugins/code',
+            'plugins/link',
+            'plugins/lists',
+            'plugins/table',
+        ],
+        'files': {'tinymce.min.js': 'tinymce.min.js', 'license.txt': 'license.txt'},
+    },
+}
+
+
+class Command(BaseCommand):
+    help = "Baixa htmx e TinyMCE do registro npm para static/vendor/ (rodar ao atualizar versoes e versionar o resultado)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('packages', nargs='*', help=f'Pacotes: {", ".join(sorted(PACKAGES))} (padrao: todos)')
+        parser.add_argument('--dest', default=str(Path(settings.BASE_DIR) / 'static' / 'vendor'), help='Pasta de destino')
+
+    def handle(self, *args, **options):
+        dest = Path(options['dest'])
+        unknown = set(options['packages']) - set(PACKAGES)
+        if unknown:
+            raise CommandError(f'Pacote desconhecido: {", ".join(sorted(unknown))}')
+        for name in options['packages'] or sorted(PACKAGES):
+            spec = PACKAGES[name]
+            try:
+                with urllib.request.urlopen(spec['url'], timeout=60) as response:
+                    data = response.read()
+            except OSError as exc:
+                raise CommandError(f'Falha ao baixar {spec["url"]}: {exc}')
+            written = self.extract(data, spec, dest / name)
+            self.stdout.write(self.style.SUCCESS(f'{name}: {written} arquivos em {dest / name}'))
+
+    def extract(self, data, spec, target):
+        files = spec.get('files', {})
+        dirs = [f'{folder}/' for folder in spec.get('dirs', [])]
+        written = 0
+        with tarfile.open(fileobj=io.BytesIO(data), mode='r:gz') as archive:
+            for member in archive.getmembers():
+                if not member.isfile():
+                    continue
+                # Pacotes npm vem dentro de package/.
+                name = member.name.split('/', 1)[1]
+                if name in files:
+                    relative = files[name]
+                elif any(name.startswith(folder) for folder in dirs) and self.is_minified(name):
+                    relative = name
+                else:
+                    continue
+                path = target / relative
+                path.parent.mkdir(parents=True, exist_ok=True)
+                path.write_bytes(archive.extractfile(member).read())
+                written += 1
+        return written
+
+    def is_minified(self, name):
+        # Cada plugin/tema traz a versao minificada e a original; so a .min e carregada.
+        return not name.endswith(('.js', '.css')) or name.endswith(('.min.js', '.min.css'))
@@ -0,0 +1,73 @@
+import threading
+from bisect import bisect_left
+
+SECONDS_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (1, 2, 3, 5, 8, 13, 21, 34, 55, 89)
+
+METRICS = {
+    'ltcloud_request_duration_seconds': ('Tempo total da requisicao', SECONDS_BUCKETS),
+    'ltcloud_view_duration_seconds': ('Tempo da view, sem renderizacao de template', SECONDS_BUCKETS),
+    'ltcloud_template_render_seconds': ('Tempo de renderizacao de template', SECONDS_BUCKETS),
+    'ltcloud_db_duration_seconds': ('Tempo total em queries SQL', SECONDS_BUCKETS),
+    'ltcloud_db_queries': ('Quantidade de queries SQL por requisicao', QUERY_BUCKETS),
+}
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class Registry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms = {}
+
+    def observe(self, metric, view, value):
+        with self._lock:
+            key = (metric, view)
+            if key not in self._histograms:
+                self._histograms[key] = Histogram(METRICS[metric][1])
+            self._histograms[key].observe(value)
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+
+    def render(self):
+        with self._lock:
+            snapshot = {
+                key: (hist.buckets, list(hist.counts), hist.sum, hist.count)
+                for key, hist in self._histograms.items()
+            }
+        lines = []
+        for metric, (description, _) in METRICS.items():
+            lines.append(f'# HELP {metric} {description}')
+            lines.append(f'# TYPE {metric} histogram')
+            for (name, view), (buckets, counts, total, count) in sorted(snapshot.items()):
+                if name != metric:
+                    continue
+                label = escape_label(view)
+                cumulative = 0
+                for bound, bucket_count in zip(buckets, counts):
+                    cumulative += bucket_count
+                    lines.append(f'{metric}_bucket{{view="{label}",le="{bound}"}} {cumulative}')
+                lines.append(f'{metric}_bucket{{view="{label}",le="+Inf"}} {count}')
+                lines.append(f'{metric}_sum{{view="{label}"}} {total}')
+                lines.append(f'{metric}_count{{view="{label}"}} {count}')
+        return '\n'.join(lines) + '\n'
+
+
+def escape_label(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+registry = Registry()
@@ -0,0 +1,150 @@
+import time
+from contextlib import ExitStack
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+
+from . import routers
+from .metrics import registry
+
+
+class RequestTimings:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.view_started = None
+        self.view_finished = None
+        self.render_finished = None
+        self.queries = 0
+        self.db_time = 0.0
+
+    def record_query(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += time.perf_counter() - started
+            self.queries += 1
+
+
+class RequestMetricsMiddleware:
+    """Mede SQL, view e template por URL nomeada; expoe em Server-Timing e nos histogramas de metrics."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        timings = self.start(request)
+        with self.wrap_queries(timings):
+            response = self.get_response(request)
+        return self.finish(request, response, timings)
+
+    async def __acall__(self, request):
+        timings = self.start(request)
+        with self.wrap_queries(timings):
+            response = await self.get_response(request)
+        return self.finish(request, response, timings)
+
+    def start(self, request):
+        timings = RequestTimings()
+        request._request_timings = timings
+        return timings
+
+    def wrap_queries(self, timings):
+        stack = ExitStack()
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(timings.record_query))
+        return stack
+
+    def finish(self, request, response, timings):
+        finished = time.perf_counter()
+
+        total = finished - timings.started
+        view_time = render_time = 0.0
+        if timings.view_started is not None:
+            view_finished = timings.view_finished or finished
+            view_time = view_finished - timings.view_started
+            if timings.render_finished is not None:
+                render_time = timings.render_finished - view_finished
+
+        response['Server-Timing'] = ', '.join(
+            [
+                f'db;dur={timings.db_time * 1000:.1f};desc="{timings.queries} queries"',
+                f'view;dur={view_time * 1000:.1f}',
+                f'tpl;dur={render_time * 1000:.1f}',
+                f'total;dur={total * 1000:.1f}',
+            ]
+        )
+
+        match = request.resolver_match
+        view = match.view_name if match else 'unresolved'
+        registry.observe('ltcloud_request_duration_seconds', view, total)
+        registry.observe('ltcloud_view_duration_seconds', view, view_time)
+        registry.observe('ltcloud_template_render_seconds', view, render_time)
+        registry.observe('ltcloud_db_duration_seconds', view, timings.db_time)
+        registry.observe('ltcloud_db_queries', view, timings.queries)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request._request_timings.view_started = time.perf_counter()
+
+    def process_template_response(self, request, response):
+        timings = request._request_timings
+        timings.view_finished = time.perf_counter()
+
+        def mark_rendered(rendered):
+            timings.render_finished = time.perf_counter()
+
+        response.add_post_render_callback(mark_rendered)
+        return response
+
+
+class DatabaseRoutingMiddleware:
+    """Estado do ReplicaRouter por requisicao; apos uma escrita prende o navegador ao primario por alguns segundos."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        token = self.start(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            state = routers.end_request(token)
+        return self.finish(response, state)
+
+    async def __acall__(self, request):
+        token = self.start(request)
+        try:
+            response = await self.get_response(request)
+        finally:
+            state = routers.end_request(token)
+        return self.finish(response, state)
+
+    def start(self, request):
+        return routers.begin_request(pinned=routers.PIN_COOKIE in request.COOKIES)
+
+    def finish(self, response, state):
+        if state.wrote and routers.replica_alias():
+            response.set_cookie(
+                routers.PIN_COOKIE,
+                '1',
+                max_age=getattr(settings, 'DATABASE_REPLICA_PIN_SECONDS', 5),
+                httponly=True,
+                samesite='Lax',
+            )
+        return response
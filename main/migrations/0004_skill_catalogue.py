@@ -0,0 +1,43 @@
+# Generated by Django 5.2.8 on 2026-10-18 07:57
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0003_alter_developer_seniority'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Skill',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=64)),
+                ('key', models.CharField(max_length=64, unique=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='DeveloperSkill',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('developer', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='skill_links', to='main.developer')),
+                ('skill', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='developer_links', to='main.skill')),
+            ],
+        ),
+        migrations.AddField(
+            model_name='developer',
+            name='skill_set',
+            field=models.ManyToManyField(blank=True, related_name='developers', through='main.DeveloperSkill', to='main.skill'),
+        ),
+        migrations.AddIndex(
+            model_name='developerskill',
+            index=models.Index(fields=['skill', 'developer'], name='developerskill_skill_dev_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='developerskill',
+            constraint=models.UniqueConstraint(fields=('developer', 'skill'), name='unique_developer_skill'),
+        ),
+    ]
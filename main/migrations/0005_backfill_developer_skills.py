@@ -0,0 +1,42 @@
+from django.db import migrations
+
+BATCH_SIZE = 1000
+
+
+def normalize(name):
+    return ' '.join(str(name).split()).casefold()
+
+
+def backfill_skills(apps, schema_editor):
+    Developer = apps.get_model('main', 'Developer')
+    Skill = apps.get_model('main', 'Skill')
+    DeveloperSkill = apps.get_model('main', 'DeveloperSkill')
+
+    skill_ids = dict(Skill.objects.values_list('key', 'id'))
+    links = []
+    rows = Developer.objects.exclude(skills__isnull=True).values_list('id', 'skills')
+    for developer_id, skills in rows.iterator(chunk_size=BATCH_SIZE):
+        if not isinstance(skills, list):
+            continue
+        for name in skills:
+            key = normalize(name)
+            if not key:
+                continue
+            if key not in skill_ids:
+                skill_ids[key] = Skill.objects.create(name=' '.join(str(name).split()), key=key).id
+            links.append(DeveloperSkill(developer_id=developer_id, skill_id=skill_ids[key]))
+        if len(links) >= BATCH_SIZE:
+            DeveloperSkill.objects.bulk_create(links, ignore_conflicts=True)
+            links = []
+    DeveloperSkill.objects.bulk_create(links, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0004_skill_catalogue'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_skills, migrations.RunPython.noop),
+    ]
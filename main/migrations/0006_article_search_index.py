@@ -0,0 +1,78 @@
+# Generated by Django 5.2.8 on 2026-10-18 07:59
+
+import html
+import re
+
+import django.db.models.deletion
+import main.fields
+from django.db import migrations, models
+from django.utils.html import strip_tags
+
+# Copia congelada de main.search/main.content: a migracao nao acompanha mudancas desses modulos
+# (rebuild_search_index reindexa com a versao atual).
+TABLE = 'main_article_fts'
+BATCH_SIZE = 1000
+WHITESPACE_RE = re.compile(r'\s+')
+
+
+def html_to_text(value):
+    if not value:
+        return ''
+    return WHITESPACE_RE.sub(' ', html.unescape(strip_tags(value.replace('<', ' <')))).strip()
+
+
+def create_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute(
+        f"CREATE VIRTUAL TABLE {TABLE} USING fts5("
+        "title, body, tokenize = 'unicode61 remove_diacritics 2')"
+    )
+    # Titulo pesa 10x mais que o corpo no BM25 exposto pela coluna oculta "rank".
+    schema_editor.execute(f"INSERT INTO {TABLE}({TABLE}, rank) VALUES ('rank', 'bm25(10.0, 1.0)')")
+    Article = apps.get_model('main', 'Article')
+    rows = (
+        Article.objects.using(schema_editor.connection.alias)
+        .order_by()
+        .values_list('pk', 'title', 'content')
+        .iterator(chunk_size=BATCH_SIZE)
+    )
+    with schema_editor.connection.cursor() as cursor:
+        batch = []
+        for pk, title, content in rows:
+            batch.append((pk, title, html_to_text(content)))
+            if len(batch) >= BATCH_SIZE:
+                cursor.executemany(f'INSERT INTO {TABLE}(rowid, title, body) VALUES (%s, %s, %s)', batch)
+                batch = []
+        if batch:
+            cursor.executemany(f'INSERT INTO {TABLE}(rowid, title, body) VALUES (%s, %s, %s)', batch)
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'sqlite':
+        schema_editor.execute(f'DROP TABLE IF EXISTS {TABLE}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0005_backfill_developer_skills'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArticleSearchEntry',
+            fields=[
+                ('article', models.OneToOneField(db_column='rowid', on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='search_entry', serialize=False, to='main.article')),
+                ('title', models.TextField()),
+                ('body', models.TextField()),
+                ('document', main.fields.SearchDocumentField(db_column='main_article_fts')),
+                ('rank', models.FloatField()),
+            ],
+            options={
+                'db_table': 'main_article_fts',
+                'managed': False,
+            },
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 5.2.8 on 2026-10-18 08:11
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+BATCH_SIZE = 5000
+
+
+def backfill_totals(apps, schema_editor):
+    Article = apps.get_model('main', 'Article')
+    Developer = apps.get_model('main', 'Developer')
+    Link = Article.developers.through
+
+    for model, field, column in ((Developer, 'article_total', 'developer_id'), (Article, 'developer_total', 'article_id')):
+        counts = (
+            Link.objects.filter(**{column: OuterRef('pk')})
+            .order_by()
+            .values(column)
+            .annotate(total=Count('*'))
+            .values('total')
+        )
+        actual = Coalesce(Subquery(counts, output_field=IntegerField()), 0)
+        last = model.objects.order_by('-pk').values_list('pk', flat=True).first() or 0
+        for start in range(0, last, BATCH_SIZE):
+            model.objects.filter(pk__gt=start, pk__lte=start + BATCH_SIZE).update(**{field: actual})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0006_article_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='article',
+            name='developer_total',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='developer',
+            name='article_total',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_totals, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-18 08:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0007_denormalized_totals'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='article',
+            name='cover_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
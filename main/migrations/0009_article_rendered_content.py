@@ -0,0 +1,185 @@
+# Generated by Django 5.2.8 on 2026-10-18 08:16
+
+import html
+import re
+from html.parser import HTMLParser
+from urllib.parse import urlsplit
+
+from django.db import migrations, models
+from django.utils.html import escape, strip_tags
+
+BATCH_SIZE = 1000
+
+# Copia congelada de main.content: mudancas futuras no sanitizador nao alteram esta migracao
+# (o comando render_content regera as linhas existentes com a versao atual).
+WHITESPACE_RE = re.compile(r'\s+')
+EXCERPT_LENGTH = 280
+
+ALLOWED_TAGS = {
+    'a', 'b', 'blockquote', 'br', 'code', 'div', 'em', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'hr', 'i',
+    'img', 'li', 'ol', 'p', 'pre', 's', 'span', 'strong', 'sub', 'sup', 'table', 'tbody', 'td', 'tfoot',
+    'th', 'thead', 'tr', 'u', 'ul',
+}
+VOID_TAGS = {'br', 'hr', 'img'}
+# Conteudo inteiro descartado, nao so a tag.
+DROP_CONTENT_TAGS = {'script', 'style', 'iframe', 'object', 'template', 'noscript'}
+# Sem conteudo nem tag de fechamento: so a tag some.
+DROP_VOID_TAGS = {'embed'}
+ALLOWED_ATTRIBUTES = {
+    'a': {'href', 'title', 'target', 'rel'},
+    'img': {'src', 'alt', 'title', 'width', 'height'},
+    'td': {'colspan', 'rowspan'},
+    'th': {'colspan', 'rowspan', 'scope'},
+}
+URL_ATTRIBUTES = {'href', 'src'}
+ALLOWED_SCHEMES = {'', 'http', 'https', 'mailto'}
+# Estilos que a barra do TinyMCE grava (alinhamento, recuo); o resto do atributo style e descartado.
+LENGTH_RE = re.compile(r'^\d+(\.\d+)?(px|em|rem|%)?$')
+ALLOWED_STYLES = {
+    'text-align': lambda value: value in {'left', 'right', 'center', 'justify'},
+    'padding-left': LENGTH_RE.match,
+    'margin-left': LENGTH_RE.match,
+}
+
+
+def html_to_text(value):
+    if not value:
+        return ''
+    # Espaco antes de cada tag para que "</p><p>" nao cole as palavras.
+    return WHITESPACE_RE.sub(' ', html.unescape(strip_tags(value.replace('<', ' <')))).strip()
+
+
+def make_excerpt(value, length=EXCERPT_LENGTH):
+    text = html_to_text(value)
+    if len(text) <= length:
+        return text
+    return text[:length].rsplit(' ', 1)[0].rstrip(' .,;:') + '…'
+
+
+def clean_style(value):
+    declarations = []
+    for declaration in value.split(';'):
+        name, _, prop = declaration.partition(':')
+        name, prop = name.strip().lower(), prop.strip().lower()
+        check = ALLOWED_STYLES.get(name)
+        if check and check(prop):
+            declarations.append(f'{name}: {prop}')
+    return '; '.join(declarations)
+
+
+def is_safe_url(value):
+    value = ''.join(value.split())
+    try:
+        return urlsplit(value).scheme.lower() in ALLOWED_SCHEMES
+    except ValueError:
+        return False
+
+
+class Sanitizer(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts = []
+        self.open_tags = []
+        self.dropping = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in DROP_CONTENT_TAGS:
+            self.dropping += 1
+            return
+        if self.dropping or tag not in ALLOWED_TAGS:
+            return
+        allowed = ALLOWED_ATTRIBUTES.get(tag, set())
+        rendered = []
+        for name, value in attrs:
+            if value is None:
+                continue
+            if name == 'style':
+                value = clean_style(value)
+                if value:
+                    rendered.append(f' style="{escape(value)}"')
+                continue
+            if name not in allowed:
+                continue
+            if name in URL_ATTRIBUTES and not is_safe_url(value):
+                continue
+            rendered.append(f' {name}="{escape(value)}"')
+        if tag == 'a' and any(name == 'target' for name, _ in attrs):
+            rendered = [attr for attr in rendered if not attr.startswith(' rel=')]
+            rendered.append(' rel="noopener noreferrer"')
+        self.parts.append(f'<{tag}{"".join(rendered)}>')
+        if tag not in VOID_TAGS:
+            self.open_tags.append(tag)
+
+    def handle_startendtag(self, tag, attrs):
+        if tag in DROP_CONTENT_TAGS or tag in DROP_VOID_TAGS:
+            # <iframe/> fecha na propria tag: nao ha conteudo a descartar nem </iframe> para esperar.
+            return
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_TAGS and self.open_tags and self.open_tags[-1] == tag:
+            self.handle_endtag(tag)
+
+    def handle_endtag(self, tag):
+        if tag in DROP_CONTENT_TAGS:
+            self.dropping = max(0, self.dropping - 1)
+            return
+        if self.dropping or tag not in self.open_tags:
+            return
+        while self.open_tags:
+            current = self.open_tags.pop()
+            self.parts.append(f'</{current}>')
+            if current == tag:
+                break
+
+    def handle_data(self, data):
+        if not self.dropping:
+            self.parts.append(escape(data))
+
+    def close(self):
+        super().close()
+        while self.open_tags:
+            self.parts.append(f'</{self.open_tags.pop()}>')
+        return ''.join(self.parts)
+
+
+def render_content(value):
+    safe_html = ''
+    if value:
+        parser = Sanitizer()
+        parser.feed(value)
+        safe_html = parser.close()
+    return make_excerpt(safe_html), safe_html
+
+
+
+def backfill_rendered_content(apps, schema_editor):
+    Article = apps.get_model('main', 'Article')
+    last_pk = 0
+    while True:
+        batch = list(Article.objects.filter(pk__gt=last_pk).order_by('pk').only('pk', 'content')[:BATCH_SIZE])
+        if not batch:
+            break
+        for article in batch:
+            article.excerpt, article.content_html = render_content(article.content)
+        Article.objects.bulk_update(batch, ['excerpt', 'content_html'])
+        last_pk = batch[-1].pk
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0008_article_cover_variants'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='article',
+            name='content_html',
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.AddField(
+            model_name='article',
+            name='excerpt',
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.RunPython(backfill_rendered_content, migrations.RunPython.noop),
+    ]
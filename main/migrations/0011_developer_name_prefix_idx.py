@@ -0,0 +1,20 @@
+# Generated by Django 5.2.8 on 2026-10-18 08:49
+
+import django.db.models.functions.text
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0010_updated_at'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='developer',
+            index=models.Index(django.db.models.functions.text.Lower('name'), models.F('id'), name='developer_name_prefix_idx'),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.8 on 2026-10-18 08:59
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0011_developer_name_prefix_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='article',
+            index=models.Index(fields=['-published_at', 'title', 'id'], name='article_published_title_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='developer',
+            index=models.Index(fields=['name', 'id'], name='developer_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='developer',
+            index=models.Index(fields=['seniority', 'name', 'id'], name='developer_seniority_name_idx'),
+        ),
+        # Filtro developers__id da listagem de artigos: a tabela N:N e criada pelo Django, sem Meta para indices.
+        migrations.RunSQL(
+            'CREATE INDEX article_developers_dev_article_idx ON main_article_developers (developer_id, article_id)',
+            'DROP INDEX article_developers_dev_article_idx',
+        ),
+    ]
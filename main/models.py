@@ -1,7 +1,82 @@
+from functools import reduce
+from operator import or_
+
 from django.contrib.auth.models import User
-from django.db import models
+from django.db import IntegrityError, models, transaction
+from django.db.models import Count, F, Q
+from django.db.models.functions import Lower
+from django.utils import timezone
 from django.utils.text import slugify
 
+from . import search
+from .content import render_content
+from .fields import SearchDocumentField
+
+
+class SkillQuerySet(models.QuerySet):
+    def canonical_names(self, names):
+        by_key = {}
+        for name in names:
+            name = ' '.join(str(name).split())
+            if name:
+                by_key.setdefault(Skill.normalize(name), name)
+        existing = dict(self.filter(key__in=by_key).values_list('key', 'name'))
+        return [existing.get(key, name) for key, name in by_key.items()]
+
+    def resolve(self, names):
+        names = self.canonical_names(names)
+        keys = [Skill.normalize(name) for name in names]
+        self.bulk_create(
+            [Skill(name=name, key=key) for name, key in zip(names, keys)],
+            ignore_conflicts=True,
+        )
+        return list(self.filter(key__in=keys))
+
+
+class Skill(models.Model):
+    name = models.CharField(max_length=64)
+    key = models.CharField(max_length=64, unique=True)
+
+    objects = SkillQuerySet.as_manager()
+
+    def __str__(self):
+        return self.name
+
+    @staticmethod
+    def normalize(name):
+        return ' '.join(str(name).split()).casefold()
+
+
+def name_prefix_key(prefix):
+    # LOWER() do SQLite so converte ASCII; o prefixo precisa da mesma regra para bater com o indice.
+    return ''.join(char.lower() if char.isascii() else char for char in prefix)
+
+
+class DeveloperQuerySet(models.QuerySet):
+    def name_prefix(self, prefix):
+        """Developers cujo nome comeca com prefix (sem diferenciar caixa), anotados com name_key.
+
+        Faixa em vez de LIKE: o SQLite percorre so o trecho do indice (LOWER(name), id).
+        """
+        qs = self.annotate(name_key=Lower('name'))
+        key = name_prefix_key(prefix.strip())
+        if key:
+            qs = qs.filter(name_key__gte=key, name_key__lt=key + chr(0x10FFFF))
+        return qs
+
+    def with_skills(self, names, match='all'):
+        keys = {Skill.normalize(name) for name in names} - {''}
+        if not keys:
+            return self
+        links = DeveloperSkill.objects.filter(skill__key__in=keys)
+        if match != 'any':
+            links = (
+                links.values('developer_id')
+                .annotate(matched=Count('skill_id'))
+                .filter(matched=len(keys))
+            )
+        return self.filter(pk__in=links.values('developer_id'))
+
 
 class Developer(models.Model):
     SENIORITY_CHOICES = [
@@ -15,12 +90,107 @@ class Developer(models.Model):
     email = models.EmailField(unique=True)
     seniority = models.CharField(max_length=2, choices=SENIORITY_CHOICES)
     skills = models.JSONField(blank=True, null=True)
+    skill_set = models.ManyToManyField(Skill, through='DeveloperSkill', related_name='developers', blank=True)
+    article_total = models.PositiveIntegerField(default=0, editable=False)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    objects = DeveloperQuerySet.as_manager()
+
+    class Meta:
+        # Caminhos da listagem/exportacao: ordem (name, id), com ou sem filtro de senioridade.
+        indexes = [
+            models.Index(Lower('name'), F('id'), name='developer_name_prefix_idx'),
+            models.Index(fields=['name', 'id'], name='developer_name_idx'),
+            models.Index(fields=['seniority', 'name', 'id'], name='developer_seniority_name_idx'),
+        ]
 
     def __str__(self):
         return self.name
 
     def articles_count(self):
-        return self.articles.count()
+        return self.article_total
+
+    def save(self, *args, **kwargs):
+        if kwargs.get('update_fields') is not None:
+            kwargs['update_fields'] = {*kwargs['update_fields'], 'updated_at'}
+        super().save(*args, **kwargs)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or 'skills' in update_fields:
+            self.sync_skills()
+
+    def sync_skills(self):
+        names = self.skills if isinstance(self.skills, list) else []
+        wanted = {skill.pk for skill in Skill.objects.resolve(names)}
+        current = set(self.skill_links.values_list('skill_id', flat=True))
+        if wanted - current:
+            DeveloperSkill.objects.bulk_create(
+                [DeveloperSkill(developer=self, skill_id=skill_id) for skill_id in wanted - current],
+                ignore_conflicts=True,
+            )
+        if current - wanted:
+            self.skill_links.filter(skill_id__in=current - wanted).delete()
+
+
+class DeveloperSkill(models.Model):
+    developer = models.ForeignKey(Developer, on_delete=models.CASCADE, related_name='skill_links')
+    skill = models.ForeignKey(Skill, on_delete=models.CASCADE, related_name='developer_links')
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['developer', 'skill'],
+                name='unique_developer_skill',
+            )
+        ]
+        indexes = [
+            models.Index(fields=['skill', 'developer'], name='developerskill_skill_dev_idx'),
+        ]
+
+
+def slug_base(title):
+    return slugify(title)[:50] or 'article'
+
+
+def next_slug(base, taken):
+    # taken guarda os sufixos ocupados; 0 representa o slug sem sufixo.
+    if 0 not in taken:
+        return base
+    return f'{base}-{max(taken) + 1}'
+
+
+class ArticleQuerySet(models.QuerySet):
+    SLUG_BASES_PER_QUERY = 250
+
+    def slug_suffixes(self, user_id, bases):
+        """Sufixos ja usados por base de slug, em uma query por lote de bases."""
+        taken = {base: set() for base in bases}
+        bases = list(taken)
+        for start in range(0, len(bases), self.SLUG_BASES_PER_QUERY):
+            chunk = bases[start:start + self.SLUG_BASES_PER_QUERY]
+            # A faixa base..base. cobre base e base-N; com user_id em cada termo o SQLite
+            # resolve o OR como buscas no indice unico (user, slug), em vez de varrer os slugs do usuario.
+            match = reduce(or_, (Q(user_id=user_id, slug__range=(base, f'{base}.')) for base in chunk))
+            for slug in self.filter(match).values_list('slug', flat=True).iterator():
+                if slug in taken:
+                    taken[slug].add(0)
+                head, _, tail = slug.rpartition('-')
+                if head in taken and tail.isdigit():
+                    taken[head].add(int(tail))
+        return taken
+
+    def allocate_slugs(self, articles):
+        """Preenche o slug dos artigos ainda sem slug (versao em lote para importacao/seed)."""
+        pending = {}
+        for article in articles:
+            if not article.slug:
+                pending.setdefault(article.user_id, []).append(article)
+        for user_id, group in pending.items():
+            taken = self.slug_suffixes(user_id, {slug_base(article.title) for article in group})
+            for article in group:
+                base = slug_base(article.title)
+                article.slug = next_slug(base, taken[base])
+                taken[base].add(int(article.slug[len(base) + 1:] or 0))
+        return articles
 
 
 class Article(models.Model):
@@ -28,29 +198,82 @@ class Article(models.Model):
     title = models.CharField(max_length=255)
     slug = models.SlugField(blank=True)
     content = models.TextField()
+    excerpt = models.TextField(blank=True, editable=False)
+    content_html = models.TextField(blank=True, editable=False)
     published_at = models.DateTimeField(blank=True, null=True)
     cover_image = models.ImageField(upload_to='covers/', blank=True, null=True)
+    cover_variants = models.JSONField(blank=True, default=dict, editable=False)
     developers = models.ManyToManyField(Developer, related_name='articles', blank=True)
+    developer_total = models.PositiveIntegerField(default=0, editable=False)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    objects = ArticleQuerySet.as_manager()
+
+    SLUG_ATTEMPTS = 5
 
     def __str__(self):
         return self.title
 
     def developers_count(self):
-        return self.developers.count()
+        return self.developer_total
+
+    def render_content(self):
+        self.excerpt, self.content_html = render_content(self.content)
+
+    def _cover_srcset(self, fmt):
+        storage = self.cover_image.storage
+        variants = (self.cover_variants or {}).get(fmt, {})
+        return ', '.join(f'{storage.url(name)} {width}w' for width, name in variants.items())
+
+    @property
+    def cover_webp_srcset(self):
+        return self._cover_srcset('webp')
+
+    @property
+    def cover_jpeg_srcset(self):
+        return self._cover_srcset('jpeg')
+
+    @property
+    def cover_thumbnail_url(self):
+        variants = (self.cover_variants or {}).get('jpeg')
+        if variants:
+            return self.cover_image.storage.url(variants[min(variants, key=int)])
+        return self.cover_image.url
 
     def save(self, *args, **kwargs):
-        if not self.slug:
+        generated = not self.slug
+        if generated:
             self.slug = self._generate_unique_slug()
-        super().save(*args, **kwargs)
+        update_fields = kwargs.get('update_fields')
+        # Contadores e variantes de capa salvam so os proprios campos: nada a renderizar ou reindexar
+        # (e content, se adiado, nem precisa ser carregado).
+        content_changed = update_fields is None or 'content' in update_fields
+        text_changed = content_changed or 'title' in update_fields
+        if content_changed:
+            self.render_content()
+        if update_fields is not None:
+            extra = {'excerpt', 'content_html'} if content_changed else set()
+            kwargs['update_fields'] = {*update_fields, 'updated_at', *extra}
+        for attempt in range(self.SLUG_ATTEMPTS):
+            try:
+                with transaction.atomic():
+                    super().save(*args, **kwargs)
+                    if text_changed:
+                        search.index_article(self)
+                return
+            except IntegrityError:
+                # Outro save levou o mesmo slug entre a leitura e o INSERT: calcula de novo.
+                if not generated or attempt == self.SLUG_ATTEMPTS - 1:
+                    raise
+                slug = self._generate_unique_slug()
+                if slug == self.slug:
+                    raise
+                self.slug = slug
 
     def _generate_unique_slug(self):
-        base_slug = slugify(self.title)[:50] or 'article'
-        slug = base_slug
-        counter = 1
-        while Article.objects.filter(user=self.user, slug=slug).exclude(pk=self.pk).exists():
-            slug = f'{base_slug}-{counter}'
-            counter += 1
-        return slug
+        base = slug_base(self.title)
+        taken = Article.objects.exclude(pk=self.pk).slug_suffixes(self.user_id, [base])[base]
+        return next_slug(base, taken)
 
     class Meta:
         constraints = [
@@ -59,3 +282,62 @@ class Article(models.Model):
                 name='unique_article_slug_per_user',
             )
         ]
+        # Mesma ordem da listagem (e do keyset): sem sort em B-tree temporaria.
+        indexes = [
+            models.Index(fields=['-published_at', 'title', 'id'], name='article_published_title_idx'),
+        ]
+
+
+class ArticleSearchEntry(models.Model):
+    article = models.OneToOneField(
+        Article,
+        on_delete=models.DO_NOTHING,
+        primary_key=True,
+        db_column='rowid',
+        related_name='search_entry',
+    )
+    title = models.TextField()
+    body = models.TextField()
+    document = SearchDocumentField(db_column=search.TABLE)
+    rank = models.FloatField()
+
+    class Meta:
+        managed = False
+        db_table = search.TABLE
+
+
+class Job(models.Model):
+    """Tarefa pendente da fila em banco; executada pelo comando run_worker (ver main/jobs.py)."""
+
+    PENDING = 'pending'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUS_CHOICES = [
+        (PENDING, 'Pendente'),
+        (RUNNING, 'Executando'),
+        (DONE, 'Concluida'),
+        (FAILED, 'Falhou'),
+    ]
+
+    task = models.CharField(max_length=200)
+    args = models.JSONField(default=list, blank=True)
+    kwargs = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=5)
+    run_at = models.DateTimeField(default=timezone.now)
+    locked_by = models.CharField(max_length=100, blank=True)
+    locked_at = models.DateTimeField(blank=True, null=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        # Caminho do claim: status = ? AND run_at <= ? ORDER BY run_at, id.
+        indexes = [
+            models.Index(fields=['status', 'run_at', 'id'], name='job_claim_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.task} #{self.pk} ({self.status})'
@@ -0,0 +1,166 @@
+import base64
+import json
+from functools import reduce
+from operator import and_, or_
+
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import F, Q
+from django.http import Http404
+
+
+class KeysetPage:
+    def __init__(self, object_list, next_cursor, query_params, cursor_param):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self._query_params = query_params
+        self._cursor_param = cursor_param
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    @property
+    def next_query(self):
+        params = self._query_params.copy()
+        params[self._cursor_param] = self.next_cursor
+        return params.urlencode()
+
+
+class Keyset:
+    """Ordenacao + filtro "depois do cursor" para paginar sem OFFSET."""
+
+    def __init__(self, model, fields, output_fields=None):
+        output_fields = output_fields or {}
+        self.model = model
+        self.fields = []
+        for name in fields:
+            bare = name.lstrip('-')
+            field = output_fields.get(bare) or model._meta.get_field(bare)
+            self.fields.append((bare, name.startswith('-'), field))
+
+    def ordering(self):
+        expressions = []
+        for name, descending, field in self.fields:
+            if field.null:
+                # NULLs sempre por ultimo, independente do banco, para o cursor ser previsivel.
+                expr = F(name).desc(nulls_last=True) if descending else F(name).asc(nulls_last=True)
+            else:
+                expr = F(name).desc() if descending else F(name).asc()
+            expressions.append(expr)
+        return expressions
+
+    def encode(self, obj):
+        # obj e uma instancia do model ou uma linha de values().
+        if isinstance(obj, dict):
+            values = [obj[name] for name, _, _ in self.fields]
+        else:
+            values = [getattr(obj, name) for name, _, _ in self.fields]
+        raw = json.dumps(values, cls=DjangoJSONEncoder, separators=(',', ':'))
+        return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+    def decode(self, cursor):
+        try:
+            padded = cursor + '=' * (-len(cursor) % 4)
+            values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            if not isinstance(values, list) or len(values) != len(self.fields):
+                raise ValueError
+            return [
+                None if value is None else field.to_python(value)
+                for value, (_, _, field) in zip(values, self.fields)
+            ]
+        except (ValueError, TypeError, ValidationError):
+            raise Http404('Cursor invalido')
+
+    def after(self, values):
+        branches = []
+        equal = []
+        for (name, descending, field), value in zip(self.fields, values):
+            if value is None:
+                after = None
+                same = Q(**{f'{name}__isnull': True})
+            else:
+                lookup = 'lt' if descending else 'gt'
+                after = Q(**{f'{name}__{lookup}': value})
+                if field.null:
+                    after |= Q(**{f'{name}__isnull': True})
+                same = Q(**{name: value})
+            if after is not None:
+                branches.append(reduce(and_, equal + [after]))
+            equal.append(same)
+        if not branches:
+            return Q(pk__in=[])
+        return reduce(or_, branches)
+
+    def window(self, queryset, page_size, cursor=None):
+        queryset = queryset.order_by(*self.ordering())
+        if cursor:
+            queryset = queryset.filter(self.after(self.decode(cursor)))
+        return queryset[: page_size + 1]
+
+    def split(self, rows, page_size):
+        next_cursor = self.encode(rows[page_size - 1]) if len(rows) > page_size else None
+        return rows[:page_size], next_cursor
+
+    def page(self, queryset, page_size, cursor=None):
+        return self.split(list(self.window(queryset, page_size, cursor)), page_size)
+
+    async def apage(self, queryset, page_size, cursor=None):
+        window = self.window(queryset, page_size, cursor)
+        # chunk_size cobre a pagina inteira: um unico lote de prefetch.
+        rows = [row async for row in window.aiterator(chunk_size=page_size + 1)]
+        return self.split(rows, page_size)
+
+
+class KeysetPaginationMixin:
+    """Substitui a paginacao por OFFSET do ListView por paginacao por cursor."""
+
+    keyset = ()
+    paginate_by = 24
+    cursor_param = 'cursor'
+
+    def get_keyset(self):
+        return Keyset(self.model, self.keyset)
+
+    def get_cursor(self):
+        return self.request.GET.get(self.cursor_param, '').strip()
+
+    def make_page(self, rows, next_cursor):
+        page = KeysetPage(rows, next_cursor, self.request.GET, self.cursor_param)
+        return None, page, rows, page.has_next()
+
+    def paginate_queryset(self, queryset, page_size):
+        return self.make_page(*self.get_keyset().page(queryset, page_size, self.get_cursor()))
+
+    async def apaginate_queryset(self, queryset, page_size):
+        return self.make_page(*await self.get_keyset().apage(queryset, page_size, self.get_cursor()))
+
+    def get_validator_rows(self):
+        # As linhas da pagina (e a que indica se ha proxima), so com pk e updated_at.
+        queryset = self.get_queryset()
+        window = self.get_keyset().window(queryset, self.get_paginate_by(queryset), self.get_cursor())
+        return window.prefetch_related(None).values_list('pk', 'updated_at')
+
+    def is_next_page_request(self):
+        return bool(self.request.GET.get(self.cursor_param))
+
+
+class AsyncKeysetListMixin:
+    """get() async para ListViews com KeysetPaginationMixin: a pagina vem do ORM async.
+
+    O contexto e montado depois, no loop, entao nao pode fazer I/O: o que le banco ou cache entra
+    nele como callable e so roda na renderizacao do template, que o handler ASGI faz numa thread.
+    """
+
+    async def get(self, request, *args, **kwargs):
+        self.object_list = self.get_queryset()
+        self.loaded_page = await self.apaginate_queryset(self.object_list, self.get_paginate_by(self.object_list))
+        return self.render_to_response(self.get_context_data())
+
+    def paginate_queryset(self, queryset, page_size):
+        return self.loaded_page
@@ -0,0 +1,25 @@
+from django.core.exceptions import PermissionDenied
+
+
+class OwnerRequiredMixin:
+    """Edicao e remocao so pelo dono do objeto ou por superusuario.
+
+    O objeto e buscado uma unica vez por requisicao e a checagem compara owner_field (user_id),
+    sem carregar o usuario dono.
+    """
+
+    owner_field = 'user_id'
+
+    def has_object_permission(self, obj):
+        user = self.request.user
+        return user.is_superuser or getattr(obj, self.owner_field) == user.pk
+
+    def get_object(self, queryset=None):
+        if queryset is not None:
+            return super().get_object(queryset)
+        if not hasattr(self, '_owned_object'):
+            obj = super().get_object()
+            if not self.has_object_permission(obj):
+                raise PermissionDenied
+            self._owned_object = obj
+        return self._owned_object
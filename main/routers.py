@@ -0,0 +1,78 @@
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+# Cookie que prende as leituras do navegador ao primario logo apos uma escrita.
+PIN_COOKIE = 'ltcloud_primary'
+
+_state = ContextVar('ltcloud_db_routing', default=None)
+
+
+class RoutingState:
+    def __init__(self, pinned=False):
+        self.pinned = pinned
+        self.replica_reads = False
+        self.wrote = False
+
+
+def replica_alias():
+    alias = getattr(settings, 'DATABASE_REPLICA', None)
+    return alias if alias in settings.DATABASES else None
+
+
+def begin_request(pinned):
+    return _state.set(RoutingState(pinned))
+
+
+def end_request(token):
+    state = _state.get()
+    _state.reset(token)
+    return state
+
+
+def read_from_replica():
+    state = _state.get()
+    if state is not None:
+        state.replica_reads = True
+
+
+class ReplicaRouter:
+    """Leituras das views marcadas vao para DATABASE_REPLICA; escritas sempre para o primario.
+
+    Depois que a requisicao escreve, o resto dela le do primario; o middleware estende isso
+    por DATABASE_REPLICA_PIN_SECONDS com um cookie, cobrindo o redirect apos o formulario.
+    """
+
+    app_labels = {'main'}
+
+    def db_for_read(self, model, **hints):
+        state = _state.get()
+        if state is None or not state.replica_reads or state.pinned or state.wrote:
+            return None
+        if model._meta.app_label not in self.app_labels:
+            return None
+        return replica_alias()
+
+    def db_for_write(self, model, **hints):
+        state = _state.get()
+        if state is not None and model._meta.app_label in self.app_labels:
+            state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replica e primario guardam os mesmos dados.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db == replica_alias():
+            return False
+        return None
+
+
+class ReplicaReadMixin:
+    """Views somente leitura que aceitam dados da replica."""
+
+    def setup(self, request, *args, **kwargs):
+        super().setup(request, *args, **kwargs)
+        read_from_replica()
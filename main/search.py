@@ -0,0 +1,99 @@
+import re
+
+from django.db import DEFAULT_DB_ALIAS, connection, connections, transaction
+from django.db.models import F
+from django.utils.html import escape
+
+from .content import html_to_text
+
+TABLE = 'main_article_fts'
+TERM_RE = re.compile(r'\w+')
+MARK_START = '\x02'
+MARK_END = '\x03'
+
+
+def is_available():
+    return connection.vendor == 'sqlite'
+
+
+def build_query(text):
+    return ' '.join(f'"{term}"*' for term in TERM_RE.findall(text))
+
+
+def filter_articles(queryset, text):
+    query = build_query(text)
+    queryset = queryset.annotate(search_rank=F('search_entry__rank'))
+    if not query:
+        # Busca sem nenhuma palavra (so pontuacao): nada casa, mas a anotacao fica para quem ordena por ela.
+        return queryset.none()
+    return queryset.filter(search_entry__document__match=query)
+
+
+def snippets(text, ids, tokens=24, using=DEFAULT_DB_ALIAS):
+    query = build_query(text)
+    if not query or not ids:
+        return {}
+    placeholders = ', '.join(['%s'] * len(ids))
+    sql = (
+        f"SELECT rowid, snippet({TABLE}, 1, %s, %s, '...', %s) FROM {TABLE} "
+        f'WHERE {TABLE} MATCH %s AND rowid IN ({placeholders})'
+    )
+    with connections[using].cursor() as cursor:
+        cursor.execute(sql, [MARK_START, MARK_END, tokens, query, *ids])
+        return {pk: highlight(raw) for pk, raw in cursor.fetchall()}
+
+
+def highlight(raw):
+    return escape(raw).replace(MARK_START, '<mark>').replace(MARK_END, '</mark>')
+
+
+def index_article(article):
+    if not is_available():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {TABLE} WHERE rowid = %s', [article.pk])
+        cursor.execute(
+            f'INSERT INTO {TABLE}(rowid, title, body) VALUES (%s, %s, %s)',
+            [article.pk, article.title, html_to_text(article.content)],
+        )
+
+
+def remove_article(pk):
+    if not is_available():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {TABLE} WHERE rowid = %s', [pk])
+
+
+def index_rows(rows, replace=False):
+    """Insere (pk, title, content) no indice; usado em cargas em lote que nao passam por save()."""
+    if not is_available():
+        return 0
+    params = [(pk, title, html_to_text(content)) for pk, title, content in rows]
+    with connection.cursor() as cursor:
+        if replace:
+            cursor.executemany(f'DELETE FROM {TABLE} WHERE rowid = %s', [(pk,) for pk, _, _ in params])
+        cursor.executemany(f'INSERT INTO {TABLE}(rowid, title, body) VALUES (%s, %s, %s)', params)
+    return len(params)
+
+
+def rebuild_index(queryset, batch_size=1000):
+    if not is_available():
+        return 0
+    total = 0
+    rows = queryset.order_by().values_list('pk', 'title', 'content').iterator(chunk_size=batch_size)
+    # Uma transacao so: as buscas continuam vendo o indice antigo ate o commit e uma falha no meio
+    # nao deixa a tabela pela metade.
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {TABLE}')
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= batch_size:
+                total += index_rows(batch)
+                batch = []
+        total += index_rows(batch)
+    with connection.cursor() as cursor:
+        cursor.execute(f"INSERT INTO {TABLE}({TABLE}) VALUES ('optimize')")
+    return total
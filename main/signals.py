@@ -0,0 +1,83 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.signals import user_logged_out
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+from django.utils import timezone
+
+from . import search
+from .auth import invalidate_user
+from .counters import linked_ids, shift_total
+from .fragments import invalidate_developer_cards
+from .models import Article, Developer
+
+
+@receiver(post_save, sender=Developer)
+def invalidate_developer_card(sender, instance, created, **kwargs):
+    invalidate_developer_cards([instance.pk])
+    if not created:
+        # Os artigos mostram o nome dos developers: a validacao condicional deles tambem muda.
+        Article.objects.filter(developers=instance).update(updated_at=timezone.now())
+
+
+@receiver(pre_delete, sender=Developer)
+def remember_developer_articles(sender, instance, **kwargs):
+    instance._article_ids = linked_ids('developer_id', instance.pk, 'article_id')
+
+
+@receiver(post_delete, sender=Developer)
+def release_developer(sender, instance, **kwargs):
+    shift_total(Article, 'developer_total', getattr(instance, '_article_ids', ()), -1)
+    invalidate_developer_cards([instance.pk])
+
+
+@receiver(pre_delete, sender=Article)
+def remember_article_developers(sender, instance, **kwargs):
+    instance._developer_ids = linked_ids('article_id', instance.pk, 'developer_id')
+
+
+@receiver(post_delete, sender=Article)
+def release_article(sender, instance, **kwargs):
+    search.remove_article(instance.pk)
+    developer_ids = getattr(instance, '_developer_ids', ())
+    shift_total(Developer, 'article_total', developer_ids, -1)
+    invalidate_developer_cards(developer_ids)
+
+
+@receiver(m2m_changed, sender=Article.developers.through)
+def sync_article_developer_links(sender, instance, action, reverse, pk_set, **kwargs):
+    if reverse:
+        # developer.articles.add/remove/clear
+        source, source_field, source_column = Developer, 'article_total', 'developer_id'
+        target, target_field, target_column = Article, 'developer_total', 'article_id'
+    else:
+        source, source_field, source_column = Article, 'developer_total', 'article_id'
+        target, target_field, target_column = Developer, 'article_total', 'developer_id'
+
+    if action in ('pre_remove', 'pre_clear'):
+        # pk_set do remove traz tudo que foi pedido, nao so o que estava ligado.
+        wanted = pk_set if action == 'pre_remove' else None
+        instance._unlinked_ids = linked_ids(source_column, instance.pk, target_column, wanted)
+        return
+    if action == 'post_add':
+        changed, delta = pk_set or set(), 1
+    elif action in ('post_remove', 'post_clear'):
+        changed, delta = getattr(instance, '_unlinked_ids', set()), -1
+    else:
+        return
+
+    shift_total(target, target_field, changed, delta)
+    shift_total(source, source_field, [instance.pk], delta * len(changed))
+    invalidate_developer_cards([instance.pk] if reverse else changed)
+
+
+@receiver(post_save, sender=get_user_model())
+@receiver(post_delete, sender=get_user_model())
+def invalidate_cached_user(sender, instance, **kwargs):
+    # Inclui criacao: um pk reaproveitado nao pode herdar o usuario guardado de outra linha.
+    invalidate_user(instance.pk)
+
+
+@receiver(user_logged_out)
+def forget_logged_out_user(sender, request, user, **kwargs):
+    if user is not None:
+        invalidate_user(user.pk)
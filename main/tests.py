@@ -1,9 +1,43 @@
+import asyncio
+import gzip
+import os
+import re
+import subprocess
+import sys
+import tarfile
+import tempfile
+import threading
+import time
+from datetime import timedelta
+from io import BytesIO, StringIO
+from pathlib import Path
+from unittest import mock
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
 from django.contrib.auth.models import User
-from django.test import Client, TestCase
-from django.urls import reverse
+from django.core.cache import cache, caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.core import mail
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.templatetags.static import static
+from django.core.management import CommandError, call_command
+from django.db import IntegrityError, connection, connections, router, transaction
+from django.test import Client, RequestFactory, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import resolve, reverse
+from django.utils import timezone
+from django.utils.http import http_date
+from PIL import Image
 
-from .forms import ArticleForm
-from .models import Article, Developer
+from . import fragments, jobs, routers, search, views
+from .forms import ArticleForm, DeveloperForm
+from .auth import check_shared_caches, user_key
+from .content import render_content
+from .fragments import render_developer_cards
+from .metrics import registry
+from .models import Article, Developer, Job, Skill
+from .transfer import TRANSFERS
 from django.core.exceptions import PermissionDenied
 
 
@@ -47,6 +81,62 @@ class DeveloperListViewTests(TestCase):
         self.assertIn(self.dev_python.name, content)
         self.assertNotIn(self.dev_front.name, content)
 
+    def test_skill_filter_matches_whole_skill_only(self):
+        Developer.objects.create(
+            user=self.user, name='Carla Preact', email='carla@example.com', seniority='pl', skills=['Preact']
+        )
+        self.client.force_login(self.user)
+        response = self.client.get(reverse('main:developer_list'), {'skill': 'React'})
+        self.assertEqual([dev.pk for dev in response.context['developers']], [self.dev_front.pk])
+
+    def test_skill_filter_combines_with_and_or(self):
+        self.client.force_login(self.user)
+        response = self.client.get(reverse('main:developer_list'), {'skill': 'python, react'})
+        self.assertEqual(list(response.context['developers']), [])
+
+        response = self.client.get(reverse('main:developer_list'), {'skill': 'python, react', 'skill_match': 'any'})
+        self.assertEqual(list(response.context['developers']), [self.dev_python, self.dev_front])
+
+        response = self.client.get(reverse('main:developer_list'), {'skill': 'Django,python'})
+        self.assertEqual(list(response.context['developers']), [self.dev_python])
+
+    def test_csv_export_streams_filtered_developers(self):
+        url = reverse('main:developer_export')
+        self.assertEqual(self.client.get(url).status_code, 302)
+
+        self.client.force_login(self.user)
+        response = self.client.get(url, {'skill': 'python, react', 'skill_match': 'any', 'cursor': 'ignorado'})
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'text/csv; charset=utf-8')
+        chunks = list(response.streaming_content)
+        self.assertEqual(chunks[0], b'email,name,seniority,owner,skills\r\n')
+        self.assertEqual(
+            b''.join(chunks[1:]).decode().splitlines(),
+            ['ana@example.com,Ana Python,jr,alice,python|django', 'bruno@example.com,Bruno Front,sr,alice,react'],
+        )
+
+    async def test_csv_export_async_stream_matches_sync(self):
+        queryset = Developer.objects.order_by('name', 'id')
+        transfer = TRANSFERS['developers']
+        expected = await sync_to_async(lambda: ''.join(transfer.stream(queryset, 1)))()
+        self.assertEqual(''.join([chunk async for chunk in transfer.astream(queryset, 1)]), expected)
+
+    def test_saving_skills_syncs_catalogue(self):
+        self.dev_python.skills = ['python', 'docker']
+        self.dev_python.save()
+        self.assertEqual(
+            sorted(self.dev_python.skill_set.values_list('key', flat=True)),
+            ['docker', 'python'],
+        )
+        self.assertEqual(Skill.objects.filter(key='python').count(), 1)
+
+    def test_form_reuses_catalogue_names(self):
+        form = DeveloperForm(
+            data={'name': 'Dani', 'email': 'dani@example.com', 'seniority': 'jr', 'skills': 'PYTHON, Go, go'}
+        )
+        self.assertTrue(form.is_valid(), form.errors)
+        self.assertEqual(form.cleaned_data['skills'], ['python', 'Go'])
+
 
 class ArticleTests(TestCase):
     def setUp(self):
@@ -69,6 +159,44 @@ class ArticleTests(TestCase):
         other_article = Article.objects.create(user=self.other_user, title='Meu Artigo', content='terceiro')
         self.assertEqual(other_article.slug, 'meu-artigo')
 
+    def test_slug_allocation_uses_one_query_and_next_suffix(self):
+        for slug in ['release-notes', 'release-notes-1', 'release-notes-7', 'release-notes-extra']:
+            Article.objects.create(user=self.user, title='x', slug=slug, content='c')
+        article = Article(user=self.user, title='Release Notes', content='c')
+        with self.assertNumQueries(1):
+            self.assertEqual(article._generate_unique_slug(), 'release-notes-8')
+
+    def test_slug_is_recomputed_after_integrity_error(self):
+        Article.objects.create(user=self.user, title='Corrida', content='c')
+        article = Article(user=self.user, title='Corrida', content='c', slug='corrida')
+        with self.assertRaises(IntegrityError):
+            article.save()
+
+        stale = Article(user=self.user, title='Corrida', content='c')
+        original = Article._generate_unique_slug
+        calls = []
+
+        def racing(instance):
+            # Primeira leitura nao ve o artigo concorrente.
+            calls.append(1)
+            return 'corrida' if len(calls) == 1 else original(instance)
+
+        with mock.patch.object(Article, '_generate_unique_slug', racing):
+            stale.save()
+        self.assertEqual(stale.slug, 'corrida-1')
+
+    def test_allocate_slugs_in_bulk(self):
+        Article.objects.create(user=self.user, title='Lote', content='c')
+        articles = [Article(user=self.user, title='Lote', content='c') for _ in range(3)]
+        articles.append(Article(user=self.other_user, title='Lote', content='c'))
+        articles.append(Article(user=self.user, title='Outro', content='c', slug='fixo'))
+        with self.assertNumQueries(2):
+            Article.objects.allocate_slugs(articles)
+        self.assertEqual(
+            [article.slug for article in articles],
+            ['lote-1', 'lote-2', 'lote-3', 'lote', 'fixo'],
+        )
+
     def test_article_list_filters_by_developer(self):
         article_a = Article.objects.create(user=self.user, title='Com Ana', content='one')
         article_a.developers.add(self.dev)
@@ -114,6 +242,76 @@ class ArticleTests(TestCase):
         self.assertIn(article.title, response.content.decode())
 
 
+class ArticleListFilterTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='alice', password='pass123')
+        self.client.force_login(self.user)
+        self.dev = Developer.objects.create(user=self.user, name='Ana', email='ana@example.com', seniority='jr')
+        now = timezone.now()
+        for index in range(30):
+            article = Article.objects.create(
+                user=self.user,
+                title=f'Artigo {index:02d}',
+                content='<p>texto</p>',
+                published_at=now - timedelta(days=index),
+            )
+            if index % 3 == 0:
+                article.developers.add(self.dev)
+
+    def test_full_page_shows_total_and_live_filter_form(self):
+        response = self.client.get(reverse('main:article_list'))
+        self.assertTemplateUsed(response, 'main/article_list.html')
+        self.assertContains(response, '30 artigos encontrados')
+        self.assertContains(response, 'hx-target="#articles"')
+
+    def test_picker_does_not_inherit_filter_form_history_or_sync(self):
+        html = self.client.get(reverse('main:article_list')).content.decode()
+        start = html.index('<form method="get"')
+        form = html[start:html.index('</form>', start)]
+        self.assertIn('hx-disinherit="*"', form[: form.index('>')])
+        picker = form[form.index('name="q"'):]
+        picker = picker[: picker.index('>')]
+        self.assertIn('hx-push-url="false"', picker)
+        self.assertIn('hx-sync="this:replace"', picker)
+
+    def test_history_restore_gets_full_page(self):
+        url = reverse('main:article_list')
+        hx = self.client.get(url, {'developer': self.dev.pk}, headers={'HX-Request': 'true'})
+        restore = self.client.get(
+            url,
+            {'developer': self.dev.pk},
+            headers={'HX-Request': 'true', 'HX-History-Restore-Request': 'true', 'If-None-Match': hx['ETag']},
+        )
+        self.assertEqual(restore.status_code, 200)
+        self.assertTemplateUsed(restore, 'main/article_list.html')
+        self.assertContains(restore, 'data-developer-picker')
+        self.assertContains(restore, '>Ana<')
+        self.assertIn('HX-History-Restore-Request', restore['Vary'])
+
+    def test_htmx_filter_returns_results_with_oob_total(self):
+        hx = {'HX-Request': 'true'}
+        response = self.client.get(reverse('main:article_list'), {'developer': self.dev.pk}, headers=hx)
+        self.assertTemplateUsed(response, 'main/partials/article_results.html')
+        self.assertTemplateNotUsed(response, 'base.html')
+        self.assertContains(response, 'id="article-count" class="text-sm text-slate-600" hx-swap-oob="true"')
+        self.assertContains(response, '10 artigos encontrados')
+        self.assertNotContains(response, 'data-developer-picker')
+
+        first = self.client.get(reverse('main:article_list'), headers=hx)
+        more = self.client.get(f'{reverse("main:article_list")}?{first.context["page_obj"].next_query}', headers=hx)
+        self.assertTemplateUsed(more, 'main/partials/article_cards.html')
+        self.assertNotContains(more, 'article-count')
+        self.assertEqual(len(more.context['articles']), 6)
+
+    def test_total_outside_the_page_changes_etag(self):
+        url = reverse('main:article_list')
+        first = self.client.get(url)
+        older = timezone.now() - timedelta(days=365)
+        Article.objects.create(user=self.user, title='Antigo', content='<p>x</p>', published_at=older)
+        response = self.client.get(url, headers={'If-None-Match': first['ETag']})
+        self.assertContains(response, '31 artigos encontrados')
+
+
 class ArticleFormTests(TestCase):
     def test_developers_queryset_includes_all_users(self):
         user = User.objects.create_user(username='alice', password='pass123')
@@ -125,3 +323,1410 @@ class ArticleFormTests(TestCase):
         self.assertIn(dev_allowed, form.fields['developers'].queryset)
         self.assertIn(dev_other, form.fields['developers'].queryset)
         self.assertEqual(form.fields['developers'].queryset.count(), 2)
+
+
+class DeveloperAutocompleteTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='alice', password='pass123')
+        self.client.force_login(self.user)
+        Developer.objects.bulk_create(
+            [
+                Developer(user=self.user, name=f'Ana {index:02d}', email=f'ana{index}@example.com', seniority='jr')
+                for index in range(25)
+            ]
+            + [Developer(user=self.user, name='Bruno', email='bruno@example.com', seniority='sr')]
+        )
+
+    def test_prefix_search_is_paginated_by_cursor(self):
+        url = reverse('main:developer_autocomplete')
+        response = self.client.get(url, {'q': 'aNA 0'})
+        names = [dev.name for dev in response.context['developers']]
+        self.assertEqual(names, [f'Ana {index:02d}' for index in range(10)])
+        self.assertFalse(response.context['page_obj'].has_next())
+        self.assertNotContains(response, 'Bruno')
+
+        first = self.client.get(url, {'q': 'ana'})
+        self.assertEqual(len(first.context['developers']), 20)
+        self.assertContains(first, 'hx-trigger="intersect once"')
+        second = self.client.get(f'{url}?{first.context["page_obj"].next_query}')
+        self.assertEqual([dev.name for dev in second.context['developers']], [f'Ana {index:02d}' for index in range(20, 25)])
+
+    def test_prefix_query_uses_name_index(self):
+        plan = Developer.objects.name_prefix('an').order_by('name_key', 'id').explain()
+        self.assertIn('developer_name_prefix_idx', plan)
+
+    def test_pickers_render_only_selected_developers(self):
+        bruno = Developer.objects.get(name='Bruno')
+        response = self.client.get(reverse('main:article_list'), {'developer': bruno.pk})
+        self.assertContains(response, 'Bruno')
+        self.assertNotContains(response, 'Ana 00')
+
+        article = Article.objects.create(user=self.user, title='Picker', content='<p>x</p>')
+        article.developers.add(bruno)
+        html = ArticleForm(instance=article, user=self.user).as_p()
+        self.assertIn(f'value="{bruno.pk}" checked', html)
+        self.assertNotIn('Ana 00', html)
+
+        ana = Developer.objects.get(name='Ana 00')
+        form = ArticleForm(
+            {'title': 'Picker', 'content': '<p>x</p>', 'developers': [bruno.pk, ana.pk]},
+            instance=article,
+            user=self.user,
+        )
+        self.assertTrue(form.is_valid(), form.errors)
+        self.assertEqual(set(form.cleaned_data['developers']), {bruno, ana})
+
+
+class KeysetPaginationTests(TestCase):
+    def setUp(self):
+        self.client = Client()
+        self.user = User.objects.create_user(username='alice', password='pass123')
+        self.client.force_login(self.user)
+
+    def test_developer_list_walks_all_pages_with_cursor(self):
+        for i in range(30):
+            Developer.objects.create(user=self.user, name=f'Dev {i % 5}', email=f'dev{i}@example.com', seniority='jr')
+
+        response = self.client.get(reverse('main:developer_list'))
+        page_obj = response.context['page_obj']
+        seen = [dev.pk for dev in response.context['developers']]
+        self.assertEqual(len(seen), 24)
+        self.assertTrue(page_obj.has_next())
+
+        response = self.client.get(
+            reverse('main:developer_list'), {'cursor': page_obj.next_cursor}, HTTP_HX_REQUEST='true'
+        )
+        self.assertTemplateUsed(response, 'main/partials/developer_cards.html')
+        seen += [dev.pk for dev in response.context['developers']]
+        self.assertFalse(response.context['page_obj'].has_next())
+
+        expected = list(Developer.objects.order_by('name', 'id').values_list('pk', flat=True))
+        self.assertEqual(seen, expected)
+
+    def test_article_list_cursor_keeps_nulls_last_and_filters(self):
+        dev = Developer.objects.create(user=self.user, name='Ana', email='ana@example.com', seniority='jr')
+        now = timezone.now()
+        for i in range(26):
+            article = Article.objects.create(
+                user=self.user,
+                title=f'Artigo {i % 3}',
+                content='texto',
+                published_at=None if i % 4 == 0 else now - timedelta(days=i % 6),
+            )
+            article.developers.add(dev)
+        Article.objects.create(user=self.user, title='Sem dev', content='texto')
+
+        response = self.client.get(reverse('main:article_list'), {'developer': dev.pk})
+        page_obj = response.context['page_obj']
+        self.assertIn(f'developer={dev.pk}', page_obj.next_query)
+        seen = [a.pk for a in response.context['articles']]
+
+        response = self.client.get(reverse('main:article_list') + '?' + page_obj.next_query, HTTP_HX_REQUEST='true')
+        self.assertTemplateUsed(response, 'main/partials/article_cards.html')
+        seen += [a.pk for a in response.context['articles']]
+
+        ordered = sorted(
+            dev.articles.all(),
+            key=lambda a: (a.published_at is None, -(a.published_at or now).timestamp(), a.title, a.pk),
+        )
+        self.assertEqual(seen, [a.pk for a in ordered])
+
+    def test_invalid_cursor_returns_404(self):
+        response = self.client.get(reverse('main:developer_list'), {'cursor': 'nao-e-cursor'})
+        self.assertEqual(response.status_code, 404)
+
+
+class ArticleSearchTests(TestCase):
+    def setUp(self):
+        self.client = Client()
+        self.user = User.objects.create_user(username='alice', password='pass123')
+        self.client.force_login(self.user)
+
+    def test_search_ranks_title_matches_first_and_highlights(self):
+        body_hit = Article.objects.create(user=self.user, title='Notas', content='<p>Falamos de <b>Django</b> &amp; HTMX</p>')
+        title_hit = Article.objects.create(user=self.user, title='Guia Django', content='<p>Introducao</p>')
+        Article.objects.create(user=self.user, title='Outro', content='<p>Nada aqui</p>')
+
+        response = self.client.get(reverse('main:article_list'), {'search': 'djang'})
+        articles = list(response.context['articles'])
+        self.assertEqual(articles, [title_hit, body_hit])
+        self.assertIn('<mark>Django</mark> &amp; HTMX', articles[1].search_snippet)
+
+    def test_index_follows_updates_and_deletes(self):
+        article = Article.objects.create(user=self.user, title='Primeiro', content='kubernetes')
+        article.content = 'terraform'
+        article.save()
+
+        response = self.client.get(reverse('main:article_list'), {'search': 'kubernetes'})
+        self.assertEqual(list(response.context['articles']), [])
+        response = self.client.get(reverse('main:article_list'), {'search': 'terraform'})
+        self.assertEqual(list(response.context['articles']), [article])
+
+        article.delete()
+        response = self.client.get(reverse('main:article_list'), {'search': 'terraform'})
+        self.assertEqual(list(response.context['articles']), [])
+
+    def test_failed_rebuild_keeps_previous_index(self):
+        articles = [Article.objects.create(user=self.user, title=f'Indexado {i}', content='pipeline') for i in range(3)]
+        original = search.index_rows
+        calls = []
+
+        def failing(rows, replace=False):
+            calls.append(rows)
+            if len(calls) == 2:
+                raise RuntimeError('disco cheio')
+            return original(rows, replace)
+
+        with mock.patch.object(search, 'index_rows', failing):
+            with self.assertRaisesMessage(RuntimeError, 'disco cheio'):
+                search.rebuild_index(Article.objects.all(), batch_size=1)
+        response = self.client.get(reverse('main:article_list'), {'search': 'pipeline'})
+        self.assertEqual(sorted(article.pk for article in response.context['articles']), [article.pk for article in articles])
+
+    def test_search_ignores_fts_syntax(self):
+        Article.objects.create(user=self.user, title='C++ AND "OR"', content='x')
+        response = self.client.get(reverse('main:article_list'), {'search': 'C++ AND "OR" NEAR('})
+        self.assertEqual(response.status_code, 200)
+
+    def test_search_without_terms_returns_empty_page(self):
+        Article.objects.create(user=self.user, title='Qualquer', content='x')
+        for text in ('*', '!!', '--', '"()"'):
+            for headers in ({}, {'HX-Request': 'true'}):
+                response = self.client.get(reverse('main:article_list'), {'search': text}, headers=headers)
+                self.assertEqual(response.status_code, 200, text)
+                self.assertNotContains(response, 'Qualquer')
+
+
+class SeedDemoTests(TestCase):
+    def seed(self, *args):
+        call_command('seed_demo', *args, stdout=StringIO())
+
+    def snapshot(self):
+        return (
+            list(Developer.objects.order_by('id').values_list('name', 'seniority', 'skills')),
+            list(Article.objects.order_by('id').values_list('title', 'content', 'published_at')),
+        )
+
+    def test_scale_mode_bulk_loads_links_and_search_index(self):
+        self.seed('--scale', '--users', '2', '--developers', '25', '--articles', '30', '--batch-size', '7', '--seed', '42')
+        self.assertEqual(Developer.objects.count(), 25)
+        self.assertEqual(Article.objects.count(), 30)
+        self.assertFalse(Article.objects.filter(developers__isnull=True).exists())
+        self.assertFalse(Developer.objects.filter(skill_links__isnull=True).exists())
+        out = StringIO()
+        call_command('recount_totals', stdout=out)
+        self.assertIn('Corrigidos 0 developers e 0 artigos', out.getvalue())
+
+        article = Article.objects.first()
+        self.client.force_login(User.objects.get(username='demo1'))
+        response = self.client.get(reverse('main:article_list'), {'search': article.title})
+        self.assertIn(article, response.context['articles'])
+
+    def test_seed_option_is_reproducible(self):
+        args = ('--scale', '--developers', '10', '--articles', '10', '--batch-size', '4', '--seed', '7')
+        self.seed(*args)
+        first = self.snapshot()
+        Developer.objects.all().delete()
+        Article.objects.all().delete()
+        self.seed(*args)
+        self.assertEqual(self.snapshot(), first)
+
+
+class BenchmarkViewsTests(TestCase):
+    def test_reports_views_within_budget(self):
+        out = StringIO()
+        call_command('benchmark_views', '--current-db', '--sizes', '30', '--repeat', '2', stdout=out)
+        output = out.getvalue()
+        self.assertIn('article_detail', output)
+        self.assertIn('Todas as views dentro do budget', output)
+
+    def test_fails_when_view_exceeds_budget(self):
+        with self.assertRaisesMessage(CommandError, 'developer_list com N=30'):
+            call_command(
+                'benchmark_views', '--current-db', '--sizes', '30', '--repeat', '1',
+                '--budget', 'developer_list=1', stdout=StringIO(),
+            )
+
+
+class AsyncViewTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='alice', password='pass123')
+        self.dev = Developer.objects.create(user=self.user, name='Ana', email='ana@example.com', seniority='jr')
+        self.article = Article.objects.create(user=self.user, title='Async ORM', content='<p>corpo</p>')
+        self.article.developers.add(self.dev)
+
+    def test_list_and_detail_routes_are_async(self):
+        for name, args in (('developer_list', []), ('article_list', []), ('article_detail', [self.article.pk])):
+            view = resolve(reverse(f'main:{name}', args=args)).func
+            self.assertTrue(view.view_class.view_is_async, name)
+
+    async def test_anonymous_is_redirected_to_login(self):
+        response = await self.async_client.get(reverse('main:article_list'))
+        self.assertEqual(response.status_code, 302)
+        self.assertIn(reverse('login'), response['Location'])
+
+    async def test_async_views_render_pages(self):
+        await self.async_client.aforce_login(self.user)
+        response = await self.async_client.get(reverse('main:developer_list'), headers={'HX-Request': 'true'})
+        self.assertTemplateUsed(response, 'main/partials/developer_cards.html')
+        self.assertContains(response, 'Ana')
+
+        response = await self.async_client.get(reverse('main:article_list'), {'search': 'corpo'})
+        self.assertEqual([article.pk for article in response.context['articles']], [self.article.pk])
+        self.assertIn('<mark>', response.context['articles'][0].search_snippet)
+
+        response = await self.async_client.get(reverse('main:article_detail', args=[self.article.pk]))
+        self.assertContains(response, '<p>corpo</p>', html=True)
+        self.assertContains(response, 'alice')
+        response = await self.async_client.get(reverse('main:article_detail', args=[self.article.pk + 1]))
+        self.assertEqual(response.status_code, 404)
+
+    async def test_developer_cards_render_off_the_event_loop(self):
+        loops = []
+
+        def render(developers):
+            try:
+                loops.append(asyncio.get_running_loop())
+            except RuntimeError:
+                loops.append(None)
+            return render_developer_cards(developers)
+
+        await self.async_client.aforce_login(self.user)
+        with mock.patch('main.views.render_developer_cards', render):
+            response = await self.async_client.get(reverse('main:developer_list'))
+        self.assertContains(response, 'Ana')
+        self.assertEqual(loops, [None])
+
+    def test_benchmark_compares_sync_and_async(self):
+        out = StringIO()
+        call_command(
+            'benchmark_async', '--current-db', '--sizes', '20', '--concurrency', '3', '--rounds', '1', stdout=out,
+        )
+        output = out.getvalue()
+        self.assertRegex(output, r'article_detail\s+sync')
+        self.assertRegex(output, r'article_detail\s+async')
+
+
+class ImportExportTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='alice', password='pass123')
+        self.dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.dir.cleanup)
+        self.dev = Developer.objects.create(
+            user=self.user, name='Ana', email='ana@example.com', seniority='sr', skills=['Python', 'SQL']
+        )
+        self.article = Article.objects.create(
+            user=self.user,
+            title='Tabela, "aspas"',
+            content='<p>linha 1\nlinha 2 | pipe</p>',
+            published_at=timezone.now().replace(microsecond=0),
+        )
+        self.article.developers.add(self.dev)
+
+    def path(self, name):
+        return str(Path(self.dir.name) / name)
+
+    def test_round_trip_in_both_formats(self):
+        for fmt in ('csv', 'jsonl'):
+            with self.subTest(fmt=fmt):
+                devs, articles = self.path(f'devs.{fmt}'), self.path(f'articles.{fmt}')
+                call_command('export_data', 'developers', devs, stdout=StringIO())
+                call_command('export_data', 'articles', articles, stdout=StringIO())
+                Article.objects.all().delete()
+                Developer.objects.all().delete()
+
+                call_command('import_data', 'developers', devs, stdout=StringIO())
+                call_command('import_data', 'articles', articles, stdout=StringIO())
+
+                dev = Developer.objects.get(email='ana@example.com')
+                self.assertEqual(dev.skills, ['Python', 'SQL'])
+                self.assertEqual(list(Developer.objects.with_skills(['sql'])), [dev])
+                self.assertEqual(dev.article_total, 1)
+                article = Article.objects.get()
+                self.assertEqual(
+                    (article.slug, article.title, article.content, article.published_at),
+                    (self.article.slug, self.article.title, self.article.content, self.article.published_at),
+                )
+                self.assertEqual(list(article.developers.all()), [dev])
+                self.assertEqual(article.developer_total, 1)
+                self.assertIn('pipe', article.excerpt)
+                self.assertEqual(list(search.filter_articles(Article.objects.all(), 'pipe')), [article])
+
+    def test_import_upserts_by_email_and_slug(self):
+        devs = self.path('devs.jsonl')
+        Path(devs).write_text(
+            '{"email": "ana@example.com", "name": "Ana Souza", "seniority": "pl", "owner": "alice", "skills": ["django"]}\n'
+            '{"email": "bia@example.com", "name": "Bia", "seniority": "jr", "owner": "alice", "skills": []}\n'
+        )
+        call_command('import_data', 'developers', devs, stdout=StringIO())
+        self.dev.refresh_from_db()
+        self.assertEqual((self.dev.name, self.dev.seniority, self.dev.skills), ('Ana Souza', 'pl', ['django']))
+        self.assertEqual(list(self.dev.skill_set.values_list('key', flat=True)), ['django'])
+        self.assertEqual(Developer.objects.count(), 2)
+
+        articles = self.path('articles.csv')
+        Path(articles).write_text(
+            'owner,slug,title,content,published_at,cover_image,developers\n'
+            f'alice,{self.article.slug},Novo titulo,<p>novo</p>,,,bia@example.com\n'
+            'alice,,Sem slug,<p>x</p>,2024-01-02T10:00:00,,ana@example.com|bia@example.com\n'
+        )
+        call_command('import_data', 'articles', articles, stdout=StringIO())
+        self.article.refresh_from_db()
+        self.assertEqual((self.article.title, self.article.excerpt), ('Novo titulo', 'novo'))
+        self.assertEqual(Article.objects.count(), 2)
+        self.assertTrue(Article.objects.filter(slug='sem-slug').exists())
+        self.assertEqual(
+            dict(Developer.objects.values_list('email', 'article_total')),
+            {'ana@example.com': 1, 'bia@example.com': 2},
+        )
+
+    def test_resumes_from_checkpoint_after_failure(self):
+        devs = self.path('devs.csv')
+        rows = ['email,name,seniority,owner,skills']
+        for i in range(5):
+            owner = 'carol' if i == 3 else 'alice'
+            rows.append(f'dev{i}@example.com,Dev {i},jr,{owner},python')
+        Path(devs).write_text('\n'.join(rows) + '\n')
+
+        with self.assertRaisesMessage(CommandError, 'Registros 3-4: Usuarios inexistentes: carol'):
+            call_command('import_data', 'developers', devs, '--batch-size', '2', stdout=StringIO())
+        self.assertTrue(Path(f'{devs}.checkpoint').exists())
+        self.assertEqual(Developer.objects.filter(email__startswith='dev').count(), 2)
+
+        User.objects.create_user(username='carol', password='pass123')
+        out = StringIO()
+        call_command('import_data', 'developers', devs, '--batch-size', '2', stdout=out)
+        self.assertIn('Retomando apos 2 registros', out.getvalue())
+        self.assertIn('Importados 3 developers', out.getvalue())
+        self.assertEqual(Developer.objects.filter(email__startswith='dev').count(), 5)
+        self.assertFalse(Path(f'{devs}.checkpoint').exists())
+
+
+class ConditionalGetTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='alice', password='pass123')
+        self.client.force_login(self.user)
+        self.dev = Developer.objects.create(user=self.user, name='Ana', email='ana@example.com', seniority='jr')
+        self.article = Article.objects.create(user=self.user, title='Cache', content='<p>x</p>')
+        self.article.developers.add(self.dev)
+
+    def revalidate(self, url, response, **headers):
+        return self.client.get(url, headers={'If-None-Match': response['ETag'], **headers})
+
+    def test_detail_returns_304_until_article_or_developer_changes(self):
+        url = reverse('main:article_detail', args=[self.article.pk])
+        first = self.client.get(url)
+        self.assertEqual(first.status_code, 200)
+        self.assertNotIn('Last-Modified', first)
+        self.assertIn('Cookie', first['Vary'])
+
+        # Sessao e usuario vem do cache: so a query do validador.
+        with self.assertNumQueries(1):
+            again = self.revalidate(url, first)
+        self.assertEqual(again.status_code, 304)
+        self.assertEqual(again.templates, [])
+        self.assertEqual(again['ETag'], first['ETag'])
+
+        self.dev.name = 'Ana Maria'
+        self.dev.save()
+        renamed = self.revalidate(url, first)
+        self.assertContains(renamed, 'Ana Maria')
+
+        self.article.title = 'Cache novo'
+        self.article.save(update_fields=['title'])
+        self.assertEqual(self.revalidate(url, renamed).status_code, 200)
+
+    def test_lists_validate_against_the_rows_on_the_page(self):
+        url = reverse('main:developer_list')
+        first = self.client.get(url)
+        self.assertEqual(self.revalidate(url, first).status_code, 304)
+        self.assertEqual(self.revalidate(url, first, **{'HX-Request': 'true'}).status_code, 200)
+
+        Developer.objects.create(user=self.user, name='Bia', email='bia@example.com', seniority='pl')
+        self.assertEqual(self.revalidate(url, first).status_code, 200)
+
+        url = reverse('main:article_list')
+        first = self.client.get(url)
+        self.assertEqual(self.revalidate(url, first).status_code, 304)
+        # Link novo muda o contador do artigo, e com ele o updated_at.
+        other = Developer.objects.create(user=self.user, name='Caio', email='caio@example.com', seniority='sr')
+        self.article.developers.add(other)
+        self.assertEqual(self.revalidate(url, first).status_code, 200)
+
+    def test_if_modified_since_after_delete_renders_the_page(self):
+        Developer.objects.create(user=self.user, name='Bia', email='bia@example.com', seniority='pl')
+        url = reverse('main:developer_list')
+        first = self.client.get(url)
+        self.assertContains(first, 'Bia')
+
+        # Apagar a linha nao deixa nenhum updated_at mais novo na pagina; so o ETag percebe.
+        Developer.objects.filter(name='Bia').delete()
+        since = self.client.get(url, headers={'If-Modified-Since': http_date(time.time() + 60)})
+        self.assertEqual(since.status_code, 200)
+        self.assertNotContains(since, 'Bia')
+        self.assertEqual(self.revalidate(url, first).status_code, 200)
+
+
+class RequestMetricsTests(TestCase):
+    def setUp(self):
+        registry.reset()
+        self.user = User.objects.create_user(username='alice', password='pass123')
+        self.client.force_login(self.user)
+
+    def test_server_timing_header(self):
+        response = self.client.get(reverse('main:developer_list'))
+        header = response['Server-Timing']
+        for metric in ('db;dur=', 'view;dur=', 'tpl;dur=', 'total;dur='):
+            self.assertIn(metric, header)
+        self.assertRegex(header, r'desc="[1-9]\d* queries"')
+
+    def test_metrics_endpoint_is_staff_only(self):
+        self.client.get(reverse('main:article_list'))
+        response = self.client.get(reverse('main:metrics'))
+        self.assertEqual(response.status_code, 302)
+
+        self.user.is_staff = True
+        self.user.save()
+        response = self.client.get(reverse('main:metrics'))
+        body = response.content.decode()
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('# TYPE ltcloud_request_duration_seconds histogram', body)
+        self.assertIn('ltcloud_db_queries_count{view="main:article_list"} 1', body)
+        self.assertIn('ltcloud_template_render_seconds_bucket{view="main:article_list",le="+Inf"} 1', body)
+
+
+class DeveloperCardCacheTests(TestCase):
+    card_template = 'main/partials/developer_card.html'
+
+    def setUp(self):
+        caches[settings.SHARED_CACHE].clear()
+        self.user = User.objects.create_user(username='alice', password='pass123')
+        self.client.force_login(self.user)
+        self.ana = Developer.objects.create(user=self.user, name='Ana', email='ana@example.com', seniority='jr')
+        self.bia = Developer.objects.create(user=self.user, name='Bia', email='bia@example.com', seniority='sr')
+
+    def rendered_cards(self, **params):
+        response = self.client.get(reverse('main:developer_list'), params, HTTP_HX_REQUEST='true')
+        return response, [t.name for t in response.templates].count(self.card_template)
+
+    def test_cards_are_served_from_cache_until_developer_changes(self):
+        _, rendered = self.rendered_cards()
+        self.assertEqual(rendered, 2)
+        _, rendered = self.rendered_cards(search='a')
+        self.assertEqual(rendered, 0)
+
+        self.ana.name = 'Ana Maria'
+        self.ana.save()
+        response, rendered = self.rendered_cards()
+        self.assertEqual(rendered, 1)
+        self.assertContains(response, 'Ana Maria')
+
+    def test_article_links_refresh_article_count(self):
+        self.rendered_cards()
+        article = Article.objects.create(user=self.user, title='Novo', content='x')
+        article.developers.add(self.ana)
+        response, rendered = self.rendered_cards()
+        self.assertEqual(rendered, 1)
+        self.assertContains(response, 'Artigos 1')
+
+        article.delete()
+        response, rendered = self.rendered_cards()
+        self.assertEqual(rendered, 1)
+        self.assertNotContains(response, 'Artigos 1')
+
+    def test_cards_live_in_the_shared_cache(self):
+        cache.clear()
+        self.rendered_cards()
+        shared = caches[settings.SHARED_CACHE]
+        self.assertIsNotNone(shared.get(fragments.version_key(self.ana.pk)))
+        self.assertIsNone(cache.get(fragments.version_key(self.ana.pk)))
+        self.assertEqual(fragments.card_timeout(), fragments.CARD_TIMEOUT)
+
+        # Outro worker enxerga a troca de versao feita aqui.
+        self.ana.name = 'Ana Maria'
+        self.ana.save()
+        caches.close_all()
+        response, rendered = self.rendered_cards()
+        self.assertEqual(rendered, 1)
+        self.assertContains(response, 'Ana Maria')
+
+    @override_settings(SHARED_CACHE=None)
+    def test_process_local_fallback_uses_short_timeout(self):
+        cache.clear()
+        self.assertEqual(fragments.card_timeout(), fragments.LOCAL_CARD_TIMEOUT)
+        with mock.patch.object(LocMemCache, 'set_many', autospec=True, side_effect=LocMemCache.set_many) as set_many:
+            self.rendered_cards()
+        self.assertEqual(set_many.call_args.args[2], fragments.LOCAL_CARD_TIMEOUT)
+        self.assertIsNotNone(cache.get(fragments.version_key(self.ana.pk)))
+
+    def test_works_with_file_based_cache(self):
+        with tempfile.TemporaryDirectory() as location:
+            shared = {'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': location}
+            with override_settings(CACHES={**settings.CACHES, settings.SHARED_CACHE: shared}):
+                self.assertEqual(self.rendered_cards()[1], 2)
+                self.assertEqual(self.rendered_cards()[1], 0)
+                self.bia.articles.add(Article.objects.create(user=self.user, title='Outro', content='x'))
+                response, rendered = self.rendered_cards()
+                self.assertEqual(rendered, 1)
+                self.assertContains(response, 'Artigos 1')
+
+
+class DenormalizedTotalsTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='alice', password='pass123')
+        self.ana = Developer.objects.create(user=self.user, name='Ana', email='ana@example.com', seniority='jr')
+        self.bia = Developer.objects.create(user=self.user, name='Bia', email='bia@example.com', seniority='sr')
+        self.article = Article.objects.create(user=self.user, title='Um', content='x')
+
+    def assertTotals(self, ana, bia, article):
+        self.assertEqual(
+            (
+                Developer.objects.get(pk=self.ana.pk).article_total,
+                Developer.objects.get(pk=self.bia.pk).article_total,
+                Article.objects.get(pk=self.article.pk).developer_total,
+            ),
+            (ana, bia, article),
+        )
+
+    def test_links_update_both_sides(self):
+        self.article.developers.add(self.ana, self.bia)
+        self.article.developers.add(self.ana)
+        self.assertTotals(1, 1, 2)
+
+        self.article.developers.remove(self.bia, self.bia.pk + 100)
+        self.assertTotals(1, 0, 1)
+
+        self.bia.articles.add(self.article)
+        self.assertTotals(1, 1, 2)
+
+        self.article.developers.clear()
+        self.assertTotals(0, 0, 0)
+
+        self.ana.articles.add(self.article)
+        self.ana.articles.clear()
+        self.assertTotals(0, 0, 0)
+
+    def test_deletes_release_counts(self):
+        other = Article.objects.create(user=self.user, title='Dois', content='y')
+        other.developers.add(self.ana)
+        self.article.developers.set([self.ana, self.bia])
+        self.assertTotals(2, 1, 2)
+
+        other.delete()
+        self.assertTotals(1, 1, 2)
+
+        self.bia.delete()
+        self.assertEqual(Article.objects.get(pk=self.article.pk).developer_total, 1)
+
+    def test_recount_command_repairs_drift(self):
+        self.article.developers.add(self.ana)
+        Developer.objects.filter(pk=self.ana.pk).update(article_total=7)
+        Article.objects.filter(pk=self.article.pk).update(developer_total=0)
+
+        out = StringIO()
+        call_command('recount_totals', '--batch-size', '1', stdout=out)
+        self.assertIn('Corrigidos 1 developers e 1 artigos', out.getvalue())
+        self.assertTotals(1, 0, 1)
+
+    def test_list_views_do_not_aggregate(self):
+        self.client.force_login(self.user)
+        with CaptureQueriesContext(connection) as captured:
+            self.client.get(reverse('main:developer_list'))
+            self.client.get(reverse('main:article_list'))
+        self.assertFalse([q['sql'] for q in captured if 'GROUP BY' in q['sql']])
+
+
+@override_settings(JOBS_EAGER=True)
+class CoverThumbnailTests(TestCase):
+    def setUp(self):
+        self.media = tempfile.TemporaryDirectory()
+        self.addCleanup(self.media.cleanup)
+        override = override_settings(MEDIA_ROOT=self.media.name)
+        override.enable()
+        self.addCleanup(override.disable)
+        self.user = User.objects.create_user(username='alice', password='pass123')
+        self.client.force_login(self.user)
+
+    def png(self, name='capa.png', size=(1600, 900)):
+        buffer = BytesIO()
+        Image.new('RGBA', size, (200, 30, 30, 255)).save(buffer, 'PNG')
+        return SimpleUploadedFile(name, buffer.getvalue(), content_type='image/png')
+
+    def test_upload_builds_variants_and_templates_use_srcset(self):
+        response = self.client.post(
+            reverse('main:article_create'),
+            {'title': 'Com capa', 'content': 'x', 'cover_image': self.png()},
+        )
+        self.assertEqual(response.status_code, 302)
+        article = Article.objects.get(title='Com capa')
+        self.assertEqual(sorted(article.cover_variants['jpeg'], key=int), ['400', '800', '1200'])
+        with Image.open(Path(self.media.name) / article.cover_variants['jpeg']['400']) as thumb:
+            self.assertEqual(thumb.size, (400, 225))
+
+        html = self.client.get(reverse('main:article_list')).content.decode()
+        self.assertIn('loading="lazy"', html)
+        self.assertIn(f'{article.cover_variants["jpeg"]["800"]} 800w', html)
+
+    def test_list_falls_back_to_original_until_ready(self):
+        article = Article.objects.create(user=self.user, title='Antiga', content='x', cover_image=self.png())
+        html = self.client.get(reverse('main:article_list')).content.decode()
+        self.assertIn(f'src="{article.cover_image.url}"', html)
+        self.assertNotIn('srcset', html)
+
+    def test_backfill_command(self):
+        small = Article.objects.create(user=self.user, title='Pequena', content='x', cover_image=self.png('p.png', (300, 200)))
+        Article.objects.create(user=self.user, title='Sem capa', content='x')
+        out = StringIO()
+        call_command('build_thumbnails', stdout=out)
+        self.assertIn('Miniaturas geradas para 1 artigos', out.getvalue())
+        small.refresh_from_db()
+        self.assertEqual(list(small.cover_variants['jpeg']), ['300'])
+
+
+class RenderedContentTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='alice', password='pass123')
+        self.client.force_login(self.user)
+        self.article = Article.objects.create(
+            user=self.user,
+            title='Rico',
+            content='<p onclick="x()">Ola <strong>mundo</strong></p><script>alert(1)</script>'
+            '<a href="javascript:alert(2)">link</a>' + '<p>' + 'texto longo ' * 60 + '</p>',
+        )
+
+    def test_save_stores_excerpt_and_sanitized_html(self):
+        self.assertTrue(self.article.excerpt.startswith('Ola mundo link texto longo'))
+        self.assertLessEqual(len(self.article.excerpt), 281)
+        self.assertTrue(self.article.excerpt.endswith('…'))
+        self.assertIn('<p>Ola <strong>mundo</strong></p>', self.article.content_html)
+        self.assertNotIn('script', self.article.content_html)
+        self.assertNotIn('javascript', self.article.content_html)
+        self.assertNotIn('onclick', self.article.content_html)
+
+    def test_update_fields_with_content_refreshes_rendered_copies(self):
+        self.article.content = '<p>novo</p>'
+        self.article.save(update_fields=['content'])
+        self.article.refresh_from_db()
+        self.assertEqual((self.article.excerpt, self.article.content_html), ('novo', '<p>novo</p>'))
+
+    def test_update_fields_without_text_skip_render_and_index(self):
+        article = Article.objects.defer('content').get(pk=self.article.pk)
+        article.developer_total = 3
+        with mock.patch.object(Article, 'render_content') as render, mock.patch.object(search, 'index_article') as index:
+            with CaptureQueriesContext(connection) as ctx:
+                article.save(update_fields=['developer_total'])
+        render.assert_not_called()
+        index.assert_not_called()
+        # So o UPDATE: content adiado nao e carregado.
+        statements = [q['sql'].split()[0] for q in ctx.captured_queries if not q['sql'].startswith(('SAVEPOINT', 'RELEASE'))]
+        self.assertEqual(statements, ['UPDATE'])
+
+        article.title = 'Rico e novo'
+        with mock.patch.object(search, 'index_article') as index:
+            article.save(update_fields=['title'])
+        index.assert_called_once_with(article)
+
+    def test_list_sends_excerpt_and_detail_sends_sanitized_html(self):
+        html = self.client.get(reverse('main:article_list')).content.decode()
+        self.assertIn('Ola mundo', html)
+        self.assertNotIn('<strong>mundo</strong>', html)
+
+        html = self.client.get(reverse('main:article_detail', args=[self.article.pk])).content.decode()
+        self.assertIn('<strong>mundo</strong>', html)
+        self.assertNotIn('alert(1)', html)
+
+
+    def test_void_and_self_closing_drop_tags_keep_following_content(self):
+        self.assertEqual(
+            render_content('<p>a</p><embed src="x.swf"><p>important text</p>'),
+            ('a important text', '<p>a</p><p>important text</p>'),
+        )
+        self.assertEqual(
+            render_content('<p>a</p><iframe src="https://example.com"/><p>b</p><script>x()</script><p>c</p>'),
+            ('a b c', '<p>a</p><p>b</p><p>c</p>'),
+        )
+
+    def test_keeps_alignment_styles_only(self):
+        _, html = render_content(
+            '<p style="text-align: Center; color: red; background: url(javascript:x)">a</p>'
+            '<p style="padding-left: 40px; text-align: expression(x)">b</p><p style="color: red">c</p>'
+        )
+        self.assertEqual(html, '<p style="text-align: center">a</p><p style="padding-left: 40px">b</p><p>c</p>')
+
+    def test_render_content_command_repairs_stale_rows(self):
+        Article.objects.filter(pk=self.article.pk).update(content_html='<p>antigo</p>', excerpt='antigo')
+        out = StringIO()
+        call_command('render_content', stdout=out)
+        self.assertIn('Conteudo regerado em 1 artigos', out.getvalue())
+        self.article.refresh_from_db()
+        self.assertIn('<strong>mundo</strong>', self.article.content_html)
+
+
+class SQLiteConnectionProfileTests(TestCase):
+    alias = 'concurrency'
+
+    def setUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()
+        settings_dict = dict(connections['default'].settings_dict)
+        settings_dict['NAME'] = str(Path(self.tempdir.name) / 'concurrency.sqlite3')
+        connections.settings[self.alias] = settings_dict
+
+    def tearDown(self):
+        connections[self.alias].close()
+        del connections[self.alias]
+        del connections.settings[self.alias]
+        self.tempdir.cleanup()
+
+    def connect(self):
+        # Cada thread abre a propria conexao; connect() direto evita a trava do TestCase
+        # contra conexoes em threads para aliases fora de `databases`.
+        conn = connections[self.alias]
+        if conn.connection is None:
+            conn.connect()
+        return conn
+
+    def pragma(self, name):
+        with self.connect().cursor() as cursor:
+            cursor.execute(f'PRAGMA {name}')
+            return cursor.fetchone()[0]
+
+    def test_connection_uses_production_pragmas(self):
+        self.assertEqual(self.pragma('journal_mode'), 'wal')
+        self.assertEqual(self.pragma('synchronous'), 1)
+        self.assertEqual(self.pragma('busy_timeout'), 5000)
+        self.assertEqual(self.pragma('temp_store'), 2)
+        self.assertEqual(connections[self.alias].transaction_mode, 'IMMEDIATE')
+
+    def test_persistent_connections_only_under_wsgi(self):
+        def conn_max_age(module):
+            code = f'import {module}; from django.conf import settings; print(settings.DATABASES["default"]["CONN_MAX_AGE"])'
+            env = {key: value for key, value in os.environ.items() if key != 'LTCLOUD_ASGI'}
+            result = subprocess.run([sys.executable, '-c', code], cwd=settings.BASE_DIR, env=env, capture_output=True, text=True, check=True)
+            return int(result.stdout)
+
+        self.assertEqual(conn_max_age('ltcloud.wsgi'), 600)
+        self.assertEqual(conn_max_age('ltcloud.asgi'), 0)
+
+    def test_readers_and_writer_progress_without_lock_errors(self):
+        with self.connect().cursor() as cursor:
+            cursor.execute('CREATE TABLE item (id INTEGER PRIMARY KEY, value INTEGER)')
+        writes = 200
+        readers = 4
+        done = threading.Event()
+        # O escritor segura a primeira transacao aberta ate cada leitor ter lido durante ela.
+        held = threading.Event()
+        overlapped = threading.Barrier(readers + 1, timeout=30)
+        errors = []
+        reads = []
+        during_write = []
+
+        def writer():
+            try:
+                self.connect()
+                for value in range(writes):
+                    with transaction.atomic(using=self.alias):
+                        with connections[self.alias].cursor() as cursor:
+                            cursor.execute('INSERT INTO item (value) VALUES (%s)', [value])
+                            cursor.execute('SELECT COUNT(*) FROM item')
+                        if value == 0:
+                            held.set()
+                            overlapped.wait()
+            except Exception as exc:
+                errors.append(exc)
+                overlapped.abort()
+            finally:
+                done.set()
+                connections[self.alias].close()
+
+        def reader():
+            count = 0
+            overlapping = False
+            try:
+                conn = self.connect()
+                # Leitura como nas views: autocommit, sem BEGIN IMMEDIATE.
+                self.assertTrue(conn.get_autocommit())
+                while not done.is_set():
+                    joining = held.is_set() and not overlapping
+                    with conn.cursor() as cursor:
+                        cursor.execute('SELECT COUNT(*), SUM(value) FROM item')
+                        total = cursor.fetchone()[0]
+                    count += 1
+                    if joining:
+                        overlapping = True
+                        during_write.append(total)
+                        overlapped.wait()
+            except Exception as exc:
+                errors.append(exc)
+                overlapped.abort()
+            finally:
+                reads.append(count)
+                connections[self.alias].close()
+
+        threads = [threading.Thread(target=reader) for _ in range(readers)] + [threading.Thread(target=writer)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=60)
+
+        self.assertEqual(errors, [])
+        self.assertEqual(len(reads), readers)
+        self.assertTrue(all(reads))
+        # Todos leram com a escrita em andamento, sem esperar por ela e sem ver o INSERT pendente.
+        self.assertEqual(during_write, [0] * readers)
+        with connections[self.alias].cursor() as cursor:
+            cursor.execute('SELECT COUNT(*) FROM item')
+            self.assertEqual(cursor.fetchone()[0], writes)
+
+
+@override_settings(DATABASE_REPLICA='replica')
+class ReplicaRoutingTests(TransactionTestCase):
+    alias = 'replica'
+
+    def setUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()
+        settings_dict = dict(connections['default'].settings_dict)
+        settings_dict['NAME'] = str(Path(self.tempdir.name) / 'replica.sqlite3')
+        connections.settings[self.alias] = settings_dict
+        # Conexao aberta aqui: o TestCase so barra conexoes novas a aliases fora de `databases`.
+        connections[self.alias].connect()
+        self.user = User.objects.create_user(username='alice', password='pass123')
+        self.client.login(username='alice', password='pass123')
+        self.dev = Developer.objects.create(user=self.user, name='Ana Replica', email='ana@example.com', seniority='jr')
+        self.sync_replica()
+
+    def tearDown(self):
+        connections[self.alias].close()
+        del connections[self.alias]
+        del connections.settings[self.alias]
+        self.tempdir.cleanup()
+
+    def sync_replica(self):
+        """Faz da replica uma copia do primario; sem a transacao do TestCase, o backup le os dados confirmados."""
+        connections['default'].ensure_connection()
+        connections['default'].connection.backup(connections[self.alias].connection)
+
+    def test_list_and_detail_read_from_replica(self):
+        Developer.objects.create(user=self.user, name='Bia Atrasada', email='bia@example.com', seniority='sr')
+        response = self.client.get(reverse('main:developer_list'))
+        self.assertContains(response, 'Ana Replica')
+        self.assertNotContains(response, 'Bia Atrasada')
+
+        self.sync_replica()
+        response = self.client.get(reverse('main:developer_list'))
+        self.assertContains(response, 'Bia Atrasada')
+
+        article = Article.objects.create(user=self.user, title='Ainda nao replicado', content='<p>x</p>')
+        response = self.client.get(reverse('main:article_detail', args=[article.pk]))
+        self.assertEqual(response.status_code, 404)
+        article.delete()
+
+    def test_export_reads_from_replica(self):
+        Developer.objects.create(user=self.user, name='Bia Atrasada', email='bia@example.com', seniority='sr')
+        response = self.client.get(reverse('main:developer_export'))
+        content = b''.join(response.streaming_content).decode()
+        self.assertIn('ana@example.com', content)
+        self.assertNotIn('bia@example.com', content)
+
+    def test_reads_stick_to_primary_after_write(self):
+        response = self.client.post(
+            reverse('main:developer_create'),
+            {'name': 'Caio Novo', 'email': 'caio@example.com', 'seniority': 'pl', 'skills': 'python'},
+        )
+        self.assertEqual(response.status_code, 302)
+        self.assertIn(routers.PIN_COOKIE, response.cookies)
+        self.assertFalse(Developer.objects.using(self.alias).filter(email='caio@example.com').exists())
+
+        response = self.client.get(reverse('main:developer_list'))
+        self.assertContains(response, 'Caio Novo')
+
+        self.client.cookies.pop(routers.PIN_COOKIE)
+        response = self.client.get(reverse('main:developer_list'))
+        self.assertNotContains(response, 'Caio Novo')
+        self.assertNotIn(routers.PIN_COOKIE, response.cookies)
+
+    def test_writes_and_other_paths_use_primary(self):
+        self.assertEqual(router.db_for_write(Developer), 'default')
+        self.assertEqual(router.db_for_read(Developer), 'default')
+        dev = Developer.objects.create(user=self.user, name='Duda Form', email='duda@example.com', seniority='jr')
+        response = self.client.get(reverse('main:developer_update', args=[dev.pk]))
+        self.assertContains(response, 'Duda Form')
+
+
+class StaticAssetsTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='alice', password='pass123')
+        self.client.force_login(self.user)
+
+    def test_pages_use_self_hosted_assets(self):
+        response = self.client.get(reverse('main:article_create'))
+        for asset in ('css/app.css', 'vendor/htmx/htmx.min.js', 'vendor/tinymce/tinymce.min.js'):
+            self.assertContains(response, f'{settings.STATIC_URL}{asset}')
+        for host in ('cdn.tailwindcss.com', 'unpkg.com', 'cdn.jsdelivr.net'):
+            self.assertNotContains(response, host)
+
+    def test_vendored_files_are_committed_at_pinned_versions(self):
+        vendor = settings.BASE_DIR / 'static' / 'vendor'
+        self.assertIn(b'version:"1.9.12"', (vendor / 'htmx' / 'htmx.min.js').read_bytes())
+        self.assertIn(b'TinyMCE version 6.8.3', (vendor / 'tinymce' / 'tinymce.min.js').read_bytes())
+        # Tudo o que o tinymce.init do formulario carrega pelo nome original.
+        for name in ('icons/default/icons.min.js', 'models/dom/model.min.js', 'themes/silver/theme.min.js',
+                     'skins/ui/oxide/skin.min.css', 'skins/content/default/content.min.css',
+                     'plugins/code/plugin.min.js', 'plugins/link/plugin.min.js', 'plugins/lists/plugin.min.js',
+                     'plugins/table/plugin.min.js'):
+            self.assertTrue((vendor / 'tinymce' / name).is_file(), name)
+
+    def test_stylesheet_covers_template_classes(self):
+        css = (settings.BASE_DIR / 'static' / 'css' / 'app.css').read_text()
+        selectors = {name.replace('\\', '') for name in re.findall(r'\.((?:[\w-]|\\.)+)', css)}
+        used = set()
+        main = settings.BASE_DIR / 'main'
+        sources = [*(main / 'templates').rglob('*.html'), *(main / 'forms.py', main / 'forms_auth.py')]
+        for path in sources:
+            text = path.read_text()
+            for value in re.findall(r'class="([^"]*)"', text) + re.findall(r"'\{css\} ([^']*)'", text):
+                used.update(re.sub(r'{%.*?%}|{{.*?}}', ' ', value).split())
+        # prose vem do plugin de tipografia, que a pagina nunca carregou.
+        self.assertEqual(used - selectors - {'prose'}, set())
+
+    def test_collectstatic_serves_hashed_precompressed_files(self):
+        with tempfile.TemporaryDirectory() as root, override_settings(STATIC_ROOT=root):
+            call_command('collectstatic', interactive=False, verbosity=0)
+            url = static('css/app.css')
+            self.assertRegex(url, r'^/static/css/app\.[0-9a-f]{12}\.css$')
+            original = (settings.BASE_DIR / 'static' / 'css' / 'app.css').read_bytes()
+
+            response = self.client.get(url, headers={'Accept-Encoding': 'gzip, deflate'})
+            self.assertEqual(response['Content-Encoding'], 'gzip')
+            self.assertEqual(response['Content-Type'], 'text/css')
+            self.assertIn('immutable', response['Cache-Control'])
+            self.assertIn('Accept-Encoding', response['Vary'])
+            self.assertEqual(gzip.decompress(b''.join(response.streaming_content)), original)
+
+            plain = self.client.get(url)
+            self.assertFalse(plain.has_header('Content-Encoding'))
+            self.assertEqual(b''.join(plain.streaming_content), original)
+
+            unhashed = self.client.get('/static/css/app.css')
+            self.assertEqual(unhashed['Cache-Control'], 'no-cache')
+            revalidated = self.client.get('/static/css/app.css', headers={'If-Modified-Since': unhashed['Last-Modified']})
+            self.assertEqual(revalidated.status_code, 304)
+            self.assertEqual(self.client.get('/static/../ltcloud/settings.py').status_code, 404)
+            # Com DEBUG=False as paginas resolvem os scripts vendorizados pelo manifest.
+            page = self.client.get(reverse('main:developer_list'))
+            self.assertEqual(page.status_code, 200)
+            self.assertRegex(page.content.decode(), r'vendor/htmx/htmx\.min\.[0-9a-f]{12}\.js')
+
+    def test_vendor_assets_extracts_minified_files(self):
+        def tarball(files):
+            buffer = BytesIO()
+            with tarfile.open(fileobj=buffer, mode='w:gz') as archive:
+                for name, data in files.items():
+                    info = tarfile.TarInfo(f'package/{name}')
+                    info.size = len(data)
+                    archive.addfile(info, BytesIO(data))
+            return buffer.getvalue()
+
+        packages = {
+            'htmx.org': tarball({'dist/htmx.min.js': b'htmx', 'dist/htmx.js': b'full', 'LICENSE': b'bsd'}),
+            'tinymce': tarball(
+                {
+                    'tinymce.min.js': b'tiny',
+                    'plugins/link/plugin.js': b'full',
+                    'plugins/link/plugin.min.js': b'link',
+                    'plugins/emoticons/plugin.min.js': b'unused',
+                    'skins/ui/oxide/skin.min.css': b'skin',
+                }
+            ),
+        }
+
+        def urlopen(url, timeout):
+            package = url.split('/-/')[0].rsplit('/', 1)[1]
+            return BytesIO(packages[package])
+
+        with tempfile.TemporaryDirectory() as dest, mock.patch('urllib.request.urlopen', urlopen):
+            call_command('vendor_assets', '--dest', dest, stdout=StringIO())
+            files = sorted(str(path.relative_to(dest)) for path in Path(dest).rglob('*') if path.is_file())
+        self.assertEqual(
+            files,
+            [
+                'htmx/LICENSE',
+                'htmx/htmx.min.js',
+                'tinymce/plugins/link/plugin.min.js',
+                'tinymce/skins/ui/oxide/skin.min.css',
+                'tinymce/tinymce.min.js',
+            ],
+        )
+
+
+class QueryPlanTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='alice', password='pass123')
+        now = timezone.now()
+        self.devs = [
+            Developer.objects.create(
+                user=self.user, name=f'Dev {index}', email=f'dev{index}@example.com', seniority='sr', skills=['python']
+            )
+            for index in range(4)
+        ]
+        for index in range(4):
+            article = Article.objects.create(
+                user=self.user, title=f'Plano {index}', content='<p>indice</p>', published_at=now - timedelta(days=index)
+            )
+            article.developers.add(*self.devs[:2])
+
+    def plans(self, view_class, params):
+        """Planos da pagina inicial e da pagina seguinte (com o filtro do cursor)."""
+        found = []
+        cursor = None
+        for _ in range(2):
+            request = RequestFactory().get('/', {**params, **({'cursor': cursor} if cursor else {})})
+            request.user = self.user
+            view = view_class()
+            view.setup(request)
+            queryset = view.get_queryset()
+            keyset = view.get_keyset()
+            window = keyset.window(queryset, view.paginate_by, view.get_cursor())
+            found.append(window.explain())
+            cursor = keyset.encode(list(window)[0])
+        return found
+
+    def assertNoSortedFullScan(self, plan):
+        full_scans = re.findall(r'\bSCAN (\S+)$', plan, re.MULTILINE)
+        if full_scans and 'USE TEMP B-TREE FOR ORDER BY' in plan:
+            self.fail(f'Varredura completa de {", ".join(full_scans)} com sort temporario:\n{plan}')
+
+    def test_developer_list_paths_use_indexes(self):
+        cases = [
+            ({}, 'developer_name_idx'),
+            ({'seniority': 'sr'}, 'developer_seniority_name_idx'),
+            ({'search': 'dev'}, 'developer_name_idx'),
+            ({'skill': 'python'}, None),
+        ]
+        for params, index in cases:
+            for plan in self.plans(views.DeveloperListView, params):
+                with self.subTest(params=params):
+                    self.assertNoSortedFullScan(plan)
+                    if index:
+                        self.assertIn(index, plan)
+
+    def test_article_list_paths_use_indexes(self):
+        cases = [
+            ({}, 'article_published_title_idx'),
+            ({'developer': self.devs[0].pk}, 'article_developers_dev_article_idx'),
+        ]
+        if search.is_available():
+            cases.append(({'search': 'plano'}, None))
+        for params, index in cases:
+            for plan in self.plans(views.ArticleListView, params):
+                with self.subTest(params=params):
+                    self.assertNoSortedFullScan(plan)
+                    if index:
+                        self.assertIn(index, plan)
+
+    def test_autocomplete_path_uses_prefix_index(self):
+        for plan in self.plans(views.DeveloperAutocompleteView, {'q': 'de'}):
+            self.assertNoSortedFullScan(plan)
+            self.assertIn('developer_name_prefix_idx', plan)
+
+
+class ObjectPermissionTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='alice', password='pass123')
+        self.other_user = User.objects.create_user(username='bob', password='pass123')
+        self.article = Article.objects.create(user=self.other_user, title='De outro', content='texto')
+        self.dev = Developer.objects.create(user=self.other_user, name='Bia Go', email='bia@example.com', seniority='sr')
+
+    def test_edit_views_fetch_object_once_without_loading_owner(self):
+        self.client.force_login(self.other_user)
+        # Primeira requisicao guarda o usuario logado no SHARED_CACHE.
+        self.client.get(reverse('main:developer_list'))
+        for url in (
+            reverse('main:article_update', args=[self.article.pk]),
+            reverse('main:article_delete', args=[self.article.pk]),
+            reverse('main:developer_update', args=[self.dev.pk]),
+            reverse('main:developer_delete', args=[self.dev.pk]),
+        ):
+            table = 'main_article' if 'article' in url else 'main_developer'
+            with CaptureQueriesContext(connection) as ctx:
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            fetches = [q['sql'] for q in ctx.captured_queries if re.search(rf'FROM "{table}" WHERE "{table}"."id" =', q['sql'])]
+            self.assertEqual(len(fetches), 1, url)
+            # Usuario logado vem do cache e o dono nao e carregado.
+            users = [q['sql'] for q in ctx.captured_queries if 'FROM "auth_user"' in q['sql']]
+            self.assertEqual(users, [], url)
+
+    def test_other_users_get_403_and_superuser_passes(self):
+        self.client.force_login(self.user)
+        for name, obj in (
+            ('main:article_update', self.article),
+            ('main:article_delete', self.article),
+            ('main:developer_update', self.dev),
+            ('main:developer_delete', self.dev),
+        ):
+            self.assertEqual(self.client.get(reverse(name, args=[obj.pk])).status_code, 403, name)
+            self.assertEqual(self.client.post(reverse(name, args=[obj.pk])).status_code, 403, name)
+        self.assertTrue(Developer.objects.filter(pk=self.dev.pk).exists())
+        self.assertTrue(Article.objects.filter(pk=self.article.pk).exists())
+
+        admin = User.objects.create_superuser(username='admin', password='pass123', email='admin@example.com')
+        self.client.force_login(admin)
+        response = self.client.post(reverse('main:developer_delete', args=[self.dev.pk]))
+        self.assertRedirects(response, reverse('main:developer_list'), fetch_redirect_response=False)
+        self.assertFalse(Developer.objects.filter(pk=self.dev.pk).exists())
+
+    def test_missing_object_is_404(self):
+        self.client.force_login(self.user)
+        response = self.client.get(reverse('main:developer_update', args=[self.dev.pk + 100]))
+        self.assertEqual(response.status_code, 404)
+
+
+class CachedAuthTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='alice', password='pass123')
+        Developer.objects.create(user=self.user, name='Ana Python', email='ana@example.com', seniority='jr')
+        self.client.login(username='alice', password='pass123')
+        self.url = reverse('main:developer_list')
+
+    def cached_user(self):
+        return caches[settings.AUTH_USER_CACHE].get(user_key(self.user.pk))
+
+    def test_htmx_filter_skips_session_and_user_queries(self):
+        hx = {'HX-Request': 'true'}
+        self.assertEqual(self.client.get(self.url, {'search': 'An'}, headers=hx).status_code, 200)
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(self.url, {'search': 'Ana'}, headers=hx)
+        self.assertContains(response, 'Ana Python')
+        tables = ' '.join(q['sql'] for q in ctx.captured_queries)
+        self.assertNotIn('django_session', tables)
+        self.assertNotIn('auth_user', tables)
+        # Validador do ETag + pagina de developers.
+        self.assertEqual(len(ctx.captured_queries), 2)
+
+    def test_password_hash_is_not_cached(self):
+        self.client.get(self.url)
+        entry = self.cached_user()
+        self.assertNotIn('password', entry['fields'])
+        self.assertNotIn(self.user.password, repr(entry))
+
+        user = self.client.get(self.url).wsgi_request.user
+        self.assertEqual(user.username, 'alice')
+        self.assertEqual(user.get_deferred_fields(), {'password'})
+        # Salvar o usuario vindo do cache nao apaga a senha.
+        user.first_name = 'Alice'
+        user.save()
+        self.assertTrue(User.objects.get(pk=self.user.pk).check_password('pass123'))
+
+    def test_password_change_ends_cached_session(self):
+        self.client.get(self.url)
+        self.assertIsNotNone(self.cached_user())
+        self.user.set_password('outra-senha-123')
+        self.user.save()
+        self.assertIsNone(self.cached_user())
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 302)
+        self.assertIn(reverse('login'), response['Location'])
+
+    def test_user_update_and_logout_invalidate(self):
+        self.client.get(self.url)
+        User.objects.get(pk=self.user.pk).save(update_fields=['first_name'])
+        self.assertIsNone(self.cached_user())
+
+        self.client.get(self.url)
+        self.assertIsNotNone(self.cached_user())
+        self.client.post(reverse('logout'))
+        self.assertIsNone(self.cached_user())
+        self.assertEqual(self.client.get(self.url).status_code, 302)
+
+    def test_default_settings_use_shared_cache(self):
+        self.assertEqual(settings.SESSION_ENGINE, 'django.contrib.sessions.backends.cached_db')
+        self.assertEqual(settings.SESSION_CACHE_ALIAS, settings.SHARED_CACHE)
+        self.assertEqual(check_shared_caches(None), [])
+
+    def test_process_local_cache_fails_system_check(self):
+        with override_settings(AUTH_USER_CACHE='default', SESSION_CACHE_ALIAS='default'):
+            self.assertEqual([error.id for error in check_shared_caches(None)], ['main.E001', 'main.E002'])
+
+
+def failing_task(message):
+    raise RuntimeError(message)
+
+
+class JobQueueTests(TestCase):
+    def setUp(self):
+        self.media = tempfile.TemporaryDirectory()
+        self.addCleanup(self.media.cleanup)
+        override = override_settings(MEDIA_ROOT=self.media.name)
+        override.enable()
+        self.addCleanup(override.disable)
+        self.user = User.objects.create_user(username='alice', password='pass123', email='alice@example.com')
+
+    def run_due(self, worker='w1'):
+        return [jobs.run(job) for job in jobs.claim(worker, 10)]
+
+    def test_cover_upload_is_queued_and_built_by_worker(self):
+        buffer = BytesIO()
+        Image.new('RGB', (900, 600), (10, 120, 200)).save(buffer, 'PNG')
+        self.client.force_login(self.user)
+        response = self.client.post(
+            reverse('main:article_create'),
+            {'title': 'Na fila', 'content': 'x', 'cover_image': SimpleUploadedFile('capa.png', buffer.getvalue(), content_type='image/png')},
+        )
+        self.assertEqual(response.status_code, 302)
+        article = Article.objects.get(title='Na fila')
+        self.assertEqual(article.cover_variants, {})
+        job = Job.objects.get()
+        self.assertEqual((job.task, job.args), ('main.thumbnails.build_for_article', [article.pk, article.cover_image.name]))
+
+        self.assertEqual(self.run_due(), [True])
+        article.refresh_from_db()
+        self.assertEqual(list(article.cover_variants['jpeg']), ['400', '800'])
+        self.assertEqual(Job.objects.get().status, Job.DONE)
+
+    def test_password_reset_email_is_sent_by_worker(self):
+        response = self.client.post(reverse('password_reset'), {'email': 'alice@example.com'})
+        self.assertRedirects(response, reverse('password_reset_done'))
+        self.assertEqual(mail.outbox, [])
+        self.assertEqual(Job.objects.get().task, 'django.core.mail.send_mail')
+
+        self.assertEqual(self.run_due(), [True])
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, ['alice@example.com'])
+        self.assertIn('/accounts/reset/', mail.outbox[0].body)
+        # O link de reset nao fica guardado no job concluido.
+        self.assertEqual((Job.objects.get().args, Job.objects.get().kwargs), ([], {}))
+
+    @override_settings(JOB_RETRY_DELAY=30, JOB_RETRY_MAX_DELAY=3600)
+    def test_failures_retry_with_backoff_then_fail(self):
+        job = jobs.enqueue('main.tests.failing_task', 'boom')
+        Job.objects.filter(pk=job.pk).update(max_attempts=3)
+        delays = []
+        for expected in (Job.PENDING, Job.PENDING, Job.FAILED):
+            before = timezone.now()
+            self.assertEqual(self.run_due(), [False])
+            job.refresh_from_db()
+            self.assertEqual(job.status, expected)
+            self.assertIn('RuntimeError: boom', job.last_error)
+            if expected == Job.PENDING:
+                delays.append(round((job.run_at - before).total_seconds()))
+                # Ainda nao venceu: nenhum worker pega.
+                self.assertEqual(jobs.claim('w1', 10), [])
+                Job.objects.filter(pk=job.pk).update(run_at=before)
+        self.assertEqual(delays, [30, 60])
+        self.assertEqual(job.attempts, 3)
+        self.assertEqual(job.args, [])
+
+    def test_claim_is_exclusive_and_recovers_stale_locks(self):
+        first, second = (jobs.enqueue('django.core.mail.send_mail', f'assunto {i}', 'corpo', None, ['a@example.com']) for i in range(2))
+        self.assertEqual([job.pk for job in jobs.claim('w1', 1)], [first.pk])
+        self.assertEqual([job.pk for job in jobs.claim('w2', 10)], [second.pk])
+        self.assertEqual(jobs.claim('w3', 10), [])
+
+        with override_settings(JOB_LOCK_TIMEOUT=60):
+            Job.objects.filter(pk=first.pk).update(locked_at=timezone.now() - timedelta(minutes=5))
+            stolen = jobs.claim('w3', 10)
+        self.assertEqual([(job.pk, job.attempts) for job in stolen], [(first.pk, 2)])
+        # O worker antigo termina depois: o resultado dele nao sobrescreve o do novo dono.
+        old = Job(pk=first.pk, task='django.core.mail.send_mail', args=['x', 'y', None, []], locked_by='w1', attempts=1)
+        jobs.run(old)
+        self.assertEqual(Job.objects.get(pk=first.pk).locked_by, 'w3')
+
+    def test_enqueue_rejects_unknown_task(self):
+        with self.assertRaises(ImportError):
+            jobs.enqueue('main.tests.nao_existe')
+        self.assertFalse(Job.objects.exists())
+
+
+class RunWorkerCommandTests(TransactionTestCase):
+    def test_burst_drains_queue(self):
+        for i in range(5):
+            jobs.enqueue('django.core.mail.send_mail', f'assunto {i}', 'corpo', None, ['a@example.com'])
+        jobs.enqueue('main.tests.failing_task', 'boom')
+        out = StringIO()
+        # Uma thread: o banco de teste em memoria (shared cache) nao espera locks entre conexoes.
+        call_command('run_worker', '--burst', '--threads', '1', stdout=out)
+        self.assertIn('5 jobs concluidos (1 falhas)', out.getvalue())
+        self.assertEqual(sorted(message.subject for message in mail.outbox), [f'assunto {i}' for i in range(5)])
+        self.assertEqual(Job.objects.filter(status=Job.DONE).count(), 5)
+        self.assertEqual(Job.objects.filter(status=Job.PENDING, attempts=1).count(), 1)
+
+    def test_processes_without_fork_is_rejected(self):
+        with mock.patch('multiprocessing.get_all_start_methods', return_value=['spawn']):
+            with self.assertRaisesMessage(CommandError, '--processes exige fork'):
+                call_command('run_worker', '--burst', '--processes', '2')
+
+
+class JsonApiTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='alice', password='pass123')
+        self.client.force_login(self.user)
+        for i, (name, seniority) in enumerate([('Ana', 'jr'), ('Bruno', 'sr'), ('Carla', 'sr'), ('Davi', 'pl'), ('Elis', 'sr')]):
+            Developer.objects.create(user=self.user, name=name, email=f'{name.lower()}@example.com', seniority=seniority, skills=['python'])
+        now = timezone.now()
+        for i, title in enumerate(['Python rapido', 'Django async', 'Python com SQLite']):
+            Article.objects.create(user=self.user, title=title, content=f'conteudo {title}', published_at=now - timedelta(days=i))
+
+    def walk(self, url, params):
+        rows, pages = [], 0
+        response = self.client.get(url, params)
+        while True:
+            self.assertEqual(response.status_code, 200)
+            data = response.json()
+            rows += data['results']
+            pages += 1
+            if not data['next']:
+                return rows, pages
+            response = self.client.get(data['next'])
+
+    def test_developers_sparse_fields_and_cursor_pages(self):
+        rows, pages = self.walk(reverse('main:api_developers'), {'fields': 'name,seniority', 'limit': 2})
+        self.assertEqual(pages, 3)
+        self.assertEqual([row['name'] for row in rows], ['Ana', 'Bruno', 'Carla', 'Davi', 'Elis'])
+        self.assertEqual({tuple(row) for row in rows}, {('name', 'seniority')})
+
+        rows, _ = self.walk(reverse('main:api_developers'), {'seniority': 'sr', 'search': 'r', 'fields': 'name'})
+        self.assertEqual(rows, [{'name': 'Bruno'}, {'name': 'Carla'}])
+
+    def test_serializes_from_values_in_one_query(self):
+        url = reverse('main:api_developers')
+        self.client.get(url)
+        with mock.patch.object(Developer, 'from_db', side_effect=AssertionError('model instanciado')):
+            with self.assertNumQueries(1):
+                response = self.client.get(url, {'limit': 3})
+        data = response.json()
+        self.assertEqual(len(data['results']), 3)
+        self.assertEqual(data['results'][0]['skills'], ['python'])
+        self.assertIn('updated_at', data['results'][0])
+        self.assertIn('limit=3', data['next'])
+
+    def test_articles_reuse_list_filters(self):
+        rows, _ = self.walk(reverse('main:api_articles'), {})
+        self.assertEqual([row['title'] for row in rows], ['Python rapido', 'Django async', 'Python com SQLite'])
+        self.assertNotIn('content', rows[0])
+
+        rows, pages = self.walk(reverse('main:api_articles'), {'search': 'python', 'fields': 'title,content', 'limit': 1})
+        self.assertEqual(pages, 2)
+        self.assertEqual(sorted(row['title'] for row in rows), ['Python com SQLite', 'Python rapido'])
+        self.assertEqual(rows[0]['content'], f'conteudo {rows[0]["title"]}')
+
+    def test_search_without_terms_and_cover_url(self):
+        response = self.client.get(reverse('main:api_articles'), {'search': '--'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {'results': [], 'next': None})
+
+        Article.objects.filter(title='Django async').update(cover_image='covers/capa.png')
+        rows, _ = self.walk(reverse('main:api_articles'), {'fields': 'title,cover_image'})
+        covers = {row['title']: row['cover_image'] for row in rows}
+        self.assertEqual(covers['Django async'], f'{settings.MEDIA_URL}covers/capa.png')
+        self.assertIsNone(covers['Python rapido'])
+
+    def test_rejects_unknown_fields_and_anonymous(self):
+        response = self.client.get(reverse('main:api_articles'), {'fields': 'title,password'})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('password', response.json()['error'])
+        response = self.client.get(reverse('main:api_articles'), {'fields': ','})
+        self.assertEqual(response.status_code, 400)
+        self.assertTrue(response.json()['error'].startswith('Nenhum campo informado. Disponiveis: id, title'))
+
+        self.client.logout()
+        self.assertEqual(self.client.get(reverse('main:api_developers')).status_code, 403)
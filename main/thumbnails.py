@@ -0,0 +1,61 @@
+import posixpath
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.utils import timezone
+from PIL import Image, ImageOps, features
+
+from . import jobs
+
+WIDTHS = (400, 800, 1200)
+FORMATS = {
+    'webp': ('WEBP', {'quality': 80, 'method': 4}),
+    'jpeg': ('JPEG', {'quality': 82, 'optimize': True, 'progressive': True}),
+}
+THUMBS_DIR = 'covers/thumbs'
+
+
+def available_formats():
+    return [fmt for fmt in FORMATS if fmt != 'webp' or features.check('webp')]
+
+
+def variant_name(name, width, fmt):
+    return f'{THUMBS_DIR}/{posixpath.basename(name)}-{width}.{fmt}'
+
+
+def generate_variants(name, storage=default_storage):
+    with storage.open(name, 'rb') as source:
+        image = ImageOps.exif_transpose(Image.open(source))
+        image.load()
+    widths = [width for width in WIDTHS if width < image.width] or [image.width]
+    variants = {}
+    for fmt in available_formats():
+        pil_format, options = FORMATS[fmt]
+        variants[fmt] = {}
+        for width in widths:
+            height = max(1, round(image.height * width / image.width))
+            resized = image.resize((width, height), Image.Resampling.LANCZOS)
+            if pil_format == 'JPEG' and resized.mode not in ('RGB', 'L'):
+                resized = resized.convert('RGB')
+            buffer = BytesIO()
+            resized.save(buffer, pil_format, **options)
+            target = variant_name(name, width, fmt)
+            if storage.exists(target):
+                storage.delete(target)
+            variants[fmt][str(width)] = storage.save(target, ContentFile(buffer.getvalue()))
+    return variants
+
+
+def build_for_article(pk, name):
+    from .models import Article
+
+    variants = generate_variants(name) if name else {}
+    # So grava se a capa nao mudou enquanto as variantes eram geradas.
+    Article.objects.filter(pk=pk, cover_image=name).update(cover_variants=variants, updated_at=timezone.now())
+    return variants
+
+
+def schedule(article):
+    # Gerar as variantes leva segundos: a requisicao so enfileira e o run_worker faz o resto.
+    jobs.enqueue('main.thumbnails.build_for_article', article.pk, article.cover_image.name or '')
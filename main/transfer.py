@@ -0,0 +1,363 @@
+import csv
+import json
+import os
+from collections import Counter
+
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Prefetch
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from . import search
+from .counters import shift_total
+from .fragments import invalidate_developer_cards
+from .models import Article, Developer, DeveloperSkill, Skill
+
+FORMATS = ('csv', 'jsonl')
+# Listas (skills, developers) numa unica celula do CSV.
+LIST_SEPARATOR = '|'
+CSV_FIELD_LIMIT = 2**31 - 1
+
+
+def detect_format(path, fmt=None):
+    fmt = fmt or os.path.splitext(path)[1].lstrip('.').lower()
+    if fmt not in FORMATS:
+        raise ValueError(f'Formato desconhecido para {path}: use --format csv ou jsonl')
+    return fmt
+
+
+def as_list(value):
+    if value is None:
+        return []
+    if isinstance(value, str):
+        value = value.split(LIST_SEPARATOR)
+    return [str(item).strip() for item in value if str(item).strip()]
+
+
+def as_datetime(value):
+    if not value:
+        return None
+    parsed = parse_datetime(value)
+    if parsed is None:
+        raise ValidationError(f'Data invalida: {value}')
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+class RowWriter:
+    def __init__(self, handle, fmt, fields):
+        self.handle = handle
+        self.fmt = fmt
+        self.fields = fields
+        if fmt == 'csv':
+            self.csv = csv.writer(handle)
+            self.csv.writerow(fields)
+
+    def write(self, row):
+        if self.fmt == 'jsonl':
+            self.handle.write(json.dumps(row, cls=DjangoJSONEncoder, ensure_ascii=False) + '\n')
+            return
+        values = []
+        for name in self.fields:
+            value = row[name]
+            if isinstance(value, list):
+                value = LIST_SEPARATOR.join(value)
+            elif value is None:
+                value = ''
+            elif hasattr(value, 'isoformat'):
+                value = value.isoformat()
+            values.append(value)
+        self.csv.writerow(values)
+
+
+class LineBuffer:
+    """Destino do RowWriter para respostas em streaming: acumula o texto ate ser retirado."""
+
+    flush_size = 64 * 1024
+
+    def __init__(self):
+        self.parts = []
+        self.size = 0
+
+    def write(self, value):
+        self.parts.append(value)
+        self.size += len(value)
+
+    def full(self):
+        return self.size >= self.flush_size
+
+    def take(self):
+        value = ''.join(self.parts)
+        self.parts = []
+        self.size = 0
+        return value
+
+
+class LineSource:
+    """Linhas de um arquivo binario com o offset em bytes do que ja foi consumido."""
+
+    def __init__(self, handle, offset):
+        handle.seek(offset)
+        self.handle = handle
+        self.offset = offset
+
+    def __iter__(self):
+        for raw in self.handle:
+            self.offset += len(raw)
+            yield raw.decode('utf-8')
+
+
+def read_rows(path, fmt, offset=0):
+    """Gera (dict, offset apos o registro), retomando de um offset em bytes."""
+    with open(path, 'rb') as handle:
+        if fmt == 'jsonl':
+            source = LineSource(handle, offset)
+            for line in source:
+                if line.strip():
+                    yield json.loads(line), source.offset
+            return
+
+        csv.field_size_limit(CSV_FIELD_LIMIT)
+        header_source = LineSource(handle, 0)
+        fields = next(csv.reader(header_source), None)
+        if fields is None:
+            return
+        source = LineSource(handle, max(offset, header_source.offset))
+        for row in csv.DictReader(source, fieldnames=fields):
+            yield row, source.offset
+
+
+class Checkpoint:
+    """Offset do ultimo lote confirmado, gravado de forma atomica ao lado do arquivo importado."""
+
+    def __init__(self, path, kind):
+        self.path = path
+        self.kind = kind
+
+    def load(self):
+        try:
+            with open(self.path, encoding='utf-8') as handle:
+                data = json.load(handle)
+        except FileNotFoundError:
+            return 0, 0
+        if data.get('kind') != self.kind:
+            raise ValueError(f'Checkpoint {self.path} pertence a importacao de {data.get("kind")}')
+        return data['offset'], data['rows']
+
+    def save(self, offset, rows):
+        temp = f'{self.path}.tmp'
+        with open(temp, 'w', encoding='utf-8') as handle:
+            json.dump({'kind': self.kind, 'offset': offset, 'rows': rows}, handle)
+        os.replace(temp, self.path)
+
+    def clear(self):
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+
+def resolve_users(usernames):
+    usernames = set(usernames)
+    users = get_user_model().objects.in_bulk(usernames, field_name='username')
+    missing = usernames - set(users)
+    if missing:
+        raise ValidationError(f'Usuarios inexistentes: {", ".join(sorted(missing))}')
+    return users
+
+
+class Transfer:
+    kind = None
+    fields = []
+
+    def export_queryset(self, queryset=None):
+        raise NotImplementedError
+
+    def to_row(self, obj):
+        raise NotImplementedError
+
+    def export_rows(self, chunk_size, queryset=None):
+        for obj in self.export_queryset(queryset).iterator(chunk_size=chunk_size):
+            yield self.to_row(obj)
+
+    def stream(self, queryset, chunk_size, fmt='csv'):
+        """Gera o arquivo em pedacos: o cabecalho sai logo, as linhas conforme o cursor avanca."""
+        buffer = LineBuffer()
+        writer = RowWriter(buffer, fmt, self.fields)
+        yield buffer.take()
+        for row in self.export_rows(chunk_size, queryset):
+            writer.write(row)
+            if buffer.full():
+                yield buffer.take()
+        yield buffer.take()
+
+    async def astream(self, queryset, chunk_size, fmt='csv'):
+        buffer = LineBuffer()
+        writer = RowWriter(buffer, fmt, self.fields)
+        yield buffer.take()
+        async for obj in self.export_queryset(queryset).aiterator(chunk_size=chunk_size):
+            writer.write(self.to_row(obj))
+            if buffer.full():
+                yield buffer.take()
+        yield buffer.take()
+
+
+class DeveloperTransfer(Transfer):
+    kind = 'developers'
+    fields = ['email', 'name', 'seniority', 'owner', 'skills']
+    seniorities = {value for value, _ in Developer.SENIORITY_CHOICES}
+
+    def export_queryset(self, queryset=None):
+        if queryset is None:
+            queryset = Developer.objects.order_by('pk')
+        return queryset.select_related('user').only('email', 'name', 'seniority', 'skills', 'user__username')
+
+    def to_row(self, dev):
+        return {
+            'email': dev.email,
+            'name': dev.name,
+            'seniority': dev.seniority,
+            'owner': dev.user.username,
+            'skills': dev.skills if isinstance(dev.skills, list) else [],
+        }
+
+    def import_batch(self, rows):
+        users = resolve_users(row['owner'] for row in rows)
+        names = {row['email']: as_list(row.get('skills')) for row in rows}
+        skills = {skill.key: skill for skill in Skill.objects.resolve(name for row in names.values() for name in row)}
+        by_email = {}
+        for row in rows:
+            if row['seniority'] not in self.seniorities:
+                raise ValidationError(f'Senioridade invalida para {row["email"]}: {row["seniority"]}')
+            canonical = {}
+            for name in names[row['email']]:
+                skill = skills[Skill.normalize(name)]
+                canonical.setdefault(skill.pk, skill.name)
+            dev = Developer(
+                user=users[row['owner']],
+                name=row['name'],
+                email=row['email'],
+                seniority=row['seniority'],
+                skills=list(canonical.values()),
+            )
+            dev.skill_ids = list(canonical)
+            by_email[row['email']] = dev
+        developers = list(by_email.values())
+        Developer.objects.bulk_create(
+            developers,
+            update_conflicts=True,
+            unique_fields=['email'],
+            update_fields=['user', 'name', 'seniority', 'skills', 'updated_at'],
+        )
+
+        DeveloperSkill.objects.filter(developer__in=developers).delete()
+        DeveloperSkill.objects.bulk_create(
+            [DeveloperSkill(developer=dev, skill_id=skill_id) for dev in developers for skill_id in dev.skill_ids]
+        )
+        invalidate_developer_cards(dev.pk for dev in developers)
+        return len(developers)
+
+
+class ArticleTransfer(Transfer):
+    kind = 'articles'
+    fields = ['owner', 'slug', 'title', 'content', 'published_at', 'cover_image', 'developers']
+    link = Article.developers.through
+
+    def export_queryset(self, queryset=None):
+        if queryset is None:
+            queryset = Article.objects.order_by('pk')
+        return (
+            queryset.select_related('user')
+            .only('slug', 'title', 'content', 'published_at', 'cover_image', 'user__username')
+            .prefetch_related(Prefetch('developers', queryset=Developer.objects.only('email').order_by('email')))
+        )
+
+    def to_row(self, article):
+        return {
+            'owner': article.user.username,
+            'slug': article.slug,
+            'title': article.title,
+            'content': article.content,
+            'published_at': article.published_at,
+            'cover_image': article.cover_image.name or '',
+            'developers': [dev.email for dev in article.developers.all()],
+        }
+
+    def import_batch(self, rows):
+        users = resolve_users(row['owner'] for row in rows)
+        emails = {email for row in rows for email in as_list(row.get('developers'))}
+        developer_ids = dict(Developer.objects.filter(email__in=emails).values_list('email', 'pk'))
+        missing = emails - set(developer_ids)
+        if missing:
+            raise ValidationError(f'Developers inexistentes: {", ".join(sorted(missing))}')
+
+        articles = []
+        links = {}
+        for row in rows:
+            article = Article(
+                user=users[row['owner']],
+                title=row['title'],
+                slug=row.get('slug') or '',
+                content=row['content'],
+                published_at=as_datetime(row.get('published_at')),
+                cover_image=row.get('cover_image') or None,
+            )
+            article.render_content()
+            articles.append(article)
+            links[id(article)] = {developer_ids[email] for email in as_list(row.get('developers'))}
+        Article.objects.allocate_slugs(articles)
+
+        by_key = {}
+        for article in articles:
+            article.developer_total = len(links[id(article)])
+            by_key[article.user_id, article.slug] = article
+        articles = list(by_key.values())
+
+        # Variantes da capa so continuam validas se a capa nao mudou.
+        existing = Article.objects.filter(
+            user_id__in={article.user_id for article in articles},
+            slug__in={article.slug for article in articles},
+        ).values_list('user_id', 'slug', 'cover_image', 'cover_variants')
+        variants = {(user_id, slug): (cover, data) for user_id, slug, cover, data in existing}
+        for article in articles:
+            cover, data = variants.get((article.user_id, article.slug), (None, {}))
+            article.cover_variants = data if cover == article.cover_image.name else {}
+
+        Article.objects.bulk_create(
+            articles,
+            update_conflicts=True,
+            unique_fields=['user', 'slug'],
+            update_fields=[
+                'title', 'content', 'excerpt', 'content_html', 'published_at',
+                'cover_image', 'cover_variants', 'developer_total', 'updated_at',
+            ],
+        )
+
+        # Links trocados por inteiro; article_total dos developers ajustado pela diferenca.
+        old_links = self.link.objects.filter(article__in=articles)
+        delta = Counter()
+        for developer_id in old_links.values_list('developer_id', flat=True):
+            delta[developer_id] -= 1
+        for article in articles:
+            for developer_id in links[id(article)]:
+                delta[developer_id] += 1
+        old_links.delete()
+        self.link.objects.bulk_create(
+            [self.link(article_id=article.pk, developer_id=pk) for article in articles for pk in links[id(article)]]
+        )
+        by_delta = {}
+        for developer_id, change in delta.items():
+            if change:
+                by_delta.setdefault(change, []).append(developer_id)
+        for change, pks in by_delta.items():
+            shift_total(Developer, 'article_total', pks, change)
+        invalidate_developer_cards(pk for pks in by_delta.values() for pk in pks)
+
+        search.index_rows(((article.pk, article.title, article.content) for article in articles), replace=True)
+        return len(articles)
+
+
+TRANSFERS = {transfer.kind: transfer for transfer in (DeveloperTransfer(), ArticleTransfer())}
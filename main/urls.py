@@ -7,13 +7,18 @@ app_name = 'main'
 urlpatterns = [
     path('', views.home_redirect, name='home'),
     path('signup/', views.signup, name='signup'),
-    path('developers/', views.DeveloperListView.as_view(), name='developer_list'),
+    path('metrics/', views.metrics, name='metrics'),
+    path('developers/', views.AsyncDeveloperListView.as_view(), name='developer_list'),
+    path('developers/export.csv', views.DeveloperExportView.as_view(), name='developer_export'),
+    path('developers/autocomplete/', views.DeveloperAutocompleteView.as_view(), name='developer_autocomplete'),
     path('developers/new/', views.DeveloperCreateView.as_view(), name='developer_create'),
     path('developers/<int:pk>/edit/', views.DeveloperUpdateView.as_view(), name='developer_update'),
     path('developers/<int:pk>/delete/', views.DeveloperDeleteView.as_view(), name='developer_delete'),
-    path('articles/', views.ArticleListView.as_view(), name='article_list'),
-    path('articles/<int:pk>/', views.ArticleDetailView.as_view(), name='article_detail'),
+    path('articles/', views.AsyncArticleListView.as_view(), name='article_list'),
+    path('articles/<int:pk>/', views.AsyncArticleDetailView.as_view(), name='article_detail'),
     path('articles/new/', views.ArticleCreateView.as_view(), name='article_create'),
     path('articles/<int:pk>/edit/', views.ArticleUpdateView.as_view(), name='article_update'),
     path('articles/<int:pk>/delete/', views.ArticleDeleteView.as_view(), name='article_delete'),
+    path('api/developers/', views.DeveloperApiView.as_view(), name='api_developers'),
+    path('api/articles/', views.ArticleApiView.as_view(), name='api_articles'),
 ]
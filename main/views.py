@@ -1,15 +1,36 @@
+from functools import partial
+
+from asgiref.sync import sync_to_async
 from django.contrib.auth import login
-from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
-from django.contrib.auth.views import LoginView
-from django.core.exceptions import PermissionDenied
-from django.db.models import Count, Q
-from django.shortcuts import redirect, render
+from django.contrib.auth.decorators import user_passes_test
+from django.contrib.auth.mixins import LoginRequiredMixin
+from django.contrib.auth.views import LoginView, PasswordResetView
+from django.core.handlers.asgi import ASGIRequest
+from django.db import router
+from django.db.models import CharField, FloatField, Q
+from django.http import HttpResponse, StreamingHttpResponse
+from django.shortcuts import aget_object_or_404, redirect, render
 from django.urls import reverse_lazy
-from django.views.generic import CreateView, DeleteView, DetailView, ListView, UpdateView
+from django.views.generic import CreateView, DeleteView, DetailView, ListView, UpdateView, View
 
+from .api import JsonListMixin
+from .conditional import AsyncConditionalGetMixin, ConditionalGetMixin
 from .forms import ArticleForm, DeveloperForm
-from .forms_auth import LoginForm, SignupForm
+from .forms_auth import LoginForm, QueuedPasswordResetForm, SignupForm
+from . import search
+from .fragments import render_developer_cards
+from .metrics import registry
 from .models import Article, Developer
+from .pagination import AsyncKeysetListMixin, Keyset, KeysetPaginationMixin
+from .permissions import OwnerRequiredMixin
+from .routers import ReplicaReadMixin
+from .transfer import TRANSFERS
+from .widgets import DeveloperPicker
+
+
+def is_htmx_fragment(request):
+    # Restauracao de historico do htmx tambem manda HX-Request, mas troca o body inteiro: quer a pagina completa.
+    return bool(request.headers.get('HX-Request')) and not request.headers.get('HX-History-Restore-Request')
 
 
 def home_redirect(request):
@@ -28,35 +49,55 @@ def signup(request):
     return render(request, 'registration/signup.html', {'form': form})
 
 
+@user_passes_test(lambda user: user.is_active and user.is_staff)
+def metrics(request):
+    return HttpResponse(registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
 class CustomLoginView(LoginView):
     form_class = LoginForm
     template_name = 'registration/login.html'
     redirect_authenticated_user = True
 
 
-class DeveloperListView(LoginRequiredMixin, ListView):
-    model = Developer
-    template_name = 'main/developer_list.html'
-    context_object_name = 'developers'
+class CustomPasswordResetView(PasswordResetView):
+    form_class = QueuedPasswordResetForm
+
+
+class AsyncLoginRequiredMixin(LoginRequiredMixin):
+    async def dispatch(self, request, *args, **kwargs):
+        # request.user e lazy e sincrono; o usuario resolvido via auser() fica nele para o template.
+        request.user = await request.auser()
+        if not request.user.is_authenticated:
+            return self.handle_no_permission()
+        return await super(LoginRequiredMixin, self).dispatch(request, *args, **kwargs)
+
+
+class DeveloperFilterMixin:
+    """Filtros da listagem de developers (busca, senioridade, skills), lidos da querystring."""
 
     def get_queryset(self):
         self.search = self.request.GET.get('search', '').strip()
         self.seniority = self.request.GET.get('seniority', '').strip()
         self.skill = self.request.GET.get('skill', '').strip()
+        self.skill_match = 'any' if self.request.GET.get('skill_match') == 'any' else 'all'
 
-        qs = (
-            Developer.objects.all()
-            .annotate(article_total=Count('articles', distinct=True))
-            .prefetch_related('articles')
-        )
+        qs = Developer.objects.all()
 
         if self.search:
             qs = qs.filter(Q(name__icontains=self.search) | Q(email__icontains=self.search))
         if self.seniority:
             qs = qs.filter(seniority=self.seniority)
         if self.skill:
-            qs = qs.filter(skills__icontains=self.skill)
-        return qs.order_by('name')
+            qs = qs.with_skills(self.skill.split(','), match=self.skill_match)
+        return qs.order_by('name', 'id')
+
+
+class DeveloperListView(LoginRequiredMixin, ReplicaReadMixin, DeveloperFilterMixin, KeysetPaginationMixin, ConditionalGetMixin, ListView):
+    model = Developer
+    template_name = 'main/developer_list.html'
+    context_object_name = 'developers'
+    keyset = ('name', 'id')
 
     def get_context_data(self, **kwargs):
         ctx = super().get_context_data(**kwargs)
@@ -65,16 +106,53 @@ class DeveloperListView(LoginRequiredMixin, ListView):
                 'search': self.search,
                 'seniority': self.seniority,
                 'skill': self.skill,
+                'skill_match': self.skill_match,
+                # Cache e render_to_string: chamado pelo template, fora do loop nas views async.
+                'developer_cards': partial(render_developer_cards, ctx['developers']),
             }
         )
         return ctx
 
     def get_template_names(self):
-        if self.request.headers.get('HX-Request'):
+        if is_htmx_fragment(self.request):
             return ['main/partials/developer_cards.html']
         return [self.template_name]
 
 
+class DeveloperExportView(LoginRequiredMixin, ReplicaReadMixin, DeveloperFilterMixin, View):
+    """CSV com os developers que a listagem mostraria, gerado em streaming a partir do cursor do banco."""
+
+    chunk_size = 2000
+
+    def get(self, request, *args, **kwargs):
+        transfer = TRANSFERS['developers']
+        # O corpo e gerado depois que a requisicao sai do middleware: fixa o banco de leitura agora.
+        queryset = self.get_queryset().using(router.db_for_read(Developer))
+        if isinstance(request, ASGIRequest):
+            # Sob ASGI um iterador sincrono seria lido inteiro antes do envio.
+            content = transfer.astream(queryset, self.chunk_size)
+        else:
+            content = transfer.stream(queryset, self.chunk_size)
+        response = StreamingHttpResponse(content, content_type='text/csv; charset=utf-8')
+        response['Content-Disposition'] = 'attachment; filename="developers.csv"'
+        return response
+
+
+class DeveloperAutocompleteView(LoginRequiredMixin, ReplicaReadMixin, KeysetPaginationMixin, ListView):
+    """Opcoes do DeveloperPicker: developers pelo prefixo do nome, em paginas carregadas ao rolar."""
+
+    model = Developer
+    template_name = 'main/partials/developer_options.html'
+    context_object_name = 'developers'
+    paginate_by = 20
+
+    def get_queryset(self):
+        return Developer.objects.name_prefix(self.request.GET.get('q', '')).only('id', 'name', 'email')
+
+    def get_keyset(self):
+        return Keyset(Developer, ('name_key', 'id'), output_fields={'name_key': CharField()})
+
+
 class DeveloperCreateView(LoginRequiredMixin, CreateView):
     model = Developer
     form_class = DeveloperForm
@@ -86,59 +164,105 @@ class DeveloperCreateView(LoginRequiredMixin, CreateView):
         return super().form_valid(form)
 
 
-class DeveloperUpdateView(LoginRequiredMixin, UpdateView):
+class DeveloperUpdateView(LoginRequiredMixin, OwnerRequiredMixin, UpdateView):
     model = Developer
     form_class = DeveloperForm
     template_name = 'main/developer_form.html'
     success_url = reverse_lazy('main:developer_list')
 
-    def get_queryset(self):
-        return Developer.objects.filter(user=self.request.user)
 
-
-class DeveloperDeleteView(LoginRequiredMixin, DeleteView):
+class DeveloperDeleteView(LoginRequiredMixin, OwnerRequiredMixin, DeleteView):
     model = Developer
     template_name = 'main/confirm_delete.html'
     success_url = reverse_lazy('main:developer_list')
     context_object_name = 'object'
 
-    def get_queryset(self):
-        return Developer.objects.filter(user=self.request.user)
-
 
-class ArticleListView(LoginRequiredMixin, ListView):
-    model = Article
-    template_name = 'main/article_list.html'
-    context_object_name = 'articles'
+class ArticleFilterMixin:
+    """Filtros da listagem de artigos (busca textual, developer), lidos da querystring."""
 
     def get_queryset(self):
         self.search = self.request.GET.get('search', '').strip()
         self.developer_id = self.request.GET.get('developer', '').strip()
 
         qs = (
-            Article.objects.all()
-            .annotate(developer_total=Count('developers', distinct=True))
+            Article.objects.select_related('user')
+            .defer('content', 'content_html')
             .prefetch_related('developers')
-            .order_by('-published_at', 'title')
+            .order_by('-published_at', 'title', 'id')
         )
 
         if self.search:
-            qs = qs.filter(Q(title__icontains=self.search) | Q(content__icontains=self.search))
+            if search.is_available():
+                qs = search.filter_articles(qs, self.search)
+            else:
+                qs = qs.filter(Q(title__icontains=self.search) | Q(content__icontains=self.search))
         if self.developer_id and self.developer_id.isdigit():
             qs = qs.filter(developers__id=self.developer_id)
         return qs
 
+    def is_ranked_search(self):
+        return search.is_available() and bool(search.build_query(self.search))
+
+    def get_keyset(self):
+        if self.is_ranked_search():
+            return Keyset(Article, ('search_rank', 'id'), output_fields={'search_rank': FloatField()})
+        return super().get_keyset()
+
+
+class ArticleListView(LoginRequiredMixin, ReplicaReadMixin, ArticleFilterMixin, KeysetPaginationMixin, ConditionalGetMixin, ListView):
+    model = Article
+    template_name = 'main/article_list.html'
+    context_object_name = 'articles'
+    keyset = ('-published_at', 'title', 'id')
+
+    def selected_developer_state(self):
+        # A pagina inteira (fora do HTMX) mostra o nome do developer filtrado no picker.
+        if is_htmx_fragment(self.request) or not self.developer_id.isdigit():
+            return Developer.objects.none()
+        return Developer.objects.filter(pk=self.developer_id).values_list('name', 'updated_at')
+
+    def shows_total(self):
+        # O total aparece na pagina inteira e, via OOB, a cada troca de filtro; "carregar mais" nao o repete.
+        return not self.is_next_page_request()
+
+    def get_validator_extra(self):
+        # O total entra no ETag: um artigo fora da pagina exibida ainda muda o contador.
+        self.result_total = self.get_queryset().count() if self.shows_total() else None
+        return (self.result_total, *self.selected_developer_state())
+
+    def paginate_queryset(self, queryset, page_size):
+        paginated = super().paginate_queryset(queryset, page_size)
+        self.attach_snippets(paginated[2])
+        return paginated
+
+    def attach_snippets(self, articles):
+        if not self.is_ranked_search():
+            return
+        found = search.snippets(self.search, [article.pk for article in articles], using=router.db_for_read(Article))
+        for article in articles:
+            article.search_snippet = found.get(article.pk, '')
+
     def get_context_data(self, **kwargs):
         ctx = super().get_context_data(**kwargs)
         ctx.update(
             {
                 'search': self.search,
                 'developer_id': self.developer_id,
-                'developer_options': Developer.objects.order_by('name'),
+                'result_total': self.result_total,
+                # Chamado pelo template: nas views async a query do selecionado roda na renderizacao, fora do loop.
+                'developer_picker': partial(DeveloperPicker(multiple=False).render, 'developer', self.developer_id),
             }
         )
         return ctx
 
+    def get_template_names(self):
+        if is_htmx_fragment(self.request):
+            if self.shows_total():
+                return ['main/partials/article_results.html']
+            return ['main/partials/article_cards.html']
+        return [self.template_name]
+
 
 class ArticleCreateView(LoginRequiredMixin, CreateView):
     model = Article
@@ -156,47 +280,80 @@ class ArticleCreateView(LoginRequiredMixin, CreateView):
         return super().form_valid(form)
 
 
-class ArticleUpdateView(LoginRequiredMixin, UserPassesTestMixin, UpdateView):
+class ArticleUpdateView(LoginRequiredMixin, OwnerRequiredMixin, UpdateView):
     model = Article
     form_class = ArticleForm
     template_name = 'main/article_form.html'
     success_url = reverse_lazy('main:article_list')
 
-    def get_queryset(self):
-        return Article.objects.all()
-
     def get_form_kwargs(self):
         kwargs = super().get_form_kwargs()
         kwargs['user'] = self.request.user
         return kwargs
 
-    def test_func(self):
-        obj = self.get_object()
-        if self.request.user.is_superuser or obj.user == self.request.user:
-            return True
-        raise PermissionDenied
 
-
-class ArticleDeleteView(LoginRequiredMixin, UserPassesTestMixin, DeleteView):
+class ArticleDeleteView(LoginRequiredMixin, OwnerRequiredMixin, DeleteView):
     model = Article
     template_name = 'main/confirm_delete.html'
     success_url = reverse_lazy('main:article_list')
     context_object_name = 'object'
 
-    def get_queryset(self):
-        return Article.objects.all()
-
-    def test_func(self):
-        obj = self.get_object()
-        if self.request.user.is_superuser or obj.user == self.request.user:
-            return True
-        raise PermissionDenied
-
 
-class ArticleDetailView(LoginRequiredMixin, DetailView):
+class ArticleDetailView(LoginRequiredMixin, ReplicaReadMixin, ConditionalGetMixin, DetailView):
     model = Article
     template_name = 'main/article_detail.html'
     context_object_name = 'article'
 
     def get_queryset(self):
-        return Article.objects.select_related('user').prefetch_related('developers')
+        return Article.objects.select_related('user').defer('content').prefetch_related('developers')
+
+    def get_validator_rows(self):
+        return Article.objects.filter(pk=self.kwargs[self.pk_url_kwarg]).values_list('pk', 'updated_at')
+
+
+class DeveloperApiView(LoginRequiredMixin, ReplicaReadMixin, DeveloperFilterMixin, JsonListMixin, View):
+    """Developers em JSON com os mesmos filtros da listagem (para dashboards)."""
+
+    raise_exception = True
+    model = Developer
+    keyset = ('name', 'id')
+    api_fields = ('id', 'name', 'email', 'seniority', 'skills', 'article_total', 'user_id', 'updated_at')
+
+
+class ArticleApiView(LoginRequiredMixin, ReplicaReadMixin, ArticleFilterMixin, JsonListMixin, View):
+    """Artigos em JSON com os mesmos filtros da listagem; content so quando pedido em ?fields=."""
+
+    raise_exception = True
+    model = Article
+    keyset = ('-published_at', 'title', 'id')
+    api_fields = (
+        'id', 'title', 'slug', 'excerpt', 'content', 'content_html', 'published_at',
+        'cover_image', 'developer_total', 'user_id', 'updated_at',
+    )
+    default_fields = ('id', 'title', 'slug', 'excerpt', 'published_at', 'cover_image', 'developer_total', 'user_id', 'updated_at')
+
+
+class AsyncDetailMixin:
+    async def get(self, request, *args, **kwargs):
+        self.object = await aget_object_or_404(self.get_queryset(), pk=self.kwargs[self.pk_url_kwarg])
+        return self.render_to_response(self.get_context_data(object=self.object))
+
+
+class AsyncDeveloperListView(AsyncLoginRequiredMixin, AsyncConditionalGetMixin, AsyncKeysetListMixin, DeveloperListView):
+    pass
+
+
+class AsyncArticleListView(AsyncLoginRequiredMixin, AsyncConditionalGetMixin, AsyncKeysetListMixin, ArticleListView):
+    async def aget_validator_extra(self):
+        self.result_total = await self.get_queryset().acount() if self.shows_total() else None
+        return (self.result_total, *[row async for row in self.selected_developer_state()])
+
+    async def apaginate_queryset(self, queryset, page_size):
+        paginated = await super().apaginate_queryset(queryset, page_size)
+        # snippet() e SQL cru, sem equivalente no ORM async.
+        await sync_to_async(self.attach_snippets)(paginated[2])
+        return paginated
+
+
+class AsyncArticleDetailView(AsyncLoginRequiredMixin, AsyncConditionalGetMixin, AsyncDetailMixin, ArticleDetailView):
+    pass
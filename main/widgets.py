@@ -0,0 +1,43 @@
+from django import forms
+from django.urls import reverse
+
+from .models import Developer
+
+
+class DeveloperPicker(forms.SelectMultiple):
+    """Seletor de developers via autocomplete: o HTML traz so os selecionados, as opcoes vem sob demanda."""
+
+    template_name = 'main/widgets/developer_picker.html'
+
+    def __init__(self, attrs=None, multiple=True):
+        super().__init__(attrs)
+        self.allow_multiple_selected = multiple
+
+    def optgroups(self, name, value, attrs=None):
+        # Nao percorre o queryset do campo: com dezenas de milhares de developers o HTML explode.
+        return []
+
+    def selected(self, values):
+        ids = [value for value in values if str(value).isdigit()]
+        if not ids:
+            return []
+        queryset = getattr(self.choices, 'queryset', None)
+        if queryset is None:
+            queryset = Developer.objects.all()
+        return list(queryset.filter(pk__in=ids).only('id', 'name').order_by('name', 'id'))
+
+    def get_context(self, name, value, attrs):
+        context = super().get_context(name, value, attrs)
+        context['widget'].update(
+            {
+                'multiple': self.allow_multiple_selected,
+                'selected': self.selected(context['widget']['value']),
+                'autocomplete_url': reverse('main:developer_autocomplete'),
+            }
+        )
+        return context
+
+    def value_from_datadict(self, data, files, name):
+        if self.allow_multiple_selected:
+            return super().value_from_datadict(data, files, name)
+        return data.get(name)
@@ -0,0 +1,10 @@
+/** @type {import('tailwindcss').Config} */
+// Gera static/css/app.css so com as classes usadas nos templates e nos widgets dos forms:
+//   npx tailwindcss@3 -c tailwind.config.js -i static/src/app.css -o static/css/app.css
+module.exports = {
+  content: ['./main/templates/**/*.html', './main/forms*.py'],
+  theme: {
+    extend: {},
+  },
+  plugins: [],
+};